@@ -4,14 +4,17 @@
 텍스트 입력 → Gemini 분석 → Cal.com 자동 등록
 """
 
+import atexit
+import hashlib
 import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, Response, stream_with_context
 import json
 import threading
-import shutil
 import time
+import uuid
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -26,76 +29,120 @@ if not env_path.exists():
 
 load_dotenv(env_path)
 
-from gemini_analyzer import GeminiAnalyzer
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내 락만 사용
+    fcntl = None
+
+from analyzer_pool import build_analysis
+from batch_importer import BatchImporter
+from job_queue import JobQueue, JobLimitExceeded, FINISHED_STATUSES
+from event_store import EventStore, EventStoreError, EventNotFound, VersionConflict, parse_timestamp
+from backup_manager import BackupManager
+from blob_store import content_hash
+from reclaim_client import ReclaimClient, ReclaimSync, ReclaimAPIError
+from sync_state import SyncState
+from event_wire import DEFAULT_LAZY_BODY_CHARS
+from history_log import DEFAULT_HISTORY_LIMIT
+import compression
+import metrics
 
 
 # 데이터 저장 경로 설정
-DATA_DIR = PROJECT_ROOT / "data"
-DB_FILE = DATA_DIR / "db.json"
+DATA_DIR = Path(os.getenv('DATA_DIR') or PROJECT_ROOT / "data")
+DB_FILE = DATA_DIR / "db.json"  # 가져오기/내보내기 및 백업 형식
+STORE_FILE = DATA_DIR / "db.sqlite3"
 BACKUP_DIR = DATA_DIR / "backups"
+BATCH_DIR = DATA_DIR / "batches"  # 일괄 가져오기 체크포인트
 
-# 초기 데이터 파일 생성
+# 초기 데이터 디렉토리 생성
 if not DATA_DIR.exists():
-    DATA_DIR.mkdir(exist_ok=True)
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 if not BACKUP_DIR.exists():
     BACKUP_DIR.mkdir(exist_ok=True)
 
-
-if not DB_FILE.exists():
-    with open(DB_FILE, 'w', encoding='utf-8') as f:
-        json.dump({"meeting_notes": "", "events": []}, f, ensure_ascii=False, indent=2)
-
-# 파일 쓰기 락 (동시성 제어)
+# 저장 락 (쓰기 직렬화, 읽기는 락 없이 수행)
+# 여러 워커 프로세스(gunicorn)가 같은 저장소를 쓰므로 스레드 락 + 파일 락(flock)을 함께 사용
+DB_LOCK_FILE = DATA_DIR / "db.lock"
 db_lock = threading.Lock()
 
-def load_db():
+metrics.describe('db_load_seconds', metrics.HISTOGRAM, 'load_db() 소요 시간 (초)')
+metrics.describe('db_save_seconds', metrics.HISTOGRAM, 'save_db() 소요 시간 (초, 락 대기 제외)')
+metrics.describe('db_lock_wait_seconds', metrics.HISTOGRAM, '저장 락 대기 시간 (초, 다른 워커 프로세스 대기 포함)')
+
+
+@contextmanager
+def storage_lock():
+    """저장소 쓰기 락 (같은 프로세스의 스레드와 다른 워커 프로세스 모두 대기)"""
+    with open(DB_LOCK_FILE, 'a') as f:
+        with metrics.timer('db_lock_wait_seconds', span='db_lock'):
+            db_lock.acquire()
+            if fcntl is not None:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                except BaseException:
+                    db_lock.release()
+                    raise
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            db_lock.release()
+
+
+# 이벤트 저장소 (기존 db.json은 최초 1회 가져오기, 여러 워커가 동시에 시작해도 한 번만)
+# LAZY_BODY_CHARS(글자)보다 긴 본문은 블롭으로 따로 저장하고 이벤트에는 참조와 미리보기만 (0이면 사용 안 함)
+LAZY_BODY_CHARS = int(os.getenv('LAZY_BODY_CHARS', DEFAULT_LAZY_BODY_CHARS))
+# 실행 취소 기록 최대 단계 수 (모든 탭이 공유, 0이면 기록하지 않음)
+HISTORY_LIMIT = int(os.getenv('HISTORY_LIMIT', DEFAULT_HISTORY_LIMIT))
+event_store = EventStore(STORE_FILE, lazy_body_chars=LAZY_BODY_CHARS, history_limit=HISTORY_LIMIT,
+                         timezone=os.getenv('TIMEZONE', 'Asia/Seoul'))
+with storage_lock():
+    event_store.migrate_from_json(DB_FILE)
+
+# Gemini 분석 구성 (분석 캐시 / 호출 속도 제한 / 동일 요청 합치기 / 키별 분석기 풀 / 긴 회의록 분할 분석)
+# 캐시·속도 제한·요청 합치기 상태는 DATA_DIR의 파일로 모든 워커와 batch_importer CLI가 공유
+analysis = build_analysis(DATA_DIR, os.environ)
+analysis_cache = analysis['cache']
+gemini_rate_limiter = analysis['rate_limiter']
+gemini_coalescer = analysis['coalescer']
+
+# 증분 백업 (변경 기록 세그먼트 + 주기적 압축 스냅샷, 요청 처리와 별개로 실행)
+backup_manager = BackupManager(
+    event_store,
+    BACKUP_DIR,
+    interval=float(os.getenv('BACKUP_INTERVAL_SECONDS', 600)),
+    snapshot_interval=float(os.getenv('BACKUP_SNAPSHOT_SECONDS', 3600)),
+    keep_hourly=int(os.getenv('BACKUP_KEEP_HOURLY', 24)),
+    keep_daily=int(os.getenv('BACKUP_KEEP_DAILY', 7)),
+    keep_weekly=int(os.getenv('BACKUP_KEEP_WEEKLY', 8)),
+    pitr_seconds=float(os.getenv('BACKUP_PITR_DAYS', 7)) * 86400
+)
+
+
+def load_db(bodies=True):
     try:
-        with db_lock:
-            if not DB_FILE.exists():
-                return {"meeting_notes": "", "events": []}
-            with open(DB_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        with metrics.timer('db_load_seconds', span='db_load'):
+            return event_store.load(bodies)
     except Exception as e:
         print(f"Error loading DB: {e}")
         return {"meeting_notes": "", "events": []}
 
 def save_db(data):
     try:
-        with db_lock:
-            # 1. 백업 로직 수행 (10분 간격)
-            if DB_FILE.exists():
-                should_backup = False
-                
-                # 가장 최근 백업 파일 확인
-                backups = sorted(list(BACKUP_DIR.glob('db_backup_*.json')))
-                
-                if not backups:
-                    should_backup = True
-                else:
-                    last_backup = backups[-1]
-                    # 파일명에서 시간 추출 (db_backup_YYYYMMDD_HHMMSS.json)
-                    try:
-                        # 파일 수정 시간으로 비교 (더 간단함)
-                        last_mtime = last_backup.stat().st_mtime
-                        current_time = time.time()
-                        
-                        # 10분 = 600초
-                        if current_time - last_mtime > 600:
-                            should_backup = True
-                    except Exception:
-                        should_backup = True  # 에러나면 안전하게 백업
-                
-                if should_backup:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    backup_path = BACKUP_DIR / f"db_backup_{timestamp}.json"
-                    shutil.copy2(DB_FILE, backup_path)
-                    print(f"Backup created: {backup_path}")
-
-            # 2. 데이터 저장
-            with open(DB_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+        with storage_lock(), metrics.timer('db_save_seconds', span='db_save'):
+            # 데이터 저장 (전달된 키만 갱신, 이벤트는 바뀐 행만 기록)
+            # 백업은 저장소 변경 기록을 backup_manager가 백그라운드에서 옮김
+            if 'meeting_notes' in data:
+                event_store.set_meeting_notes(data['meeting_notes'])
+            if 'events' in data:
+                event_store.replace_events(data['events'])
         return True
+    except EventStoreError:
+        # 잘못된 이벤트(반복 규칙 오류 등)는 호출한 쪽에서 요청 오류로 응답
+        raise
     except Exception as e:
         print(f"Error saving DB: {e}")
         return False
@@ -103,21 +150,304 @@ def save_db(data):
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
 
-# API 클라이언트 초기화
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+# API 클라이언트 초기화 (GEMINI_API_KEYS에 쉼표로 여러 키 지정 가능)
+GEMINI_API_KEYS = analysis['api_keys']
+GEMINI_API_KEY = GEMINI_API_KEYS[0] if GEMINI_API_KEYS else None
 
 
 if not GEMINI_API_KEY:
     print("⚠️  GEMINI_API_KEY가 설정되지 않았습니다.")
     print("   .env 파일을 확인해주세요.")
 
+# 프로세스 전체에서 재사용하는 분석기 풀 (키별 클라이언트/커넥션 유지)
+analyzer_pool = analysis['pool']
+
+# 긴 회의록은 화자/섹션 단위로 나눠 동시에 분석한 뒤 병합
+long_document_analyzer = analysis['chunked']
+
+
+def analyze_notes(meeting_notes, report_progress=None):
+    """회의록 분석 (긴 회의록은 분할 분석)"""
+    if long_document_analyzer.is_long(meeting_notes):
+        return long_document_analyzer.analyze(meeting_notes, report_progress)
+    return analyzer_pool.analyze_meeting_notes(meeting_notes)
+
+
+# 분석 작업 큐 (요청 스레드 대신 워커 풀에서 Gemini 호출)
+job_queue = JobQueue(
+    DATA_DIR / "jobs.sqlite3",
+    max_workers=int(os.getenv('ANALYSIS_WORKERS', 2)),
+    per_user_limit=int(os.getenv('ANALYSIS_PER_USER_LIMIT', 1)),
+    max_pending_per_user=int(os.getenv('ANALYSIS_MAX_PENDING_PER_USER', 20))
+)
+
+
+def run_analysis_job(payload, report_progress):
+    """분석 작업 처리 함수 (워커 스레드에서 실행)"""
+    if not GEMINI_API_KEY:
+        raise RuntimeError('GEMINI_API_KEY가 설정되지 않았습니다.')
+    report_progress('Gemini 분석 중')
+    return analyze_notes(payload['meeting_notes'], report_progress)
+
+
+job_queue.register('analyze', run_analysis_job)
+
+
+# Reclaim.ai 동기화 (RECLAIM_API_TOKEN이 있을 때만)
+RECLAIM_API_TOKEN = os.getenv('RECLAIM_API_TOKEN')
+reclaim_sync = None
+if RECLAIM_API_TOKEN:
+    reclaim_concurrency = int(os.getenv('RECLAIM_CONCURRENCY', 4))
+    reclaim_sync = ReclaimSync(
+        ReclaimClient(
+            RECLAIM_API_TOKEN,
+            timezone=os.getenv('TIMEZONE', 'Asia/Seoul'),
+            max_connections=reclaim_concurrency
+        ),
+        SyncState(DATA_DIR / "sync_state.sqlite3"),
+        event_store=event_store,
+        max_concurrency=reclaim_concurrency,
+        interval=float(os.getenv('RECLAIM_SYNC_INTERVAL_SECONDS', 300)),
+        lock_path=DATA_DIR / "reclaim_sync.lock"
+    )
+
+
+def run_reclaim_sync_job(payload, report_progress):
+    """
+    Reclaim.ai 동기화 작업 처리 함수
+    백그라운드 동기화와 같은 양방향 3-way 비교를 바로 1회 실행합니다 (실행 중인 동기화가 있으면 끝난 뒤 실행).
+    """
+    if reclaim_sync is None:
+        raise RuntimeError('RECLAIM_API_TOKEN이 설정되지 않았습니다.')
+    report_progress('Reclaim.ai 동기화 중')
+    return reclaim_sync.sync_once(wait=True)
+
 
+job_queue.register('reclaim_sync', run_reclaim_sync_job)
+
+
+def run_batch_job(payload, report_progress):
+    """일괄 분석 작업 처리 함수 (다시 실행되면 체크포인트에서 이어서 처리)"""
+    if not GEMINI_API_KEY:
+        raise RuntimeError('GEMINI_API_KEY가 설정되지 않았습니다.')
+    importer = BatchImporter(
+        analyze_notes,
+        event_store,
+        max_workers=int(os.getenv('BATCH_WORKERS', 4)),
+        category=payload.get('category') or 'ai_req',
+        include_summary=payload.get('include_summary', True)
+    )
+    return importer.run(
+        payload['documents'],
+        BATCH_DIR / f"{payload['batch_id']}.checkpoint.jsonl",
+        report_progress=report_progress
+    )
+
+
+job_queue.register('batch', run_batch_job)
+
+
+# 종료 시 실행 중인 분석 작업을 기다리는 최대 시간 (초, 넘기면 다른 워커가 이어받도록 다시 대기 상태로)
+ANALYSIS_DRAIN_SECONDS = float(os.getenv('ANALYSIS_DRAIN_SECONDS', 60))
+
+_background_state = {'started': False}
+_background_lock = threading.Lock()
+
+
+def start_background_workers():
+    """백그라운드 워커 시작 (개발 서버 리로더의 감시 프로세스에서는 호출하지 않음)"""
+    with _background_lock:
+        if _background_state['started']:
+            return
+        _background_state['started'] = True
+    if shared_metrics is not None:
+        shared_metrics.start()
+    job_queue.start()
+    backup_manager.start()
+    if reclaim_sync is not None and reclaim_sync.interval > 0:
+        reclaim_sync.start()
+
+
+def shutdown_background_workers():
+    """
+    백그라운드 워커 정상 종료 (gunicorn worker_exit 훅 / 프로세스 종료 시 호출, 여러 번 불러도 한 번만 실행)
+    새 작업은 더 가져가지 않고, 실행 중인 분석은 ANALYSIS_DRAIN_SECONDS까지 기다린 뒤
+    끝나지 않은 작업은 다시 대기 상태로 돌려 다른 워커 프로세스나 다음 시작 때 처리되게 합니다.
+    """
+    with _background_lock:
+        if not _background_state['started']:
+            return
+        _background_state['started'] = False
+
+    print(f"백그라운드 워커 종료 중 (pid {os.getpid()}, 실행 중인 분석 최대 {ANALYSIS_DRAIN_SECONDS:g}초 대기)")
+    job_queue.shutdown(wait=True, timeout=ANALYSIS_DRAIN_SECONDS)
+    job_queue.requeue_running()
+    if reclaim_sync is not None:
+        reclaim_sync.shutdown()
+    # 남은 변경 기록은 backup_manager가 마지막으로 한 번 옮김
+    backup_manager.shutdown()
+    if shared_metrics is not None:
+        shared_metrics.shutdown()
+
+
+atexit.register(shutdown_background_workers)
+
+
+# 요청별 지표 (METRICS_TIMING_HEADER=true면 Server-Timing 헤더 추가, SLOW_REQUEST_MS 이상 걸린 요청은 로그)
+METRICS_TIMING_HEADER = os.getenv('METRICS_TIMING_HEADER', 'False').lower() == 'true'
+SLOW_REQUEST_SECONDS = float(os.getenv('SLOW_REQUEST_MS', 2000)) / 1000
+
+# 워커 프로세스 간 지표 합치기 (gunicorn.conf.py가 METRICS_MULTIPROC_DIR 지정, 없으면 프로세스별 값만)
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR')
+shared_metrics = None
+if METRICS_MULTIPROC_DIR:
+    shared_metrics = metrics.SharedMetrics(
+        metrics.REGISTRY,
+        Path(METRICS_MULTIPROC_DIR),
+        interval=float(os.getenv('METRICS_SHARE_SECONDS', 5))
+    )
+
+metrics.describe('http_requests_total', metrics.COUNTER, 'HTTP 요청 수')
+metrics.describe('http_request_seconds', metrics.HISTOGRAM, 'HTTP 요청 처리 시간 (초, 스트리밍은 첫 응답까지)')
+metrics.describe('http_request_bytes', metrics.HISTOGRAM, 'HTTP 요청 본문 크기 (바이트)', metrics.SIZE_BUCKETS)
+metrics.describe('http_response_bytes', metrics.HISTOGRAM, 'HTTP 응답 본문 크기 (바이트)', metrics.SIZE_BUCKETS)
+metrics.describe('http_slow_requests_total', metrics.COUNTER, 'SLOW_REQUEST_MS 이상 걸린 요청 수')
+metrics.describe('jobs', metrics.GAUGE, '상태별 작업 수')
+metrics.describe('analysis_cache', metrics.GAUGE, '분석 캐시 항목 수 (stat=entries|max_entries)')
+metrics.describe('analysis_cache_lookups', metrics.GAUGE, '분석 캐시 조회 결과 수 (stat=hits|misses|evictions, 워커 합계)',
+                 per_process=True)
+metrics.describe('gemini_rate_limit_queue_depth', metrics.GAUGE, '속도 제한 대기 중인 요청 수 (워커 합계)',
+                 per_process=True)
+metrics.describe('store_events', metrics.GAUGE, '저장된 이벤트 수')
+metrics.describe('search_seconds', metrics.HISTOGRAM, '/api/search 검색 소요 시간 (초)')
+
+
+def collect_gauges():
+    """/metrics 요청 시점의 큐/캐시/저장소 상태"""
+    for status, count in job_queue.stats().items():
+        if status != 'workers':
+            yield 'jobs', {'status': status}, count
+    for key, value in analysis_cache.stats().items():
+        yield 'analysis_cache' if key in ('entries', 'max_entries') else 'analysis_cache_lookups', {'stat': key}, value
+    yield 'gemini_rate_limit_queue_depth', {}, gemini_rate_limiter.stats()['queue_depth']
+    yield 'store_events', {}, event_store.count_events()
+
+
+metrics.REGISTRY.add_collector(collect_gauges)
+
+
+@app.before_request
+def start_request_metrics():
+    """요청별 구간 기록 시작"""
+    request.environ['metrics.start'] = time.perf_counter()
+    metrics.start_spans()
+
+
+@app.after_request
+def finish_request_metrics(response):
+    """요청 처리 시간/크기 기록, Server-Timing 헤더 및 느린 요청 로그"""
+    start = request.environ.get('metrics.start')
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    spans = metrics.finish_spans()
+    # 경로 대신 라우트 규칙을 라벨로 사용 (ID별로 시계열이 늘어나지 않게)
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+
+    metrics.inc('http_requests_total', method=request.method, endpoint=endpoint, status=response.status_code)
+    metrics.observe('http_request_seconds', elapsed, method=request.method, endpoint=endpoint)
+    if request.content_length:
+        metrics.observe('http_request_bytes', request.content_length, endpoint=endpoint)
+    if not response.is_streamed and response.content_length is not None:
+        metrics.observe('http_response_bytes', response.content_length, endpoint=endpoint)
+
+    if METRICS_TIMING_HEADER:
+        response.headers['Server-Timing'] = metrics.server_timing(spans, elapsed)
+    if SLOW_REQUEST_SECONDS > 0 and elapsed >= SLOW_REQUEST_SECONDS:
+        metrics.inc('http_slow_requests_total', endpoint=endpoint)
+        detail = ', '.join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in spans)
+        print(f"느린 요청: {request.method} {request.path} {response.status_code} "
+              f"{elapsed * 1000:.0f}ms ({detail or '구간 기록 없음'})")
+    return response
+
+
+# 응답 압축 (JSON/HTML, brotli 패키지가 있으면 br 우선)
+RESPONSE_COMPRESSION = os.getenv('RESPONSE_COMPRESSION', 'True').lower() == 'true'
+
+metrics.describe('http_compression_bytes_total', metrics.COUNTER, '압축한 응답 크기 합계 (바이트, stage=original|compressed)')
+
+
+@app.after_request
+def compress_response(response):
+    """응답 압축 (지표 기록 훅보다 먼저 실행되어 http_response_bytes는 전송 크기로 기록)"""
+    if not RESPONSE_COMPRESSION:
+        return response
+    encoding = compression.choose_encoding(request.accept_encodings)
+    response, original, compressed = compression.compress_response(response, encoding)
+    if original is not None:
+        metrics.inc('http_compression_bytes_total', original, encoding=encoding, stage='original')
+        metrics.inc('http_compression_bytes_total', compressed, encoding=encoding, stage='compressed')
+    return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus 텍스트 형식 지표"""
+    text = shared_metrics.render() if shared_metrics is not None else metrics.REGISTRY.render()
+    return Response(text, mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+def request_user():
+    """요청 사용자 식별자 (작업 동시 실행 제한 단위)"""
+    return request.headers.get('X-User-Id') or request.remote_addr or 'anonymous'
+
+
+
+
+_index_cache = {'mtime': None, 'etag': None, 'bodies': {}}
+_index_lock = threading.Lock()
+
+
+def _rendered_index():
+    """
+    렌더링한 메인 페이지 (템플릿이 바뀔 때만 다시 렌더링)
+
+    Returns:
+        (ETag, {인코딩(None=원본): 본문 바이트}) - 압축본은 처음 요청될 때 최대 압축으로 만들어 재사용
+    """
+    mtime = os.stat(PROJECT_ROOT / "templates" / "index.html").st_mtime_ns
+    with _index_lock:
+        if _index_cache['mtime'] != mtime:
+            body = render_template('index.html').encode('utf-8')
+            _index_cache.update(
+                mtime=mtime,
+                etag=hashlib.sha256(body).hexdigest()[:32],
+                bodies={None: body}
+            )
+        return _index_cache['etag'], _index_cache['bodies']
 
 
 @app.route('/')
 def index():
-    """메인 페이지 - 텍스트 입력 폼"""
-    return render_template('index.html')
+    """메인 페이지 - 텍스트 입력 폼 (강한 ETag로 재검증, 바뀌지 않았으면 304)"""
+    etag, bodies = _rendered_index()
+    encoding = compression.choose_encoding(request.accept_encodings) if RESPONSE_COMPRESSION else None
+    tag = compression.encoded_etag(etag, encoding)
+
+    if compression.etag_matches(request.if_none_match, etag):
+        response = app.response_class(status=304)
+    else:
+        if encoding not in bodies:
+            with _index_lock:
+                bodies.setdefault(encoding, compression.compress(bodies[None], encoding, best=True))
+        response = app.response_class(bodies[encoding], mimetype='text/html')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(tag)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 
 @app.route('/analyze', methods=['POST'])
@@ -141,10 +471,37 @@ def analyze():
             'error': '회의록 내용을 입력해주세요.'
         }), 400
 
+    # 스트리밍 모드: 완성된 필드/항목을 Server-Sent Events로 바로 전달
+    if request.form.get('mode') == 'stream':
+        def generate():
+            if long_document_analyzer.is_long(meeting_notes):
+                events = long_document_analyzer.analyze_stream(meeting_notes)
+            else:
+                events = analyzer_pool.analyze_meeting_notes_stream(meeting_notes)
+            for event in events:
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    # 비동기 모드: 작업 ID를 즉시 반환하고 /api/jobs/<id>로 결과 조회
+    if request.form.get('mode') == 'async':
+        try:
+            job = job_queue.submit('analyze', {'meeting_notes': meeting_notes}, user=request_user())
+        except JobLimitExceeded as e:
+            return jsonify({'success': False, 'error': str(e)}), 429
+        return jsonify({
+            'success': True,
+            'job': job,
+            'status_url': url_for('get_job', job_id=job['id'])
+        }), 202
+
     try:
         # Gemini로 분석
-        analyzer = GeminiAnalyzer(GEMINI_API_KEY)
-        analysis_result = analyzer.analyze_meeting_notes(meeting_notes)
+        analysis_result = analyze_notes(meeting_notes)
 
         return jsonify({
             'success': True,
@@ -162,6 +519,109 @@ def analyze():
 
 
 
+@app.route('/api/batch', methods=['POST'])
+def submit_batch():
+    """
+    회의록 일괄 분석 요청 (백그라운드 작업으로 처리, 결과는 저장소에 바로 추가)
+    본문: {"documents": [{"id": 선택, "text": 회의록, "category": 선택}], "category": 선택, "include_summary": 선택}
+    """
+    if not GEMINI_API_KEY:
+        return jsonify({'success': False, 'error': 'GEMINI_API_KEY가 설정되지 않았습니다.'}), 500
+
+    body = request.get_json(silent=True) or {}
+    documents = []
+    for index, doc in enumerate(body.get('documents') or []):
+        if isinstance(doc, str):
+            doc = {'text': doc}
+        text = (doc.get('text') or doc.get('meeting_notes') or '').strip() if isinstance(doc, dict) else ''
+        if text:
+            documents.append({
+                'id': str(doc.get('id') or index),
+                'text': text,
+                'category': doc.get('category'),
+                'path': None,
+            })
+
+    if not documents:
+        return jsonify({'success': False, 'error': '분석할 회의록이 없습니다.'}), 400
+    max_documents = int(os.getenv('BATCH_MAX_DOCUMENTS', 500))
+    if len(documents) > max_documents:
+        return jsonify({'success': False, 'error': f'한 번에 최대 {max_documents}개까지 요청할 수 있습니다.'}), 413
+
+    payload = {
+        'batch_id': uuid.uuid4().hex,
+        'documents': documents,
+        'category': body.get('category'),
+        'include_summary': bool(body.get('include_summary', True)),
+    }
+    try:
+        job = job_queue.submit('batch', payload, user=request_user())
+    except JobLimitExceeded as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
+    return jsonify({
+        'success': True,
+        'job': job,
+        'documents': len(documents),
+        'status_url': url_for('get_job', job_id=job['id'])
+    }), 202
+
+
+@app.route('/api/reclaim/sync', methods=['POST'])
+def sync_reclaim():
+    """
+    저장소의 태스크/미팅을 Reclaim.ai와 지금 동기화 (백그라운드 작업)
+    마지막 동기화 이후 양쪽에서 바뀐 항목만 비교하므로 전체 이벤트를 다시 보내지 않습니다.
+    """
+    if reclaim_sync is None:
+        return jsonify({'success': False, 'error': 'RECLAIM_API_TOKEN이 설정되지 않았습니다.'}), 500
+
+    try:
+        job = job_queue.submit('reclaim_sync', {}, user=request_user())
+    except JobLimitExceeded as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
+    return jsonify({
+        'success': True,
+        'job': job,
+        'status_url': url_for('get_job', job_id=job['id'])
+    }), 202
+
+
+@app.route('/api/reclaim/conflicts', methods=['GET'])
+def list_reclaim_conflicts():
+    """
+    자동으로 합치지 못한 Reclaim.ai 동기화 충돌 목록
+    쿼리: ?all=1 이면 해결된 충돌도 포함
+    """
+    if reclaim_sync is None:
+        return jsonify({'success': False, 'error': 'RECLAIM_API_TOKEN이 설정되지 않았습니다.'}), 500
+    include_resolved = request.args.get('all') in ('1', 'true')
+    return jsonify({
+        'success': True,
+        'conflicts': reclaim_sync.state.list_conflicts(ReclaimSync.REMOTE, include_resolved)
+    })
+
+
+@app.route('/api/reclaim/conflicts/<int:conflict_id>', methods=['POST'])
+def resolve_reclaim_conflict(conflict_id):
+    """
+    동기화 충돌 해결
+    본문: {"resolution": "local" | "remote"} - 남길 쪽의 현재 내용을 양쪽에 적용
+    """
+    if reclaim_sync is None:
+        return jsonify({'success': False, 'error': 'RECLAIM_API_TOKEN이 설정되지 않았습니다.'}), 500
+
+    body = request.get_json(silent=True) or {}
+    try:
+        conflict = reclaim_sync.resolve_conflict(conflict_id, body.get('resolution'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except VersionConflict as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except ReclaimAPIError as e:
+        return jsonify({'success': False, 'error': str(e)}), 502
+    return jsonify({'success': True, 'conflict': conflict})
+
+
 @app.route('/health')
 def health():
     """헬스체크 엔드포인트"""
@@ -169,6 +629,13 @@ def health():
         'status': 'ok',
         'gemini_configured': bool(GEMINI_API_KEY),
         'calcom_configured': False,
+        'reclaim_configured': reclaim_sync is not None,
+        'reclaim_sync': reclaim_sync.stats() if reclaim_sync else None,
+        'analysis_cache': analysis_cache.stats(),
+        'jobs': job_queue.stats(),
+        'backups': backup_manager.stats(),
+        'gemini_rate_limit': dict(gemini_rate_limiter.stats(), **gemini_coalescer.stats()),
+        'gemini_keys': analyzer_pool.stats() if analyzer_pool else None,
     }
     return jsonify(status)
 
@@ -183,9 +650,8 @@ def test_gemini():
         }), 500
 
     try:
-        analyzer = GeminiAnalyzer(GEMINI_API_KEY)
         test_text = "회의: 내일 오후 2시 프로젝트 미팅"
-        result = analyzer.analyze_meeting_notes(test_text)
+        result = analyzer_pool.analyze_meeting_notes(test_text)
 
         return jsonify({
             'success': True,
@@ -205,10 +671,19 @@ def test_gemini():
 def handle_db():
     """데이터 조회 및 저장 (Persistent Storage)"""
     if request.method == 'GET':
-        data = load_db()
+        # ?events=false : 회의록 메모만 조회 (이벤트는 /api/events 기간 조회 사용)
+        if request.args.get('events', 'true').lower() == 'false':
+            return jsonify({
+                'success': True,
+                'data': {'meeting_notes': event_store.get_meeting_notes()}
+            })
+
+        # 긴 본문은 참조와 미리보기만 (?full=true면 전체 본문, 내보내기용)
+        data = load_db(bodies=request.args.get('full', 'false').lower() == 'true')
         return jsonify({
             'success': True,
-            'data': data
+            'data': data,
+            'versions': event_store.get_versions()
         })
     
     elif request.method == 'POST':
@@ -217,34 +692,324 @@ def handle_db():
             if not new_data:
                 return jsonify({'success': False, 'error': 'No data provided'}), 400
             
-            # 기존 데이터 로드하여 병합 (필요한 경우) 또는 전체 덮어쓰기
-            # 여기서는 클라이언트가 전체 상태를 관리한다고 가정하고 덮어쓰기/병합을 수행
-            # 하지만 안전을 위해 클라이언트에서 보낸 키만 업데이트하는 방식으로 구현 가능
-            
-            current_data = load_db()
-            
-            if 'meeting_notes' in new_data:
-                current_data['meeting_notes'] = new_data['meeting_notes']
-            
-            if 'events' in new_data:
-                current_data['events'] = new_data['events']
-                
-            save_db(current_data)
+            # 클라이언트에서 보낸 키만 업데이트 (meeting_notes / events)
+            if not save_db(new_data):
+                return jsonify({'success': False, 'error': 'Failed to save data'}), 500
             
             return jsonify({
                 'success': True,
                 'message': 'Data saved successfully'
             })
+        except EventStoreError as e:
+            return _store_error_response(e)
         except Exception as e:
             return jsonify({
                 'success': False,
                 'error': str(e)
             }), 500
 
+
+
+# --- 분석 작업 조회 ---
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """
+    작업 상태 조회
+    ?wait=초 를 주면 상태가 바뀔 때까지 기다렸다가 응답합니다 (롱 폴링, 최대 30초).
+    ?status=&progress= 로 마지막으로 본 상태를 알려주면 그 상태에서 바뀔 때 응답합니다.
+    """
+    try:
+        wait = float(request.args.get('wait', 0) or 0)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'wait는 숫자(초)여야 합니다.'}), 400
+    # nan/음수는 0, 최대 30초
+    wait = min(max(wait, 0.0), 30.0) if wait == wait else 0.0
+    if wait > 0:
+        last_state = None
+        if 'status' in request.args:
+            last_state = (request.args['status'], request.args.get('progress') or None)
+        job = job_queue.wait(job_id, wait, last_state)
+    else:
+        job = job_queue.get(job_id)
+
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+
+@app.route('/api/jobs/<job_id>/events')
+def stream_job(job_id):
+    """작업 상태 변경 구독 (Server-Sent Events, 완료 시 스트림 종료)"""
+    if job_queue.get(job_id) is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+
+    def generate():
+        last_state = None
+        while True:
+            job = job_queue.wait(job_id, 15, last_state)
+            state = (job['status'], job['progress'])
+            if state != last_state:
+                yield f"data: {json.dumps(job, ensure_ascii=False)}\n\n"
+                last_state = state
+            else:
+                yield ": keep-alive\n\n"
+            if job['status'] in FINISHED_STATUSES:
+                break
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+
+# --- 이벤트 단위 델타 API ---
+
+def _if_match_version():
+    """If-Match 헤더에서 기대 버전 추출 (없거나 '*'이면 None)"""
+    header = request.headers.get('If-Match', '').strip()
+    if not header or header == '*':
+        return None
+    tag = header.split(',')[0].strip()
+    if tag.startswith('W/'):
+        tag = tag[2:]
+    try:
+        # 압축된 응답에서 받은 ETag('"3-gzip"')도 같은 버전으로 취급
+        return int(compression.base_etag(tag.strip('"')))
+    except ValueError:
+        return None
+
+
+def _event_response(result, status=200):
+    """단일 이벤트 변경 결과 응답 (ETag = 이벤트 버전)"""
+    response = jsonify({
+        'success': True,
+        'id': result['id'],
+        'version': result['version'],
+        'event': result.get('event')
+    })
+    response.status_code = status
+    if result['version'] is not None:
+        response.set_etag(str(result['version']))
+    return response
+
+
+def _store_error_response(e, precondition=False):
+    """저장소 예외를 HTTP 응답으로 변환"""
+    if isinstance(e, EventNotFound):
+        return jsonify({'success': False, 'error': str(e), 'id': e.event_id}), 404
+    if isinstance(e, VersionConflict):
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'id': e.event_id,
+            'current_version': e.actual
+        }), 412 if precondition else 409
+    return jsonify({'success': False, 'error': str(e)}), 400
+
+
+def _not_modified(etag):
+    """
+    조건부 GET의 304 응답
+    200 응답의 ETag는 압축 시 '-gzip'/'-br'이 붙으므로 클라이언트가 가진 값과 같은 변형으로 돌려줌
+    """
+    encoding = compression.choose_encoding(request.accept_encodings) if RESPONSE_COMPRESSION else None
+    response = app.response_class(status=304)
+    response.set_etag(compression.not_modified_etag(request.if_none_match, etag, encoding))
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+@app.route('/api/events', methods=['GET'])
+def list_events():
+    """
+    기간 조회 (FullCalendar의 보이는 범위만 로드)
+    ?start=&end= (ISO 8601). 변경이 없으면 If-None-Match에 304로 응답합니다.
+    """
+    start_ts = parse_timestamp(request.args.get('start'), event_store.timezone)
+    end_ts = parse_timestamp(request.args.get('end'), event_store.timezone)
+    if start_ts is None or end_ts is None or end_ts <= start_ts:
+        return jsonify({'success': False, 'error': 'start/end 파라미터가 올바르지 않습니다.'}), 400
+
+    etag = event_store.range_fingerprint(start_ts, end_ts)
+    if compression.etag_matches(request.if_none_match, etag):
+        response = _not_modified(etag)
+    else:
+        # 긴 본문은 참조와 미리보기만 (전체 본문은 GET /api/events/<id>/body)
+        events, versions = event_store.list_events_in_range(start_ts, end_ts)
+        response = jsonify({'success': True, 'events': events, 'versions': versions})
+        # 압축하면 after_request 훅이 인코딩 접미사를 붙임
+        response.set_etag(etag)
+
+    # 브라우저가 캐시를 쓰되 항상 재검증하도록
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/search', methods=['GET'])
+def search_events():
+    """
+    회의 요약/이벤트 전문 검색 (제목, 본문, 참석자, 결정 사항 / 관련도 순)
+    ?q=검색어 (필수) &start=&end= (ISO 8601, 구간과 겹치는 이벤트) &status= &sourceId=
+    &type=summary|task|meeting &limit= (최대 100) &offset=
+    """
+    query = (request.args.get('q') or '').strip()
+    if not query:
+        return jsonify({'success': False, 'error': 'q 파라미터가 필요합니다.'}), 400
+
+    start_ts = end_ts = None
+    if request.args.get('start') or request.args.get('end'):
+        start_ts = parse_timestamp(request.args.get('start'), event_store.timezone)
+        end_ts = parse_timestamp(request.args.get('end'), event_store.timezone)
+        if start_ts is None or end_ts is None or end_ts <= start_ts:
+            return jsonify({'success': False, 'error': 'start/end 파라미터가 올바르지 않습니다.'}), 400
+
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'limit/offset은 숫자여야 합니다.'}), 400
+
+    try:
+        with metrics.timer('search_seconds', span='search'):
+            result = event_store.search(
+                query, start_ts, end_ts,
+                status=request.args.get('status'),
+                source_id=request.args.get('sourceId'),
+                kind=request.args.get('type'),
+                limit=limit, offset=offset
+            )
+    except EventStoreError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({'success': True, 'query': query, **result})
+
+
+@app.route('/api/events/<event_id>', methods=['GET'])
+def get_event(event_id):
+    """단일 이벤트 조회"""
+    event, version = event_store.get_event_with_version(event_id)
+    if event is None:
+        return jsonify({'success': False, 'error': 'Event not found'}), 404
+    return _event_response({'id': event_id, 'version': version, 'event': event})
+
+
+@app.route('/api/events/<event_id>/body', methods=['GET'])
+def get_event_body(event_id):
+    """
+    이벤트 전체 본문 조회 (목록에는 긴 본문의 미리보기만 있음)
+    ETag는 본문 내용 해시라서 본문이 그대로면 If-None-Match에 304로 응답합니다.
+    """
+    result = event_store.get_body(event_id)
+    if result is None:
+        return jsonify({'success': False, 'error': 'Event not found'}), 404
+
+    etag = result['ref'] or content_hash(result['body'])
+    if compression.etag_matches(request.if_none_match, etag):
+        response = _not_modified(etag)
+    else:
+        response = jsonify({'success': True, 'id': event_id, 'version': result['version'], 'body': result['body']})
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/events', methods=['POST'])
+def create_event():
+    """단일 이벤트 생성"""
+    event = request.json
+    if not event:
+        return jsonify({'success': False, 'error': 'No data provided'}), 400
+    try:
+        return _event_response(event_store.create_event(event), 201)
+    except EventStoreError as e:
+        return _store_error_response(e)
+
+
+@app.route('/api/events/<event_id>', methods=['PATCH', 'PUT', 'DELETE'])
+def modify_event(event_id):
+    """
+    단일 이벤트 수정/교체/삭제
+    If-Match 헤더(또는 본문의 version)로 버전을 확인해 다른 탭의 변경을 덮어쓰지 않습니다.
+    """
+    body = request.get_json(silent=True) or {}
+    expected = _if_match_version()
+    precondition = expected is not None
+    if expected is None:
+        expected = body.get('version')
+
+    try:
+        if request.method == 'DELETE':
+            result = event_store.delete_event(event_id, expected)
+        elif request.method == 'PUT':
+            result = event_store.replace_event(event_id, body.get('event', body), expected)
+        else:
+            result = event_store.patch_event(event_id, body.get('changes', body), expected)
+        return _event_response(result)
+    except EventStoreError as e:
+        return _store_error_response(e, precondition)
+
+
+@app.route('/api/events', methods=['PATCH'])
+def batch_events():
+    """
+    여러 이벤트 변경을 하나의 트랜잭션으로 적용
+    본문: {"ops": [{"op": "create|patch|replace|delete", "id": ..., "version": ..., ...}]}
+    반복 일정의 발생 ID('<반복 일정 ID>@<발생 키>')에 대한 연산은 그 발생만 바꿉니다.
+    """
+    body = request.get_json(silent=True) or {}
+    ops = body.get('ops')
+    if not isinstance(ops, list):
+        return jsonify({'success': False, 'error': 'ops 목록이 필요합니다.'}), 400
+
+    try:
+        results = event_store.apply_ops(ops)
+    except EventStoreError as e:
+        return _store_error_response(e)
+
+    # seriesId: 반복 일정을 바꾼 연산 (같은 반복 일정의 다른 발생도 버전이 바뀌므로 클라이언트가 다시 조회)
+    return jsonify({'success': True, 'results': _op_results(results), 'history': event_store.history_state()})
+
+
+def _op_results(results):
+    """연산 결과에서 클라이언트에 보낼 값만 추리기 (이벤트 본문 제외)"""
+    return [
+        {'op': r['op'], 'id': r['id'], 'version': r['version'], 'seriesId': r.get('seriesId')}
+        for r in results
+    ]
+
+
+@app.route('/api/history', methods=['GET'])
+def get_history():
+    """실행 취소/다시 실행 가능한 단계 수 (모든 탭이 같은 기록을 공유)"""
+    return jsonify({'success': True, 'history': event_store.history_state()})
+
+
+@app.route('/api/history/<direction>', methods=['POST'])
+def step_history(direction):
+    """
+    가장 최근 변경 묶음 되돌리기(undo) / 되돌린 변경 다시 적용(redo)
+    기록 뒤에 다른 경로(동기화 등)로 바뀐 이벤트가 있으면 409로 응답하고 그 기록은 버립니다.
+    """
+    if direction not in ('undo', 'redo'):
+        return jsonify({'success': False, 'error': 'Not found'}), 404
+    try:
+        result = event_store.undo() if direction == 'undo' else event_store.redo()
+    except EventStoreError as e:
+        return _store_error_response(e)
+    if result is None:
+        message = '되돌릴 변경이 없습니다.' if direction == 'undo' else '다시 적용할 변경이 없습니다.'
+        return jsonify({'success': False, 'error': message, 'history': event_store.history_state()}), 409
+    return jsonify({'success': True, 'results': _op_results(result['results']), 'history': result['history']})
+
+if __name__ != '__main__':
+    # WSGI 서버(gunicorn 등)에서 import된 경우: 워커 프로세스마다 작업 큐/백업/동기화 스레드 시작
+    start_background_workers()
+
 if __name__ == '__main__':
-    # 개발 서버 실행
+    # 개발 서버 실행 (운영 환경은 gunicorn -c gunicorn.conf.py app:app)
     port = int(os.getenv('PORT', 5000))
-    debug = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+    debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
+
+    # 리로더 사용 시 실제 서버를 띄우는 자식 프로세스에서만 워커 시작
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_workers()
 
     print("\n" + "=" * 60)
     print("🚀 회의록 자동화 웹 서버 시작")
@@ -0,0 +1,56 @@
+"""
+gunicorn 운영 서버 설정
+gunicorn -c gunicorn.conf.py app:app
+
+워커 프로세스 여러 개 x 프로세스별 스레드(gthread)로 요청을 처리합니다.
+분석(/analyze)은 Gemini 응답을 기다리는 I/O 대기가 대부분이라 스레드가 오래 묶여도 다른 요청은 다른 스레드가 처리하고,
+SSE 스트리밍(mode=stream)과 작업 진행 상황(/api/jobs/<id>/events)도 연결마다 스레드 하나를 씁니다.
+저장소/작업 큐/속도 제한/백업은 SQLite 트랜잭션과 파일 락으로 프로세스 간에 공유되고,
+/metrics 지표는 워커별 파일(METRICS_MULTIPROC_DIR)을 합쳐 모든 워커의 값을 내보냅니다.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+
+# 바인딩 / 워커 수
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# SQLite 커넥션/백그라운드 스레드는 fork 이후에 만들어야 하므로 워커마다 앱을 따로 import
+preload_app = False
+
+# 동기 /analyze는 긴 회의록이면 수십 초~수 분 걸릴 수 있음
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 300))
+keepalive = 5
+
+# 종료(SIGTERM) 시 처리 중인 요청과 분석 작업을 기다리는 시간 (작업 대기 + 마지막 백업 여유)
+graceful_timeout = int(float(os.getenv('ANALYSIS_DRAIN_SECONDS', 60))) + 30
+
+# 메모리 누수 대비 주기적 워커 교체 (0이면 사용 안 함, 교체 시에도 작업은 정상 종료 절차를 거침)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def on_starting(server):
+    """워커를 띄우기 전 지표 공유 디렉토리를 비우고 워커에 전달 (이전 실행의 값이 섞이지 않게)"""
+    data_dir = Path(os.getenv('DATA_DIR') or Path(__file__).resolve().parent / 'data')
+    metrics_dir = Path(os.environ.setdefault('METRICS_MULTIPROC_DIR', str(data_dir / 'metrics')))
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    for pattern in ('worker-*.json*', 'retired.json*'):
+        for path in metrics_dir.glob(pattern):
+            path.unlink(missing_ok=True)
+
+
+def worker_exit(server, worker):
+    """워커 종료 시 실행 중인 분석 작업 대기 후 백그라운드 스레드 정리"""
+    app_module = sys.modules.get('app')
+    if app_module is not None:
+        app_module.shutdown_background_workers()
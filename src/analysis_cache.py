@@ -0,0 +1,169 @@
+"""
+회의록 분석 결과 캐시 모듈
+정규화된 회의록 + 모델 설정 + 프롬프트 버전의 해시를 키로 분석 결과를 저장합니다.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+def normalize_notes(text: str) -> str:
+    """
+    캐시 키 계산용 회의록 정규화
+    줄바꿈/공백 차이만 있는 회의록은 같은 키가 되도록 합니다.
+
+    Args:
+        text: 원본 회의록 텍스트
+
+    Returns:
+        정규화된 텍스트
+    """
+    text = unicodedata.normalize('NFC', text)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = [re.sub(r'[ \t]+', ' ', line).strip() for line in text.split('\n')]
+    text = '\n'.join(lines)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip()
+
+
+class AnalysisCache:
+    """SQLite 기반 영구 분석 캐시 (LRU + 날짜 기반 TTL)"""
+
+    def __init__(self, db_path: Path, max_entries: int = 500, ttl_seconds: int = 86400):
+        """
+        AnalysisCache 초기화
+
+        Args:
+            db_path: 캐시 SQLite 파일 경로
+            max_entries: 최대 저장 항목 수 (초과 시 가장 오래 사용되지 않은 항목부터 제거)
+            ttl_seconds: 항목 유효 시간 (초)
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                prompt_date TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_access ON analysis_cache (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(text: str, model_name: str, generation_config: Dict[str, Any], prompt_version: str) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            text: 회의록 텍스트
+            model_name: Gemini 모델 이름
+            generation_config: 생성 설정
+            prompt_version: 프롬프트 템플릿 버전
+
+        Returns:
+            SHA-256 해시 문자열
+        """
+        payload = json.dumps({
+            'notes': normalize_notes(text),
+            'model': model_name,
+            'config': generation_config,
+            'prompt_version': prompt_version,
+        }, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, prompt_date: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회
+        프롬프트에 주입되는 '오늘 날짜'가 바뀌면 상대 날짜 변환 결과가 달라지므로 만료로 처리합니다.
+
+        Args:
+            key: make_key()로 생성한 키
+            prompt_date: 현재 프롬프트에 들어갈 오늘 날짜 (YYYY-MM-DD)
+
+        Returns:
+            캐시된 분석 결과 (없거나 만료되면 None)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, prompt_date, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            result, cached_date, created_at = row
+            if cached_date != prompt_date or now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE analysis_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return json.loads(result)
+
+    def put(self, key: str, prompt_date: str, result: Dict[str, Any]):
+        """
+        분석 결과 저장 (최대 항목 수 초과 시 LRU 제거)
+
+        Args:
+            key: make_key()로 생성한 키
+            prompt_date: 분석 시 프롬프트에 사용한 오늘 날짜 (YYYY-MM-DD)
+            result: 분석 결과 딕셔너리
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, result, prompt_date, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), prompt_date, now, now)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM analysis_cache WHERE key IN "
+                    "(SELECT key FROM analysis_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계 반환 (/health 용)
+
+        Returns:
+            hit/miss/eviction 카운터와 현재 항목 수
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': size,
+            'max_entries': self.max_entries,
+        }
@@ -0,0 +1,234 @@
+"""
+회의록 분석 결과 스키마 모듈
+Gemini 구조화 출력(response_schema)에 넘길 스키마와, 받은 결과를 같은 스키마로 검사/정리하는 함수를 제공합니다.
+응답이 잘렸거나 일부가 깨졌을 때 온전한 필드와 배열 항목만 골라내서, 빠진 필드만 다시 요청할 수 있게 합니다.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+from stream_parser import IncrementalJSONParser
+
+
+def _string(nullable: bool = False, **extra) -> Dict[str, Any]:
+    schema = {'type': 'string', **extra}
+    if nullable:
+        schema['nullable'] = True
+    return schema
+
+
+def _object(properties: Dict[str, Any], required: List[str]) -> Dict[str, Any]:
+    return {'type': 'object', 'properties': properties, 'required': required}
+
+
+def _array(items: Dict[str, Any]) -> Dict[str, Any]:
+    return {'type': 'array', 'items': items}
+
+
+# 분석 결과 스키마 (google-generativeai의 dict 스키마 형식)
+ANALYSIS_SCHEMA = _object({
+    'meeting_title': _string(),
+    'meeting_date': _string(nullable=True),
+    'department_name': _string(nullable=True),
+    'summary': _string(),
+    'completed_tasks': _array(_object({
+        'title': _string(),
+        'description': _string(nullable=True),
+        'who': _string(nullable=True),
+    }, ['title'])),
+    'todo_tasks': _array(_object({
+        'title': _string(),
+        'description': _string(nullable=True),
+        'priority': _string(nullable=True, enum=['high', 'medium', 'low']),
+        'who': _string(nullable=True),
+        'deadline': _string(nullable=True),
+        'context': _string(nullable=True),
+    }, ['title'])),
+    'schedule_items': _array(_object({
+        'title': _string(),
+        'description': _string(nullable=True),
+        'date': _string(),
+        'time': _string(nullable=True),
+        'duration_minutes': {'type': 'integer', 'nullable': True},
+        'recurrence': _string(nullable=True),
+        'context': _string(nullable=True),
+    }, ['title', 'date'])),
+    'important_dates': _array(_object({
+        'date': _string(),
+        'description': _string(nullable=True),
+    }, ['date'])),
+    'participants': _array(_string()),
+    'key_decisions': _array(_string()),
+}, [
+    'meeting_title', 'meeting_date', 'department_name', 'summary', 'completed_tasks',
+    'todo_tasks', 'schedule_items', 'important_dates', 'participants', 'key_decisions',
+])
+
+ANALYSIS_KEYS = list(ANALYSIS_SCHEMA['properties'])
+
+_FENCE = re.compile(r'^\s*```[\w-]*[ \t]*\n?(.*?)(?:\n?```\s*)?$', re.DOTALL)
+_INVALID = object()
+
+
+def strip_code_fence(text: str) -> str:
+    """
+    ```json ... ``` 코드 블록 제거 (닫는 ```가 없는 잘린 응답도 처리)
+
+    Args:
+        text: 모델 응답 원문
+
+    Returns:
+        JSON 본문
+    """
+    text = (text or '').strip()
+    match = _FENCE.match(text)
+    return match.group(1).strip() if match else text
+
+
+def sub_schema(keys: List[str]) -> Dict[str, Any]:
+    """
+    일부 필드만 담은 스키마 (빠진 필드만 다시 요청할 때 사용)
+
+    Args:
+        keys: 필드 이름 목록
+
+    Returns:
+        ANALYSIS_SCHEMA와 같은 형식의 스키마
+    """
+    keys = [key for key in ANALYSIS_KEYS if key in keys]
+    return _object({key: ANALYSIS_SCHEMA['properties'][key] for key in keys}, keys)
+
+
+def empty_value(key: str) -> Any:
+    """필드를 끝내 받지 못했을 때 채울 기본값"""
+    kind = ANALYSIS_SCHEMA['properties'][key]['type']
+    if kind == 'array':
+        return []
+    return None if ANALYSIS_SCHEMA['properties'][key].get('nullable') else ''
+
+
+def _coerce(value: Any, schema: Dict[str, Any]) -> Any:
+    """스키마에 맞게 값 정리 (맞출 수 없으면 _INVALID)"""
+    if value is None:
+        return None if schema.get('nullable') else _INVALID
+
+    kind = schema['type']
+    if kind == 'string':
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            return _INVALID
+        value = str(value)
+        if 'enum' in schema and value not in schema['enum']:
+            lowered = value.strip().lower()
+            if lowered in schema['enum']:
+                return lowered
+            return None if schema.get('nullable') else _INVALID
+        return value
+
+    if kind == 'integer':
+        if isinstance(value, bool):
+            return _INVALID
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None if schema.get('nullable') else _INVALID
+
+    if kind == 'array':
+        if not isinstance(value, list):
+            return _INVALID
+        # 형식이 맞지 않는 항목만 버리고 나머지는 살림
+        items = [_coerce(item, schema['items']) for item in value]
+        return [item for item in items if item is not _INVALID and item is not None]
+
+    if kind == 'object':
+        if not isinstance(value, dict):
+            return _INVALID
+        cleaned = dict(value)
+        for key, prop in schema['properties'].items():
+            if key not in value:
+                if key in schema.get('required', []):
+                    return _INVALID
+                continue
+            coerced = _coerce(value[key], prop)
+            if coerced is _INVALID:
+                if key in schema.get('required', []):
+                    return _INVALID
+                cleaned.pop(key)
+            else:
+                cleaned[key] = coerced
+        return cleaned
+
+    return value
+
+
+def validate(result: Any) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    분석 결과를 스키마로 검사
+
+    Args:
+        result: 모델 응답을 파싱한 값
+
+    Returns:
+        (스키마에 맞는 필드만 담은 딕셔너리, 없거나 형식이 틀린 필드 이름 목록)
+        배열 필드는 형식이 틀린 항목만 버리고 필드 자체는 유효한 것으로 봅니다.
+    """
+    if not isinstance(result, dict):
+        return {}, list(ANALYSIS_KEYS)
+
+    clean, missing = {}, []
+    for key in ANALYSIS_KEYS:
+        if key not in result:
+            missing.append(key)
+            continue
+        value = _coerce(result[key], ANALYSIS_SCHEMA['properties'][key])
+        if value is _INVALID:
+            missing.append(key)
+        else:
+            clean[key] = value
+    return clean, missing
+
+
+def salvage(text: str) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    잘렸거나 일부가 깨진 JSON 응답에서 온전한 부분만 꺼내기
+
+    Args:
+        text: 모델 응답 원문
+
+    Returns:
+        (완성된 최상위 필드, 끝까지 받지 못한 배열 필드 이름 목록)
+        끝까지 받지 못한 배열 필드에는 완성된 항목까지만 들어 있습니다.
+    """
+    body = strip_code_fence(text)
+    try:
+        data = json.loads(body)
+        if isinstance(data, dict):
+            return data, []
+    except ValueError:
+        pass
+
+    parser = IncrementalJSONParser()
+    parser.feed(body)
+    fields = dict(parser.fields)
+    truncated = []
+    for key, items in parser.partial_items.items():
+        if key is not None and key not in fields:
+            fields[key] = list(items)
+            truncated.append(key)
+    return fields, truncated
+
+
+def main():
+    """잘린 응답 복구 확인"""
+    text = '```json\n{"meeting_title": "주간 회의/개발팀/26-01-05", "summary": "요약", ' \
+           '"todo_tasks": [{"title": "보고서 작성", "priority": "High"}, {"title": "검'
+    fields, truncated = salvage(text)
+    clean, missing = validate(fields)
+    print(f"살린 필드: {json.dumps(clean, ensure_ascii=False)}")
+    print(f"잘린 배열: {truncated}")
+    print(f"다시 요청할 필드: {sorted(set(missing) | set(truncated))}")
+    print(json.dumps(sub_schema(missing), ensure_ascii=False)[:200] + '...')
+
+
+if __name__ == "__main__":
+    main()
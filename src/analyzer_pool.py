@@ -0,0 +1,222 @@
+"""
+Gemini 분석기 풀 모듈
+프로세스 전체에서 API 키별 분석기(와 연결된 클라이언트/커넥션)를 한 번만 만들어 재사용합니다.
+여러 API 키를 라운드 로빈 또는 최소 부하 방식으로 나눠 씁니다.
+웹 서버와 일괄 가져오기 CLI는 build_analysis()로 같은 설정의 분석 구성 요소를 만듭니다.
+"""
+
+import itertools
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, Mapping
+
+from google.ai import generativelanguage as glm
+from google.api_core.client_options import ClientOptions
+
+from analysis_cache import AnalysisCache
+from chunked_analyzer import ChunkedAnalyzer
+from gemini_analyzer import GeminiAnalyzer
+from rate_limiter import RateLimiter, RequestCoalescer
+
+
+STRATEGIES = ('round_robin', 'least_loaded')
+
+
+def make_generative_client(api_key: str, transport: str = 'grpc', keepalive_seconds: int = 60):
+    """
+    API 키 전용 Gemini 클라이언트 생성
+    genai.configure()는 프로세스 전역 설정이라 키마다 별도 클라이언트를 만듭니다.
+
+    Args:
+        api_key: Gemini API 키
+        transport: 'grpc' 또는 'rest'
+        keepalive_seconds: gRPC keep-alive ping 주기 (초, 0이면 비활성)
+
+    Returns:
+        GenerativeServiceClient
+    """
+    options = ClientOptions(api_key=api_key)
+    if transport == 'rest' or keepalive_seconds <= 0:
+        # REST는 requests 세션이 커넥션을 재사용
+        return glm.GenerativeServiceClient(client_options=options, transport=transport)
+
+    transport_cls = glm.GenerativeServiceClient.get_transport_class('grpc')
+    keepalive_options = [
+        ('grpc.keepalive_time_ms', keepalive_seconds * 1000),
+        ('grpc.keepalive_timeout_ms', 20000),
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.http2.max_pings_without_data', 0),
+    ]
+
+    def channel_init(host, options=(), **kwargs):
+        return transport_cls.create_channel(host, options=list(options) + keepalive_options, **kwargs)
+
+    def transport_init(**kwargs):
+        return transport_cls(channel=channel_init, **kwargs)
+
+    return glm.GenerativeServiceClient(client_options=options, transport=transport_init)
+
+
+class AnalyzerPool:
+    """API 키별 GeminiAnalyzer 풀 (GeminiAnalyzer와 같은 analyze_meeting_notes 인터페이스 제공)"""
+
+    def __init__(
+        self,
+        api_keys: List[str],
+        strategy: str = 'round_robin',
+        transport: str = 'grpc',
+        keepalive_seconds: int = 60,
+        **analyzer_kwargs
+    ):
+        """
+        AnalyzerPool 초기화
+
+        Args:
+            api_keys: Gemini API 키 목록
+            strategy: 키 선택 방식 ('round_robin' 또는 'least_loaded')
+            transport: 'grpc' 또는 'rest'
+            keepalive_seconds: gRPC keep-alive ping 주기 (초)
+            analyzer_kwargs: 모든 분석기에 공통으로 전달할 인자 (cache, rate_limiter, coalescer, structured_output, token_budget 등)
+        """
+        if not api_keys:
+            raise ValueError("API 키가 하나 이상 필요합니다.")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"지원하지 않는 키 선택 방식: {strategy} ({', '.join(STRATEGIES)})")
+
+        self.strategy = strategy
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(range(len(api_keys)))
+        self._slots = []
+        for api_key in api_keys:
+            client = make_generative_client(api_key, transport, keepalive_seconds)
+            self._slots.append({
+                'label': f"...{api_key[-4:]}",
+                'analyzer': GeminiAnalyzer(api_key, client=client, **analyzer_kwargs),
+                'in_flight': 0,
+                'requests': 0,
+            })
+
+    def _select(self) -> Dict[str, Any]:
+        """분석기 선택 (호출 시 in_flight 증가)"""
+        with self._lock:
+            if self.strategy == 'least_loaded':
+                # 진행 중 요청이 가장 적은 키, 같으면 누적 요청이 적은 키
+                slot = min(self._slots, key=lambda s: (s['in_flight'], s['requests']))
+            else:
+                slot = self._slots[next(self._cycle)]
+            slot['in_flight'] += 1
+            slot['requests'] += 1
+            return slot
+
+    @contextmanager
+    def lease(self):
+        """분석기 하나를 빌려 사용 (with 블록이 끝나면 반환)"""
+        slot = self._select()
+        try:
+            yield slot['analyzer']
+        finally:
+            with self._lock:
+                slot['in_flight'] -= 1
+
+    def analyze_meeting_notes(self, text: str) -> Dict[str, Any]:
+        """풀에서 분석기를 골라 GeminiAnalyzer.analyze_meeting_notes() 실행"""
+        with self.lease() as analyzer:
+            return analyzer.analyze_meeting_notes(text)
+
+    def analyze_meeting_notes_stream(self, text: str) -> Iterator[Dict[str, Any]]:
+        """풀에서 분석기를 골라 GeminiAnalyzer.analyze_meeting_notes_stream() 실행 (스트림이 끝날 때까지 점유)"""
+        with self.lease() as analyzer:
+            yield from analyzer.analyze_meeting_notes_stream(text)
+
+    def combine_summaries(self, summaries: List[str]):
+        """풀에서 분석기를 골라 GeminiAnalyzer.combine_summaries() 실행"""
+        with self.lease() as analyzer:
+            return analyzer.combine_summaries(summaries)
+
+    def stats(self) -> Dict[str, Any]:
+        """키별 진행 중/누적 요청 수 (키는 마지막 4자리만 표시)"""
+        with self._lock:
+            return {
+                'strategy': self.strategy,
+                'keys': [
+                    {'key': s['label'], 'in_flight': s['in_flight'], 'requests': s['requests']}
+                    for s in self._slots
+                ],
+            }
+
+
+def parse_api_keys(env: Mapping[str, str]) -> List[str]:
+    """GEMINI_API_KEYS(쉼표로 여러 개) 또는 GEMINI_API_KEY에서 API 키 목록"""
+    return [
+        key.strip() for key in env.get('GEMINI_API_KEYS', env.get('GEMINI_API_KEY') or '').split(',')
+        if key.strip()
+    ]
+
+
+def build_analysis(data_dir: Path, env: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    분석 구성 요소 생성 (웹 서버와 batch_importer CLI가 같은 설정으로 사용)
+    캐시/속도 제한/동일 요청 합치기 상태는 data_dir의 파일이므로 같은 data_dir를 쓰는 모든 프로세스가 공유합니다.
+
+    Args:
+        data_dir: 데이터 디렉토리
+        env: 설정을 읽을 환경 변수 (os.environ)
+
+    Returns:
+        {'api_keys', 'cache', 'rate_limiter', 'coalescer', 'pool', 'chunked'} - API 키가 없으면 pool/chunked는 None
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    api_keys = parse_api_keys(env)
+
+    # 분석 결과 캐시 (같은 회의록 재분석 시 Gemini 호출 생략)
+    cache = AnalysisCache(
+        data_dir / "analysis_cache.sqlite3",
+        max_entries=int(env.get('ANALYSIS_CACHE_MAX_ENTRIES', 500)),
+        ttl_seconds=int(env.get('ANALYSIS_CACHE_TTL_SECONDS', 86400))
+    )
+    # Gemini 호출 속도 제한 (상태 파일 공유) + 동일 요청 합치기 (키별 락 파일로 프로세스 간에도)
+    rate_limiter = RateLimiter(
+        data_dir / "gemini_rate_limit.json",
+        rpm=int(env.get('GEMINI_RPM', 10)),
+        tpm=int(env.get('GEMINI_TPM', 250000)),
+        max_wait=float(env.get('GEMINI_MAX_WAIT_SECONDS', 120))
+    )
+    coalescer = RequestCoalescer(data_dir / "gemini_inflight")
+
+    pool = chunked = None
+    if api_keys:
+        # 키별 클라이언트/커넥션을 유지하는 분석기 풀
+        pool = AnalyzerPool(
+            api_keys,
+            strategy=env.get('GEMINI_KEY_STRATEGY', 'round_robin'),
+            transport=env.get('GEMINI_TRANSPORT', 'grpc'),
+            keepalive_seconds=int(env.get('GEMINI_KEEPALIVE_SECONDS', 60)),
+            cache=cache,
+            rate_limiter=rate_limiter,
+            coalescer=coalescer,
+            # JSON 모드 + 응답 스키마 (응답 스키마를 지원하지 않는 모델이면 False)
+            structured_output=env.get('GEMINI_STRUCTURED_OUTPUT', 'True').lower() == 'true',
+            # 회의록 입력 토큰 예산, 입력 크기별 모델 단계 (예: 'gemini-2.5-flash-lite:4000,gemini-2.5-flash')
+            token_budget=int(env.get('ANALYSIS_TOKEN_BUDGET', 32000)),
+            model_tiers=env.get('GEMINI_MODEL_TIERS') or None,
+            context_cache_ttl=int(env.get('GEMINI_CONTEXT_CACHE_TTL_SECONDS', 0))
+        )
+        # 긴 회의록은 화자/섹션 단위로 나눠 동시에 분석한 뒤 병합
+        chunked = ChunkedAnalyzer(
+            pool.analyze_meeting_notes,
+            combine_summaries=pool.combine_summaries,
+            max_workers=int(env.get('LONG_DOCUMENT_WORKERS', 4)),
+            chunk_chars=int(env.get('LONG_DOCUMENT_CHUNK_CHARS', 12000)),
+            threshold_chars=int(env.get('LONG_DOCUMENT_THRESHOLD_CHARS', 20000))
+        )
+
+    return {
+        'api_keys': api_keys,
+        'cache': cache,
+        'rate_limiter': rate_limiter,
+        'coalescer': coalescer,
+        'pool': pool,
+        'chunked': chunked,
+    }
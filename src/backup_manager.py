@@ -0,0 +1,448 @@
+"""
+증분 백업 모듈
+이벤트 저장소의 변경 기록을 압축 세그먼트로 옮겨 쌓고, 주기적으로 전체 스냅샷을 만들어 압축 보관합니다.
+오래된 스냅샷은 시간/일/주 단위로 솎아내고, 원하는 시점으로 복원할 수 있습니다.
+"""
+
+import gzip
+import json
+import os
+import time
+import threading
+import argparse
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내 락만 사용
+    fcntl = None
+
+import metrics
+from event_store import EventStore, CHANGE_UPSERT, CHANGE_DELETE, CHANGE_NOTES, DEFAULT_TIMEZONE
+
+
+MANIFEST_NAME = 'manifest.json'
+
+metrics.describe('backup_seconds', metrics.HISTOGRAM, '백업 단계별 소요 시간 (초, stage=changes|snapshot)')
+metrics.describe('backup_changes_total', metrics.COUNTER, '백업으로 옮긴 변경 기록 수')
+metrics.describe('backup_failures_total', metrics.COUNTER, '백업 실패 수')
+
+
+def _write_gzip_json(path: Path, lines: List[Any]):
+    """JSON 줄 목록을 gzip으로 원자적 저장 (.tmp에 쓰고 이름 변경)"""
+    tmp_path = Path(str(path) + '.tmp')
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        for line in lines:
+            f.write(json.dumps(line, ensure_ascii=False) + '\n')
+    tmp_path.replace(path)
+
+
+def _read_gzip_json(path: Path) -> List[Any]:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def thin_snapshots(snapshots: List[Dict[str, Any]], keep_hourly: int, keep_daily: int,
+                   keep_weekly: int) -> List[Dict[str, Any]]:
+    """
+    보관할 스냅샷 선택 (최근 N시간/N일/N주마다 가장 최신 스냅샷 하나씩, 최신 스냅샷은 항상 유지)
+
+    Args:
+        snapshots: 스냅샷 목록 ('at' 포함)
+        keep_hourly: 시간 단위로 남길 개수
+        keep_daily: 일 단위로 남길 개수
+        keep_weekly: 주 단위로 남길 개수
+
+    Returns:
+        남길 스냅샷 목록 (오래된 순)
+    """
+    newest_first = sorted(snapshots, key=lambda s: s['at'], reverse=True)
+    keep = {id(s) for s in newest_first[:1]}
+
+    for count, bucket in (
+        (keep_hourly, lambda dt: dt.strftime('%Y%m%d%H')),
+        (keep_daily, lambda dt: dt.strftime('%Y%m%d')),
+        (keep_weekly, lambda dt: '%d-%02d' % dt.isocalendar()[:2]),
+    ):
+        seen = set()
+        for snapshot in newest_first:
+            if len(seen) >= count:
+                break
+            key = bucket(datetime.fromtimestamp(snapshot['at']))
+            if key not in seen:
+                seen.add(key)
+                keep.add(id(snapshot))
+
+    return [s for s in reversed(newest_first) if id(s) in keep]
+
+
+class BackupManager:
+    """변경 기록 세그먼트 + 압축 스냅샷 백업 (요청 처리와 별개로 백그라운드에서 실행)"""
+
+    def __init__(
+        self,
+        event_store: EventStore,
+        backup_dir: Path,
+        interval: float = 600,
+        snapshot_interval: float = 3600,
+        keep_hourly: int = 24,
+        keep_daily: int = 7,
+        keep_weekly: int = 8,
+        pitr_seconds: float = 7 * 86400
+    ):
+        """
+        BackupManager 초기화
+
+        Args:
+            event_store: 백업할 이벤트 저장소
+            backup_dir: 백업 디렉토리
+            interval: 변경 기록을 세그먼트로 옮기는 주기 (초)
+            snapshot_interval: 변경이 있을 때 새 스냅샷을 만드는 최소 간격 (초)
+            keep_hourly: 시간 단위로 남길 스냅샷 수
+            keep_daily: 일 단위로 남길 스냅샷 수
+            keep_weekly: 주 단위로 남길 스냅샷 수
+            pitr_seconds: 변경 세그먼트 보관 기간 (이 기간 안에서는 임의 시점 복원 가능)
+        """
+        self.event_store = event_store
+        self.backup_dir = Path(backup_dir)
+        self.interval = interval
+        self.snapshot_interval = snapshot_interval
+        self.keep_hourly = keep_hourly
+        self.keep_daily = keep_daily
+        self.keep_weekly = keep_weekly
+        self.pitr_seconds = pitr_seconds
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_run = None
+        self.last_error = None
+
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+
+    # --- 매니페스트 ---
+
+    def _manifest_path(self) -> Path:
+        return self.backup_dir / MANIFEST_NAME
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """백업 목록 (파일 목록을 매번 훑지 않도록 매니페스트로 관리)"""
+        path = self._manifest_path()
+        if not path.exists():
+            return {'snapshots': [], 'segments': []}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = Path(str(self._manifest_path()) + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self._manifest_path())
+
+    @contextmanager
+    def _exclusive(self):
+        """
+        다른 프로세스와 동시에 백업하지 않도록 잠금
+        이미 다른 프로세스가 백업 중이면 False를 넘겨 이번 회차를 건너뜁니다.
+        """
+        with self._lock:
+            with open(self.backup_dir / '.lock', 'a') as f:
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        yield False
+                        return
+                try:
+                    yield True
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+
+    # --- 백업 ---
+
+    @staticmethod
+    def _shipped_seq(manifest: Dict[str, Any]) -> int:
+        """세그먼트로 이미 옮긴 마지막 변경 번호 (스냅샷과 관계없이 세그먼트는 끊김 없이 이어짐)"""
+        return max((s['to_seq'] for s in manifest['segments']), default=0)
+
+    def _ship_changes(self, manifest: Dict[str, Any]) -> int:
+        """새 변경 기록을 압축 세그먼트로 저장 후 저장소에서 삭제 (비용은 변경량에 비례)"""
+        shipped = self._shipped_seq(manifest)
+        changes = self.event_store.changes_since(shipped, limit=1000000)
+        if not changes:
+            return 0
+
+        from_seq, to_seq = changes[0]['seq'], changes[-1]['seq']
+        name = f"changes_{from_seq:012d}_{to_seq:012d}.jsonl.gz"
+        _write_gzip_json(self.backup_dir / name, changes)
+        manifest['segments'].append({
+            'file': name,
+            'from_seq': from_seq,
+            'to_seq': to_seq,
+            'start_at': changes[0]['at'],
+            'end_at': changes[-1]['at'],
+            'count': len(changes),
+        })
+        self._save_manifest(manifest)
+        self.event_store.truncate_changes(to_seq)
+        return len(changes)
+
+    def _take_snapshot(self, manifest: Dict[str, Any], force: bool = False) -> Optional[Dict[str, Any]]:
+        """전체 상태 압축 스냅샷 (마지막 스냅샷 이후 변경이 없으면 만들지 않음)"""
+        latest = manifest['snapshots'][-1] if manifest['snapshots'] else None
+        if latest is not None and not force:
+            if time.time() - latest['at'] < self.snapshot_interval:
+                return None
+            if self.event_store.get_revision() == latest['revision']:
+                return None
+
+        state = self.event_store.snapshot()
+        if latest is not None and state['revision'] == latest['revision']:
+            return None
+
+        now = time.time()
+        name = f"snapshot_{datetime.fromtimestamp(now).strftime('%Y%m%d_%H%M%S')}_r{state['revision']}.json.gz"
+        header = {k: state[k] for k in ('seq', 'revision', 'meeting_notes')}
+        _write_gzip_json(self.backup_dir / name, [header] + state['events'])
+
+        entry = {'file': name, 'at': now, 'seq': state['seq'], 'revision': state['revision'],
+                 'events': len(state['events'])}
+        manifest['snapshots'].append(entry)
+        self._save_manifest(manifest)
+        return entry
+
+    def _apply_retention(self, manifest: Dict[str, Any]) -> int:
+        """
+        보관 정책에 따라 오래된 스냅샷/세그먼트 삭제
+        임의 시점 복원 기간이 시작되는 기준 스냅샷과 그 이후 세그먼트는 항상 남깁니다.
+        """
+        snapshots = manifest['snapshots']
+        if not snapshots:
+            return 0
+
+        cutoff = time.time() - self.pitr_seconds
+        older = [s for s in snapshots if s['at'] <= cutoff]
+        pitr_base = older[-1] if older else snapshots[0]
+
+        kept = thin_snapshots(snapshots, self.keep_hourly, self.keep_daily, self.keep_weekly)
+        if pitr_base not in kept:
+            kept = sorted(kept + [pitr_base], key=lambda s: s['at'])
+        removed = [s['file'] for s in snapshots if s not in kept]
+        manifest['snapshots'] = kept
+
+        segments = []
+        for segment in manifest['segments']:
+            if segment['to_seq'] <= pitr_base['seq']:
+                removed.append(segment['file'])
+            else:
+                segments.append(segment)
+        manifest['segments'] = segments
+
+        if removed:
+            self._save_manifest(manifest)
+            for name in removed:
+                (self.backup_dir / name).unlink(missing_ok=True)
+        return len(removed)
+
+    def run_once(self, force_snapshot: bool = False) -> Dict[str, Any]:
+        """
+        백업 1회 실행 (변경 세그먼트 → 필요 시 스냅샷 → 보관 정책)
+
+        Args:
+            force_snapshot: 간격과 관계없이 스냅샷 생성
+
+        Returns:
+            실행 결과 통계
+        """
+        with self._exclusive() as acquired:
+            if not acquired:
+                return {'skipped': True}
+            manifest = self.load_manifest()
+            with metrics.timer('backup_seconds', stage='changes'):
+                shipped = self._ship_changes(manifest)
+            snapshot = None
+            # 빈 저장소는 스냅샷 생략
+            if manifest['snapshots'] or self.event_store.count_events() or self.event_store.get_meeting_notes():
+                with metrics.timer('backup_seconds', stage='snapshot'):
+                    snapshot = self._take_snapshot(manifest, force=force_snapshot or not manifest['snapshots'])
+            removed = self._apply_retention(manifest)
+            # 스냅샷 주기마다 참조가 끊긴 본문 블롭 정리 (삭제된 이벤트 본문은 변경 세그먼트에 남아 있음)
+            blobs = self.event_store.purge_blobs() if snapshot else 0
+        self.last_run = time.time()
+        metrics.inc('backup_changes_total', shipped)
+        return {'changes': shipped, 'snapshot': snapshot['file'] if snapshot else None, 'removed': removed,
+                'blobs_removed': blobs}
+
+    # --- 백그라운드 실행 ---
+
+    def start(self):
+        """백그라운드 백업 스레드 시작"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="backup", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """백그라운드 스레드 종료 (남은 변경 기록은 마지막으로 한 번 옮김)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _loop(self):
+        while True:
+            try:
+                result = self.run_once()
+                self.last_error = None
+                if result.get('changes') or result.get('snapshot') or result.get('removed'):
+                    print(f"백업: 변경 {result['changes']}건, 스냅샷 {result['snapshot']}, 삭제 {result['removed']}개")
+            except Exception as e:
+                self.last_error = str(e)
+                metrics.inc('backup_failures_total')
+                print(f"백업 실패: {e}")
+            if self._stop.wait(self.interval):
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"백업 실패: {e}")
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        """백업 현황"""
+        manifest = self.load_manifest()
+        return {
+            'snapshots': len(manifest['snapshots']),
+            'segments': len(manifest['segments']),
+            'latest_snapshot': manifest['snapshots'][-1]['file'] if manifest['snapshots'] else None,
+            'last_run': self.last_run,
+            'last_error': self.last_error,
+        }
+
+    # --- 복원 ---
+
+    def _changes_after(self, manifest: Dict[str, Any], seq: int):
+        """seq 이후의 백업된 변경 기록 (번호 순)"""
+        for segment in sorted(manifest['segments'], key=lambda s: s['from_seq']):
+            if segment['to_seq'] <= seq:
+                continue
+            for change in _read_gzip_json(self.backup_dir / segment['file']):
+                if change['seq'] > seq:
+                    yield change
+
+    def restore_state(self, at: Optional[float] = None) -> Dict[str, Any]:
+        """
+        지정한 시점의 저장소 상태 재구성 (저장소는 변경하지 않음)
+
+        Args:
+            at: 복원할 시점 (epoch 초, None이면 가장 최근)
+
+        Returns:
+            {'state': snapshot() 형식 상태, 'restored_at': 실제로 재구성된 시점, 'snapshot': 기준 스냅샷 파일}
+
+        Raises:
+            ValueError: 해당 시점 이전의 스냅샷이 없음
+        """
+        manifest = self.load_manifest()
+        target = time.time() if at is None else at
+        candidates = [s for s in manifest['snapshots'] if s['at'] <= target]
+        if not candidates:
+            raise ValueError("해당 시점 이전의 스냅샷이 없습니다.")
+        base = candidates[-1]
+
+        lines = _read_gzip_json(self.backup_dir / base['file'])
+        header = lines[0]
+        events = {entry['event']['id']: entry for entry in lines[1:]}
+        notes = header.get('meeting_notes') or ''
+        seq = base['seq']
+        restored_at = base['at']
+
+        # 스냅샷 이후의 변경을 순서대로 재생 (세그먼트가 끊기거나 목표 시점을 넘으면 중단)
+        for change in self._changes_after(manifest, seq):
+            if change['seq'] != seq + 1 or change['at'] > target:
+                break
+            if change['op'] == CHANGE_UPSERT:
+                events[change['id']] = change['data']
+            elif change['op'] == CHANGE_DELETE:
+                events.pop(change['id'], None)
+            elif change['op'] == CHANGE_NOTES:
+                notes = change['data'] or ''
+            seq = change['seq']
+            restored_at = change['at']
+
+        ordered = sorted(events.values(), key=lambda e: e['position'])
+        return {
+            'state': {'seq': seq, 'meeting_notes': notes, 'events': ordered},
+            'restored_at': restored_at,
+            'snapshot': base['file'],
+        }
+
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    """'YYYY-MM-DD HH:MM[:SS]' 또는 ISO 8601 → epoch 초"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def main():
+    """백업 CLI (python src/backup_manager.py backup|list|restore ...)"""
+    project_root = Path(__file__).resolve().parent.parent
+    from dotenv import load_dotenv
+    env_path = project_root / "config" / ".env"
+    load_dotenv(env_path if env_path.exists() else project_root / ".env")
+    # 웹 서버와 같은 데이터 디렉토리 (DATA_DIR)
+    data_dir = Path(os.getenv('DATA_DIR') or project_root / "data")
+
+    parser = argparse.ArgumentParser(description="이벤트 저장소 증분 백업/복원")
+    parser.add_argument('--db', default=str(data_dir / "db.sqlite3"), help="이벤트 저장소 경로")
+    parser.add_argument('--backup-dir', default=str(data_dir / "backups"), help="백업 디렉토리")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    backup = sub.add_parser('backup', help="지금 백업 (변경 기록 + 스냅샷)")
+    backup.add_argument('--snapshot', action='store_true', help="간격과 관계없이 스냅샷 생성")
+    sub.add_parser('list', help="백업 목록")
+    restore = sub.add_parser('restore', help="지정 시점으로 복원")
+    restore.add_argument('--at', help="복원 시점 (예: '2026-01-20 14:30', 생략하면 가장 최근)")
+    restore.add_argument('--out', help="저장소 대신 db.json 형식 파일로 내보내기")
+    args = parser.parse_args()
+
+    store = EventStore(Path(args.db), timezone=os.getenv('TIMEZONE', DEFAULT_TIMEZONE))
+    manager = BackupManager(store, Path(args.backup_dir))
+
+    if args.command == 'backup':
+        print(manager.run_once(force_snapshot=args.snapshot))
+
+    elif args.command == 'list':
+        manifest = manager.load_manifest()
+        print("스냅샷:")
+        for s in manifest['snapshots']:
+            print(f"  {datetime.fromtimestamp(s['at']):%Y-%m-%d %H:%M:%S}  r{s['revision']}  "
+                  f"{s['events']}개 이벤트  {s['file']}")
+        print("변경 세그먼트:")
+        for s in manifest['segments']:
+            print(f"  {datetime.fromtimestamp(s['start_at']):%Y-%m-%d %H:%M:%S} ~ "
+                  f"{datetime.fromtimestamp(s['end_at']):%Y-%m-%d %H:%M:%S}  {s['count']}건  {s['file']}")
+
+    elif args.command == 'restore':
+        result = manager.restore_state(_parse_time(args.at))
+        state = result['state']
+        print(f"기준 스냅샷: {result['snapshot']}")
+        print(f"복원 시점: {datetime.fromtimestamp(result['restored_at']):%Y-%m-%d %H:%M:%S} "
+              f"({len(state['events'])}개 이벤트)")
+        if args.out:
+            data = {'meeting_notes': state['meeting_notes'], 'events': [e['event'] for e in state['events']]}
+            with open(args.out, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            print(f"내보내기 완료: {args.out}")
+        else:
+            # 복원 직전 상태도 스냅샷으로 남겨 되돌릴 수 있게 함
+            manager.run_once(force_snapshot=True)
+            store.restore_snapshot(state)
+            print(f"저장소 복원 완료: {args.db}")
+
+
+if __name__ == "__main__":
+    main()
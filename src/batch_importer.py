@@ -0,0 +1,428 @@
+"""
+회의록 일괄 가져오기 모듈
+쌓여 있는 회의록(디렉토리 또는 JSONL)을 동시에 분석해서 이벤트 저장소에 묶음 단위로 넣습니다.
+진행 상황을 체크포인트 파일에 남겨 중단되어도 이어서 처리할 수 있습니다.
+"""
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Optional
+
+from recurrence import normalize_rrule
+
+
+DOCUMENT_SUFFIXES = ('.txt', '.md')
+DEFAULT_CATEGORY = 'ai_req'
+DEFAULT_TIME = '10:00'
+
+
+def _valid_date(value: Any) -> Optional[str]:
+    """YYYY-MM-DD 형식이면 그대로, 아니면 None"""
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
+
+
+def _timed_range(date: str, time: Optional[str]) -> Optional[tuple]:
+    """날짜 + 시간 → (시작, 종료) ISO 문자열 (1시간 일정)"""
+    try:
+        start = datetime.strptime(f"{date} {time or DEFAULT_TIME}", '%Y-%m-%d %H:%M')
+    except (TypeError, ValueError):
+        return None
+    end = start + timedelta(hours=1)
+    return start.strftime('%Y-%m-%dT%H:%M:%S'), end.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def analysis_to_events(
+    analysis: Dict[str, Any],
+    doc_id: str,
+    category: str = DEFAULT_CATEGORY,
+    include_summary: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    분석 결과를 캘린더 이벤트로 변환 (화면의 'Add to Calendar'와 같은 형태)
+
+    Args:
+        analysis: analyze_meeting_notes() 결과
+        doc_id: 원본 회의록 식별자 (이벤트 ID와 sourceId 생성에 사용)
+        category: 이벤트 분류
+        include_summary: 요약 이벤트 포함 여부
+
+    Returns:
+        이벤트 목록 (같은 문서는 항상 같은 ID)
+    """
+    source_id = 'batch-' + hashlib.sha256(doc_id.encode('utf-8')).hexdigest()[:16]
+    meeting_title = analysis.get('meeting_title') or 'Meeting Summary'
+    # 과거 회의록이므로 기본 날짜는 오늘이 아니라 회의 날짜
+    base_date = _valid_date(analysis.get('meeting_date')) or datetime.now().strftime('%Y-%m-%d')
+    events = []
+
+    def add(event):
+        event['id'] = f"{source_id}-{len(events)}"
+        events.append(event)
+
+    if include_summary:
+        summary = analysis.get('summary') or ''
+        add({
+            'title': meeting_title,
+            'start': base_date,
+            'allDay': True,
+            'extendedProps': {
+                'description': summary, 'isSummary': True,
+                'category': category, 'sourceId': source_id,
+                # 검색용 (참석자/결정 사항)
+                'participants': analysis.get('participants') or [],
+                'keyDecisions': analysis.get('key_decisions') or [],
+            },
+        })
+
+    for task in analysis.get('todo_tasks') or []:
+        description = task.get('description') or ''
+        if task.get('context'):
+            description = f"{description}\n\n[Context]\n{task['context']}"
+        start, end = _timed_range(_valid_date(task.get('deadline')) or base_date, DEFAULT_TIME)
+        add({
+            'title': task.get('title') or '',
+            'start': start,
+            'end': end,
+            'allDay': False,
+            'extendedProps': {
+                'description': description, 'isTask': True, 'status': 'todo',
+                'category': category, 'sourceId': source_id, 'sourceTitle': meeting_title,
+            },
+        })
+
+    for item in analysis.get('schedule_items') or []:
+        timed = _timed_range(_valid_date(item.get('date')), item.get('time'))
+        if timed is None:
+            print(f"날짜가 올바르지 않은 일정 건너뜀: {item.get('title')}")
+            continue
+        event = {
+            'title': item.get('title') or '',
+            'start': timed[0],
+            'end': timed[1],
+            'allDay': False,
+            'extendedProps': {
+                'description': item.get('description') or '', 'isMeeting': True,
+                'category': category, 'sourceId': source_id, 'sourceTitle': meeting_title,
+            },
+        }
+        if item.get('recurrence'):
+            # 반복 일정은 이벤트 하나(첫 발생 + 규칙)로 저장하고 조회할 때 펼침
+            try:
+                event['rrule'] = normalize_rrule(item['recurrence'])
+            except ValueError as e:
+                print(f"반복 규칙이 올바르지 않아 한 번만 추가: {item.get('title')} ({e})")
+        add(event)
+
+    return events
+
+
+def load_documents(path: Path) -> List[Dict[str, Any]]:
+    """
+    회의록 목록 읽기
+
+    Args:
+        path: .txt/.md 파일이 들어 있는 디렉토리, 또는 JSONL 파일
+              (각 줄: {"id": 선택, "text": 회의록, "category": 선택})
+
+    Returns:
+        [{'id', 'text', 'category', 'path'}] (path는 디렉토리 입력일 때만)
+    """
+    path = Path(path)
+    documents = []
+
+    if path.is_dir():
+        for file_path in sorted(path.rglob('*')):
+            if file_path.is_file() and file_path.suffix.lower() in DOCUMENT_SUFFIXES:
+                text = file_path.read_text(encoding='utf-8').strip()
+                if text:
+                    documents.append({
+                        'id': str(file_path.relative_to(path)),
+                        'text': text,
+                        'category': None,
+                        'path': str(file_path),
+                    })
+        return documents
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            text = (record.get('text') or record.get('meeting_notes') or '').strip()
+            if text:
+                documents.append({
+                    'id': str(record.get('id') or f"{path.name}:{line_number}"),
+                    'text': text,
+                    'category': record.get('category'),
+                    'path': None,
+                })
+    return documents
+
+
+class Checkpoint:
+    """처리 완료한 문서 기록 (JSONL 추가 기록이라 중간에 멈춰도 손상되지 않음)"""
+
+    def __init__(self, path: Path):
+        """
+        Checkpoint 초기화 (기존 기록이 있으면 읽어옴)
+
+        Args:
+            path: 체크포인트 파일 경로
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.done = set()
+        self.failed: Dict[str, str] = {}
+
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # 기록 도중 중단된 마지막 줄
+                    if entry.get('status') == 'done':
+                        self.done.add(entry['id'])
+                        self.failed.pop(entry['id'], None)
+                    else:
+                        self.failed[entry['id']] = entry.get('error') or ''
+
+    def record(self, entries: List[Dict[str, Any]]):
+        """
+        처리 결과 기록
+
+        Args:
+            entries: [{'id', 'status': 'done'|'failed', 'events', 'error'}]
+        """
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(dict(entry, at=datetime.now().isoformat()), ensure_ascii=False) + '\n')
+                if entry['status'] == 'done':
+                    self.done.add(entry['id'])
+                    self.failed.pop(entry['id'], None)
+                else:
+                    self.failed[entry['id']] = entry.get('error') or ''
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _analysis_error(analysis: Any) -> Optional[str]:
+    """분석 실패 결과면 에러 메시지 반환"""
+    if not isinstance(analysis, dict):
+        return '분석 결과 형식 오류'
+    if analysis.get('error'):
+        return str(analysis['error'])
+    if 'raw_response' in analysis:
+        return 'JSON 파싱 오류'
+    return None
+
+
+class BatchImporter:
+    """회의록 여러 개를 동시에 분석하고 결과를 묶음 트랜잭션으로 저장"""
+
+    def __init__(
+        self,
+        analyze: Callable[[str], Dict[str, Any]],
+        event_store,
+        max_workers: int = 4,
+        commit_every: int = 20,
+        category: str = DEFAULT_CATEGORY,
+        include_summary: bool = True
+    ):
+        """
+        BatchImporter 초기화
+
+        Args:
+            analyze: 회의록 하나를 분석하는 함수 (호출 속도 제한은 이 함수 안에서 적용)
+            event_store: 결과를 넣을 EventStore
+            max_workers: 동시에 분석할 문서 수
+            commit_every: 이 개수만큼 분석이 끝날 때마다 저장소에 한 번에 기록
+            category: 기본 이벤트 분류 (문서별 category가 있으면 우선)
+            include_summary: 요약 이벤트 포함 여부
+        """
+        self.analyze = analyze
+        self.event_store = event_store
+        self.max_workers = max_workers
+        self.commit_every = max(1, commit_every)
+        self.category = category
+        self.include_summary = include_summary
+
+    def _flush(self, pending: List[Dict[str, Any]], checkpoint: Checkpoint,
+               processed_dir: Optional[Path], stats: Dict[str, int]):
+        """분석이 끝난 문서들의 이벤트를 한 트랜잭션으로 저장 후 체크포인트 기록"""
+        if not pending:
+            return
+
+        events = [event for doc in pending for event in doc['events']]
+        result = self.event_store.insert_events(events)
+        stats['events_inserted'] += result['inserted']
+        stats['events_skipped'] += result['skipped']
+
+        # 저장소 커밋 후에 기록 (중간에 멈추면 다시 분석하지만 이벤트 ID가 같아 중복 저장되지 않음)
+        checkpoint.record([
+            {'id': doc['id'], 'status': 'done', 'events': len(doc['events'])} for doc in pending
+        ])
+
+        if processed_dir is not None:
+            for doc in pending:
+                self._archive(doc, processed_dir)
+        pending.clear()
+
+    @staticmethod
+    def _archive(doc: Dict[str, Any], processed_dir: Path):
+        """처리한 원본 파일을 processed/로 옮기고 분석 결과를 옆에 저장"""
+        if not doc.get('path'):
+            return
+        target = processed_dir / doc['id']
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(str(target) + '.analysis.json', 'w', encoding='utf-8') as f:
+            json.dump(doc['analysis'], f, ensure_ascii=False, indent=2)
+        shutil.move(doc['path'], target)
+
+    def run(
+        self,
+        documents: List[Dict[str, Any]],
+        checkpoint_path: Path,
+        processed_dir: Optional[Path] = None,
+        report_progress: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        일괄 분석 + 저장 (체크포인트에 완료로 기록된 문서는 건너뜀)
+
+        Args:
+            documents: load_documents() 형식의 문서 목록
+            checkpoint_path: 체크포인트 파일 경로 (같은 경로로 다시 실행하면 이어서 처리)
+            processed_dir: 처리한 원본 파일을 옮길 디렉토리 (선택)
+            report_progress: 진행 메시지를 받을 함수 (선택)
+
+        Returns:
+            처리 통계
+        """
+        checkpoint = Checkpoint(checkpoint_path)
+        todo = [doc for doc in documents if doc['id'] not in checkpoint.done]
+        stats = {
+            'total': len(documents),
+            'skipped': len(documents) - len(todo),
+            'done': 0,
+            'failed': 0,
+            'events_inserted': 0,
+            'events_skipped': 0,
+            'errors': {},
+        }
+        if report_progress is not None:
+            report_progress(f"일괄 분석 중 (0/{len(todo)}, 이전 완료 {stats['skipped']})")
+        if not todo:
+            return stats
+
+        pending: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(todo))) as executor:
+            futures = {executor.submit(self.analyze, doc['text']): doc for doc in todo}
+            for finished, future in enumerate(as_completed(futures), 1):
+                doc = futures[future]
+                try:
+                    analysis = future.result()
+                    error = _analysis_error(analysis)
+                except Exception as e:
+                    analysis, error = None, str(e)
+
+                if error is not None:
+                    print(f"일괄 분석 실패 ({doc['id']}): {error}")
+                    checkpoint.record([{'id': doc['id'], 'status': 'failed', 'error': error}])
+                    stats['failed'] += 1
+                    stats['errors'][doc['id']] = error
+                else:
+                    pending.append({
+                        'id': doc['id'],
+                        'path': doc.get('path'),
+                        'analysis': analysis,
+                        'events': analysis_to_events(
+                            analysis, doc['id'], doc.get('category') or self.category, self.include_summary
+                        ),
+                    })
+                    stats['done'] += 1
+                    if len(pending) >= self.commit_every:
+                        self._flush(pending, checkpoint, processed_dir, stats)
+
+                if report_progress is not None:
+                    report_progress(f"일괄 분석 중 ({finished}/{len(todo)}, 실패 {stats['failed']})")
+
+        self._flush(pending, checkpoint, processed_dir, stats)
+        return stats
+
+
+def main():
+    """일괄 가져오기 CLI (python src/batch_importer.py <디렉토리|파일.jsonl>)"""
+    project_root = Path(__file__).resolve().parent.parent
+    sys.path.insert(0, str(project_root / "src"))
+
+    from dotenv import load_dotenv
+    env_path = project_root / "config" / ".env"
+    load_dotenv(env_path if env_path.exists() else project_root / ".env")
+    # 웹 서버와 같은 데이터 디렉토리 (DATA_DIR)
+    data_dir = Path(os.getenv('DATA_DIR') or project_root / "data")
+
+    parser = argparse.ArgumentParser(description="회의록 일괄 분석 후 캘린더 저장소에 가져오기")
+    parser.add_argument('source', help="회의록 디렉토리(.txt/.md) 또는 JSONL 파일")
+    parser.add_argument('--db', default=str(data_dir / "db.sqlite3"), help="이벤트 저장소 경로")
+    parser.add_argument('--processed', default=str(project_root / "processed"),
+                        help="처리한 파일을 옮길 디렉토리 (디렉토리 입력일 때)")
+    parser.add_argument('--checkpoint', help="체크포인트 파일 (기본: <processed>/<입력 이름>.checkpoint.jsonl)")
+    parser.add_argument('--workers', type=int, default=int(os.getenv('BATCH_WORKERS', 4)), help="동시 분석 수")
+    parser.add_argument('--commit-every', type=int, default=20, help="저장 묶음 크기 (문서 수)")
+    parser.add_argument('--category', default=DEFAULT_CATEGORY, help="이벤트 분류")
+    parser.add_argument('--no-summary', action='store_true', help="요약 이벤트 제외")
+    args = parser.parse_args()
+
+    from analyzer_pool import build_analysis
+    from event_store import EventStore, DEFAULT_TIMEZONE
+
+    # 웹 서버와 같은 설정으로, 같은 캐시/속도 제한/요청 합치기 상태 파일을 공유
+    analysis = build_analysis(data_dir, os.environ)
+    if not analysis['api_keys']:
+        print("GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.")
+        sys.exit(1)
+    pool, chunked = analysis['pool'], analysis['chunked']
+
+    def analyze(text):
+        return chunked.analyze(text) if chunked.is_long(text) else pool.analyze_meeting_notes(text)
+
+    source = Path(args.source)
+    processed_dir = Path(args.processed) if source.is_dir() else None
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else \
+        Path(args.processed) / f"{source.resolve().name}.checkpoint.jsonl"
+
+    documents = load_documents(source)
+    print(f"회의록 {len(documents)}개 발견 (체크포인트: {checkpoint_path})")
+
+    importer = BatchImporter(
+        analyze,
+        EventStore(Path(args.db), timezone=os.getenv('TIMEZONE', DEFAULT_TIMEZONE)),
+        max_workers=args.workers,
+        commit_every=args.commit_every,
+        category=args.category,
+        include_summary=not args.no_summary
+    )
+    stats = importer.run(documents, checkpoint_path, processed_dir, report_progress=print)
+
+    print(f"\n완료 {stats['done']} / 실패 {stats['failed']} / 이전 완료 {stats['skipped']} "
+          f"(이벤트 {stats['events_inserted']}개 추가)")
+    for doc_id, error in stats['errors'].items():
+        print(f"  ✗ {doc_id}: {error}")
+    if stats['failed']:
+        print("같은 명령을 다시 실행하면 실패한 회의록만 다시 처리합니다.")
+
+
+if __name__ == "__main__":
+    main()
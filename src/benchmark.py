@@ -0,0 +1,603 @@
+"""
+성능 벤치마크 모듈
+data/db.example.json과 같은 형태의 합성 캘린더(1k/10k/100k 이벤트)를 만들어
+저장소 API(GET/POST /api/db) 처리량/지연 시간, 전문 검색 지연 시간, 부하 중 save_db/백업 소요 시간,
+지연 시간을 조절할 수 있는 가짜 Gemini 모델로 /analyze 처리량을 측정합니다.
+결과는 JSON으로 저장해 버전 간 비교(compare)에 사용합니다.
+
+실행 예:
+    python src/benchmark.py run --sizes 1000,10000 --clients 8 --out bench.json
+    python src/benchmark.py compare old.json new.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# compare에서 값이 클수록 좋은 지표 (나머지는 작을수록 좋음)
+HIGHER_IS_BETTER = ('throughput_rps',)
+
+# 검색 측정 (이름, 검색어, 필터) - 넓은 단어/구문, 필터를 함께 쓰는 경우
+SEARCH_CASES = (
+    ('meeting', '회의', {}),
+    ('report_phrase', '보고서 작성', {}),
+    ('design_review_todo', '디자인 검토', {'status': 'todo'}),
+    ('follow_up', '후속', {}),
+    ('follow_up_page_5', '후속', {'offset': 80}),
+)
+
+
+# --- 합성 데이터 ---
+
+SOURCE_TOPICS = ['주간 회의', '스프린트 리뷰', '디자인 검토', '고객 미팅', '분기 계획', '장애 회고', '채용 인터뷰']
+DEPARTMENTS = ['개발팀', '디자인팀', '기획팀', '영업팀', '인프라팀']
+TASK_VERBS = ['작성', '검토', '개발', '수정', '배포', '정리', '테스트']
+
+
+def _summary_text(rng: random.Random, topic: str) -> str:
+    """요약 이벤트 본문 (예시 데이터와 같은 마크다운 구조)"""
+    points = '\n'.join(f"- {topic} 안건 {i} 논의 결과 정리" for i in range(1, rng.randint(3, 8)))
+    actions = '\n'.join(f"- [{'x' if rng.random() < 0.5 else ' '}] 후속 작업 {i}" for i in range(1, rng.randint(2, 6)))
+    return f"# 회의 요약\n\n## 핵심 요약\n{points}\n\n## 주요 논의 사항\n1. 현황 공유\n2. 일정 조율\n\n## 액션 아이템\n{actions}"
+
+
+def synthetic_calendar(size: int, seed: int = 42, start: str = '2026-01-05') -> Dict[str, Any]:
+    """
+    db.example.json 형태의 합성 캘린더 생성 (회의마다 요약 1개 + 태스크/미팅 여러 개)
+
+    Args:
+        size: 이벤트 수
+        seed: 난수 시드 (같은 시드면 같은 데이터)
+        start: 첫 회의 날짜 (YYYY-MM-DD)
+
+    Returns:
+        {'meeting_notes', 'events'}
+    """
+    rng = random.Random(seed)
+    day = datetime.strptime(start, '%Y-%m-%d')
+    events: List[Dict[str, Any]] = []
+    meeting = 0
+
+    while len(events) < size:
+        meeting += 1
+        topic = rng.choice(SOURCE_TOPICS)
+        department = rng.choice(DEPARTMENTS)
+        source_id = f"bench_{meeting}"
+        meeting_day = day + timedelta(days=meeting // 3)
+        summary = _summary_text(rng, topic)
+
+        events.append({
+            'id': f"bench_summary_{meeting}",
+            'title': f"{topic}/{department}/{meeting_day:%y-%m-%d}",
+            'start': meeting_day.strftime('%Y-%m-%dT09:00:00'),
+            'allDay': True,
+            'description': summary,
+            'extendedProps': {'description': summary[:200], 'isSummary': True, 'sourceId': source_id},
+        })
+
+        for n in range(rng.randint(2, 6)):
+            if len(events) >= size:
+                break
+            begin = meeting_day + timedelta(days=rng.randint(0, 14), hours=rng.randint(9, 17))
+            end = begin + timedelta(minutes=rng.choice((30, 60, 90, 120)))
+            if rng.random() < 0.7:
+                title = f"{topic} 결과 보고서 {rng.choice(TASK_VERBS)} ({n + 1})"
+                description = f"{department} {topic} 후속 작업: {title}"
+                ext = {
+                    'description': description,
+                    'isTask': True,
+                    'status': rng.choice(('todo', 'todo', 'done', 'verified')),
+                    'priority': rng.choice(('high', 'medium', 'low')),
+                }
+            else:
+                title = f"{topic} 후속 미팅 ({n + 1})"
+                description = f"{department} {topic} 후속 논의"
+                ext = {'description': description, 'isMeeting': True}
+            ext['sourceId'] = source_id
+            events.append({
+                'id': f"bench_{meeting}_{n}",
+                'title': title,
+                'start': begin.strftime('%Y-%m-%dT%H:%M:%S'),
+                'end': end.strftime('%Y-%m-%dT%H:%M:%S'),
+                'description': description,
+                'extendedProps': ext,
+            })
+
+    return {'meeting_notes': f"합성 캘린더 ({size}개 이벤트, seed={seed})", 'events': events}
+
+
+def synthetic_notes(index: int, lines: int = 40) -> str:
+    """분석 요청용 합성 회의록 (요청마다 내용이 달라 분석 캐시에 걸리지 않음)"""
+    body = '\n'.join(f"- 담당자{i % 5}: {SOURCE_TOPICS[i % len(SOURCE_TOPICS)]} 관련 자료 {TASK_VERBS[i % len(TASK_VERBS)]}하기"
+                     for i in range(lines))
+    return f"# 회의록 #{index}\n일시: 2026-02-{1 + index % 27:02d} 10:00\n참석자: 담당자0, 담당자1, 담당자2\n\n{body}"
+
+
+# --- 가짜 Gemini 모델 ---
+
+class _FakeUsage:
+    def __init__(self, prompt: str, text: str):
+        self.prompt_token_count = len(prompt) // 4
+        self.candidates_token_count = len(text) // 4
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class _FakeChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeResponse:
+    def __init__(self, prompt: str, text: str):
+        self.text = text
+        self.usage_metadata = _FakeUsage(prompt, text)
+
+
+class _FakeStreamResponse:
+    def __init__(self, prompt: str, text: str, latency: float, chunks: int = 8):
+        self._text = text
+        self._latency = latency
+        self._chunks = chunks
+        self.usage_metadata = _FakeUsage(prompt, text)
+
+    def __iter__(self):
+        size = max(1, len(self._text) // self._chunks + 1)
+        for i in range(0, len(self._text), size):
+            time.sleep(self._latency / self._chunks)
+            yield _FakeChunk(self._text[i:i + size])
+
+
+class FakeGenerativeModel:
+    """
+    google.generativeai.GenerativeModel 대용 (네트워크 호출 없이 지연 시간만 흉내)
+    지연 시간은 클래스 속성으로 조절합니다.
+    """
+
+    latency = 0.5   # 응답 지연 (초)
+    jitter = 0.1    # 지연 시간 흔들림 (비율)
+    calls = 0
+    _lock = threading.Lock()
+
+    def __init__(self, model_name: str, generation_config: Optional[Dict[str, Any]] = None, **kwargs):
+        self.model_name = model_name
+        self.generation_config = generation_config
+
+    @classmethod
+    def _delay(cls) -> float:
+        return max(0.0, cls.latency * (1 + random.uniform(-cls.jitter, cls.jitter)))
+
+    @staticmethod
+    def _analysis(prompt: str) -> str:
+        """프롬프트 길이에 비례하는 분석 결과 JSON"""
+        items = max(1, prompt.count('\n- ') // 4)
+        return json.dumps({
+            'meeting_title': '벤치마크 회의/개발팀/26-02-01',
+            'meeting_date': '2026-02-01',
+            'department_name': '개발팀',
+            'summary': '# 회의 요약\n\n## 핵심 요약\n- 벤치마크용 가짜 응답',
+            'completed_tasks': [],
+            'todo_tasks': [
+                {'title': f'작업 {i}', 'description': '설명', 'priority': 'medium', 'who': None,
+                 'deadline': '2026-02-10', 'context': ''}
+                for i in range(items)
+            ],
+            'schedule_items': [
+                {'title': '후속 미팅', 'description': '', 'date': '2026-02-03', 'time': '14:00',
+                 'duration_minutes': 60, 'context': ''}
+            ],
+            'important_dates': [],
+            'participants': ['담당자0', '담당자1'],
+            'key_decisions': [],
+        }, ensure_ascii=False)
+
+    def generate_content(self, prompt, stream: bool = False, **kwargs):
+        with FakeGenerativeModel._lock:
+            FakeGenerativeModel.calls += 1
+        prompt = str(prompt)
+        text = self._analysis(prompt)
+        if stream:
+            return _FakeStreamResponse(prompt, text, self._delay())
+        time.sleep(self._delay())
+        return _FakeResponse(prompt, text)
+
+
+def install_fake_genai():
+    """google.generativeai 대신 가짜 모듈 사용 (app/gemini_analyzer를 import하기 전에 호출)"""
+    import google
+
+    fake = types.ModuleType('google.generativeai')
+    fake.configure = lambda **kwargs: None
+    fake.GenerativeModel = FakeGenerativeModel
+    sys.modules['google.generativeai'] = fake
+    google.generativeai = fake
+
+
+def load_app(data_dir: Path):
+    """
+    벤치마크용 앱 로드 (별도 데이터 디렉토리 + 가짜 Gemini + 넉넉한 속도 제한)
+
+    Args:
+        data_dir: 임시 데이터 디렉토리
+
+    Returns:
+        app 모듈
+    """
+    os.environ.update({
+        'DATA_DIR': str(data_dir),
+        'GEMINI_API_KEYS': 'benchmark-key-0000',
+        'GEMINI_RPM': '1000000',
+        'GEMINI_TPM': '1000000000',
+        'BACKUP_INTERVAL_SECONDS': '86400',
+        'SLOW_REQUEST_MS': '0',
+    })
+    os.environ.pop('RECLAIM_API_TOKEN', None)
+    install_fake_genai()
+    sys.path.insert(0, str(PROJECT_ROOT))
+    import app as app_module
+    return app_module
+
+
+class LocalServer:
+    """Werkzeug 멀티스레드 서버를 백그라운드 스레드로 실행"""
+
+    def __init__(self, flask_app):
+        from werkzeug.serving import make_server
+        # 요청마다 찍히는 접근 로그가 측정을 방해하지 않게
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        self.server = make_server('127.0.0.1', 0, flask_app, threaded=True)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+
+
+# --- 측정 ---
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """지연 시간 목록 → 통계 (밀리초)"""
+    ordered = sorted(latencies)
+
+    def pct(p):
+        if not ordered:
+            return None
+        # nearest-rank 방식
+        return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] * 1000, 2)
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'mean_ms': round(statistics.mean(ordered) * 1000, 2) if ordered else None,
+        'p50_ms': pct(50),
+        'p90_ms': pct(90),
+        'p99_ms': pct(99),
+        'max_ms': round(ordered[-1] * 1000, 2) if ordered else None,
+    }
+
+
+def run_load(request_fn: Callable[[requests.Session, int], requests.Response],
+             total: int, clients: int) -> Dict[str, Any]:
+    """
+    동시 클라이언트로 요청 total개 실행
+
+    Args:
+        request_fn: (세션, 요청 번호) → 응답
+        total: 전체 요청 수
+        clients: 동시 클라이언트 수 (클라이언트마다 세션 하나)
+    """
+    counter = iter(range(total))
+    counter_lock = threading.Lock()
+    latencies: List[float] = []
+    errors = [0]
+    result_lock = threading.Lock()
+
+    def client():
+        session = requests.Session()
+        while True:
+            with counter_lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            start = time.perf_counter()
+            try:
+                ok = request_fn(session, index).ok
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with result_lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        for future in [executor.submit(client) for _ in range(clients)]:
+            future.result()
+    return summarize(latencies, errors[0], time.perf_counter() - start)
+
+
+class BackgroundLoad:
+    """측정하는 동안 GET /api/db 읽기 부하를 계속 발생"""
+
+    def __init__(self, url: str, clients: int):
+        self.url = url
+        self.clients = clients
+        self.requests = 0
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _run(self):
+        session = requests.Session()
+        while not self._stop.is_set():
+            try:
+                session.get(f"{self.url}/api/db")
+                self.requests += 1
+            except requests.RequestException:
+                pass
+
+    def __enter__(self):
+        for _ in range(self.clients):
+            thread = threading.Thread(target=self._run, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """fn을 repeat번 실행한 소요 시간 통계"""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - begin)
+    return summarize(latencies, 0, time.perf_counter() - start)
+
+
+def bench_size(app_module, server: LocalServer, size: int, args) -> Dict[str, Any]:
+    """이벤트 size개 캘린더에서 저장소/API 측정"""
+    calendar = synthetic_calendar(size, seed=args.seed)
+    events = calendar['events']
+    payload_bytes = len(json.dumps(calendar, ensure_ascii=False).encode('utf-8'))
+    # 큰 캘린더는 요청 하나가 무거우므로 요청 수를 줄임
+    scale = max(1, size // 10000)
+    total = max(args.clients, args.requests // scale)
+    print(f"[{size}] 이벤트 {len(events)}개, 본문 {payload_bytes / 1024:.0f}KB, 요청 {total}개")
+
+    result: Dict[str, Any] = {'events': len(events), 'payload_bytes': payload_bytes}
+
+    # 초기 저장 (빈 저장소 → 전체 삽입)
+    app_module.event_store.replace_events([])
+    begin = time.perf_counter()
+    app_module.save_db(calendar)
+    result['initial_save_ms'] = round((time.perf_counter() - begin) * 1000, 2)
+
+    # 전문 검색 (저장소 직접 호출, 첫 페이지 20개)
+    result['search'] = {
+        name: timed(lambda q=query, f=filters: app_module.event_store.search(q, **f), args.search_repeat)
+        for name, query, filters in SEARCH_CASES
+    }
+
+    url = server.url
+    result['get_db'] = run_load(lambda s, i: s.get(f"{url}/api/db"), total, args.clients)
+
+    def post_db(session, index):
+        # 클라이언트 편집 흉내: 이벤트 몇 개만 바꾼 전체 목록 저장
+        edited = list(events)
+        for offset in range(args.edits):
+            pos = (index * args.edits + offset) % len(edited)
+            edited[pos] = dict(edited[pos], title=f"{events[pos]['title']} (수정 {index})")
+        return session.post(f"{url}/api/db", json={'events': edited})
+
+    result['post_db'] = run_load(post_db, total, args.clients)
+
+    # 읽기 부하 중 save_db / 백업
+    counter = iter(range(10 ** 9))
+
+    def save_once():
+        i = next(counter)
+        edited = list(events)
+        edited[i % len(edited)] = dict(edited[i % len(edited)], title=f"부하 중 수정 {i}")
+        app_module.save_db({'events': edited})
+
+    with BackgroundLoad(url, args.background_clients) as load:
+        result['save_db_under_load'] = timed(save_once, args.repeat)
+        result['backup_under_load'] = timed(lambda: app_module.backup_manager.run_once(force_snapshot=True),
+                                            args.repeat)
+        result['background_reads'] = load.requests
+    return result
+
+
+def bench_analyze(server: LocalServer, args) -> Dict[str, Any]:
+    """가짜 Gemini 모델로 /analyze 처리량 측정"""
+    FakeGenerativeModel.latency = args.gemini_latency
+    FakeGenerativeModel.calls = 0
+    url = server.url
+    offset = int(time.time())  # 실행마다 다른 회의록 (분석 캐시 회피)
+
+    print(f"[analyze] 요청 {args.analyze_requests}개, 가짜 Gemini 지연 {args.gemini_latency}s")
+    sync = run_load(
+        lambda s, i: s.post(f"{url}/analyze", data={'meeting_notes': synthetic_notes(offset + i)}),
+        args.analyze_requests, args.clients
+    )
+
+    def stream(session, index):
+        response = session.post(f"{url}/analyze", data={
+            'meeting_notes': synthetic_notes(offset + args.analyze_requests + index), 'mode': 'stream'
+        }, stream=True)
+        for _ in response.iter_content(chunk_size=None):
+            pass
+        return response
+
+    streamed = run_load(stream, args.analyze_requests, args.clients)
+    return {
+        'gemini_latency_seconds': args.gemini_latency,
+        'sync': sync,
+        'stream': streamed,
+        'model_calls': FakeGenerativeModel.calls,
+    }
+
+
+def git_revision() -> Optional[str]:
+    """현재 커밋 (비교 시 버전 표시용)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args) -> Dict[str, Any]:
+    """전체 벤치마크 실행"""
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    with tempfile.TemporaryDirectory(prefix='smart-scheduler-bench-') as tmp:
+        app_module = load_app(Path(tmp))
+        report = {
+            'revision': git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': {k: v for k, v in vars(args).items() if k not in ('func', 'out')},
+            'storage': {},
+        }
+        with LocalServer(app_module.app) as server:
+            for size in sizes:
+                report['storage'][str(size)] = bench_size(app_module, server, size, args)
+            if args.analyze_requests > 0:
+                report['analyze'] = bench_analyze(server, args)
+        app_module.job_queue.shutdown(wait=False)
+        app_module.backup_manager.shutdown()
+    return report
+
+
+# --- 비교 ---
+
+def _flatten(data: Any, prefix: str = '') -> Dict[str, float]:
+    """중첩 결과 → {'storage.1000.get_db.p50_ms': 값}"""
+    flat = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix[:-1]] = float(data)
+    return flat
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    두 결과 비교 (지연 시간/처리량 지표만)
+
+    Args:
+        old: 기준 결과
+        new: 비교할 결과
+        threshold: 이 비율 이상 나빠지면 regression으로 표시
+
+    Returns:
+        [{'metric', 'old', 'new', 'change', 'regression'}]
+    """
+    old_flat = _flatten({k: old.get(k) for k in ('storage', 'analyze')})
+    new_flat = _flatten({k: new.get(k) for k in ('storage', 'analyze')})
+    rows = []
+    for metric in sorted(set(old_flat) & set(new_flat)):
+        name = metric.rsplit('.', 1)[-1]
+        if not (name.endswith('_ms') or name in HIGHER_IS_BETTER):
+            continue
+        before, after = old_flat[metric], new_flat[metric]
+        if not before:
+            continue
+        change = (after - before) / before
+        worse = -change if name in HIGHER_IS_BETTER else change
+        rows.append({
+            'metric': metric, 'old': before, 'new': after,
+            'change': round(change, 4), 'regression': worse > threshold,
+        })
+    return rows
+
+
+def main():
+    """CLI 진입점"""
+    parser = argparse.ArgumentParser(description='Smart Scheduler 성능 벤치마크')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help='벤치마크 실행')
+    run_parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                            help='캘린더 이벤트 수 (쉼표 구분)')
+    run_parser.add_argument('--clients', type=int, default=8, help='동시 클라이언트 수')
+    run_parser.add_argument('--requests', type=int, default=200, help='1만 이벤트 기준 요청 수 (크기에 반비례)')
+    run_parser.add_argument('--edits', type=int, default=5, help='POST /api/db 요청마다 바꿀 이벤트 수')
+    run_parser.add_argument('--repeat', type=int, default=5, help='save_db/백업 반복 횟수')
+    run_parser.add_argument('--search-repeat', type=int, default=50, help='검색어별 검색 반복 횟수')
+    run_parser.add_argument('--background-clients', type=int, default=4, help='save_db/백업 측정 중 읽기 부하 클라이언트 수')
+    run_parser.add_argument('--analyze-requests', type=int, default=32, help='/analyze 요청 수 (0이면 생략)')
+    run_parser.add_argument('--gemini-latency', type=float, default=0.5, help='가짜 Gemini 응답 지연 (초)')
+    run_parser.add_argument('--seed', type=int, default=42, help='합성 데이터 시드')
+    run_parser.add_argument('--out', help='결과 JSON 파일 (없으면 표준 출력)')
+
+    compare_parser = sub.add_parser('compare', help='두 결과 JSON 비교')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='regression 판단 비율')
+
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        with open(args.old, encoding='utf-8') as f:
+            old = json.load(f)
+        with open(args.new, encoding='utf-8') as f:
+            new = json.load(f)
+        rows = compare(old, new, args.threshold)
+        print(f"{old.get('revision')} → {new.get('revision')}")
+        for row in rows:
+            mark = '⚠️ ' if row['regression'] else '  '
+            print(f"{mark}{row['metric']:<50} {row['old']:>12.2f} → {row['new']:>12.2f} ({row['change']:+.1%})")
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+        return
+
+    report = run(args)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"결과 저장: {args.out}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+본문 블롭 저장 모듈
+긴 이벤트 본문(회의 요약 마크다운 등)을 내용의 SHA-256 해시를 키로 이벤트 저장소 DB의 별도 테이블에 저장합니다.
+같은 본문은 한 번만 저장되고, 이벤트 행에는 해시(bodyRef)와 짧은 미리보기만 남습니다.
+어느 이벤트도 참조하지 않는 블롭은 보관 기간이 지난 뒤 정리합니다 (삭제 후 실행 취소로 되살릴 수 있게).
+"""
+
+import hashlib
+import sqlite3
+import time
+from typing import Dict, Iterable, Optional
+
+
+BLOB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+"""
+
+# 참조가 끊긴 블롭 보관 기간 (초)
+BLOB_RETENTION = 7 * 86400
+
+
+def content_hash(text: str) -> str:
+    """본문 내용 해시 (블롭 키)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def put(conn: sqlite3.Connection, text: str) -> str:
+    """
+    본문 저장 (이미 있으면 사용 시각만 갱신, 쓰기 트랜잭션 안에서 호출)
+
+    Args:
+        conn: 저장소 커넥션
+        text: 본문
+
+    Returns:
+        블롭 해시
+    """
+    key = content_hash(text)
+    conn.execute(
+        "INSERT INTO blobs (hash, body, size, last_used) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(hash) DO UPDATE SET last_used = excluded.last_used",
+        (key, text, len(text), time.time())
+    )
+    return key
+
+
+def get(conn: sqlite3.Connection, key: str) -> Optional[str]:
+    """해시로 본문 조회 (없으면 None)"""
+    row = conn.execute("SELECT body FROM blobs WHERE hash = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def get_many(conn: sqlite3.Connection, keys: Iterable[str]) -> Dict[str, str]:
+    """
+    여러 본문 한 번에 조회
+
+    Args:
+        conn: 저장소 커넥션
+        keys: 블롭 해시 목록
+
+    Returns:
+        {해시: 본문} (없는 해시는 빠짐)
+    """
+    keys = list(set(keys))
+    bodies = {}
+    # SQLite 변수 개수 제한에 걸리지 않게 나눠서 조회
+    for i in range(0, len(keys), 500):
+        chunk = keys[i:i + 500]
+        bodies.update(conn.execute(
+            f"SELECT hash, body FROM blobs WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+        ).fetchall())
+    return bodies
+
+
+def touch(conn: sqlite3.Connection, keys: Iterable[str]):
+    """블롭 사용 시각 갱신 (참조가 끊겨도 보관 기간 동안 정리되지 않게, 쓰기 트랜잭션 안에서 호출)"""
+    now = time.time()
+    conn.executemany("UPDATE blobs SET last_used = ? WHERE hash = ?", [(now, key) for key in keys])
+
+
+def purge_unreferenced(conn: sqlite3.Connection, max_age: float = BLOB_RETENTION) -> int:
+    """
+    어느 이벤트도 참조하지 않고 max_age 동안 쓰이지 않은 블롭 삭제 (쓰기 트랜잭션 안에서 호출)
+
+    Returns:
+        삭제한 블롭 수
+    """
+    cursor = conn.execute(
+        """
+        DELETE FROM blobs
+        WHERE last_used < ?
+          AND hash NOT IN (
+              SELECT json_extract(data, '$.extendedProps.bodyRef') FROM events
+              WHERE json_extract(data, '$.extendedProps.bodyRef') IS NOT NULL
+          )
+        """,
+        (time.time() - max_age,)
+    )
+    return cursor.rowcount
@@ -0,0 +1,352 @@
+"""
+긴 회의록 분할 분석 모듈 (map-reduce)
+몇 시간짜리 녹취록처럼 긴 회의록을 화자/섹션 경계에서 나눠 동시에 분석하고,
+조각별 결과의 태스크, 일정, 참석자, 결정사항을 합치면서 중복을 제거합니다.
+"""
+
+import re
+import sys
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Any, Optional, Iterator, Tuple
+
+from prompt_budget import compact_notes, merge_usage
+
+
+# 분할 기준 (이 글자 수를 넘으면 분할 분석)
+DEFAULT_THRESHOLD_CHARS = 20000
+DEFAULT_CHUNK_CHARS = 12000
+
+# 경계 우선순위 (높을수록 먼저 자름)
+BOUNDARY_SECTION = 3
+BOUNDARY_SPEAKER = 2
+BOUNDARY_PARAGRAPH = 1
+BOUNDARY_LINE = 0
+
+# 섹션 제목: 마크다운 헤더, "1. 안건", "[안건]", "=== 구분선"
+SECTION_PATTERN = re.compile(r'^\s*(#{1,6}\s|\d{1,2}[.)]\s|\[[^\]]{1,40}\]\s*$|[=\-─]{3,}\s*$)')
+# 화자 전환: "김철수: ...", "[00:12:34] Alice: ...", "Speaker 1 (00:05): ..."
+SPEAKER_PATTERN = re.compile(
+    r'^\s*(\[?\(?\d{1,2}:\d{2}(:\d{2})?\)?\]?\s*)?[^\s:：]{1,20}(\s[^\s:：]{1,20}){0,2}\s*(\(\d{1,2}:\d{2}(:\d{2})?\))?\s*[:：]\s*\S'
+)
+
+PRIORITY_RANK = {'high': 3, 'medium': 2, 'low': 1}
+LIST_FIELDS = (
+    'completed_tasks', 'todo_tasks', 'schedule_items',
+    'important_dates', 'participants', 'key_decisions',
+)
+
+
+def _line_boundary(line: str, previous_blank: bool) -> int:
+    """줄 시작 위치의 경계 우선순위"""
+    if SECTION_PATTERN.match(line):
+        return BOUNDARY_SECTION
+    if SPEAKER_PATTERN.match(line):
+        return BOUNDARY_SPEAKER
+    if previous_blank and line.strip():
+        return BOUNDARY_PARAGRAPH
+    return BOUNDARY_LINE
+
+
+def split_transcript(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """
+    회의록을 max_chars 이하 조각으로 분할
+    각 조각은 가능한 한 섹션 제목 > 화자 전환 > 문단 > 줄 순서의 경계에서 자릅니다.
+
+    Args:
+        text: 회의록 전체 텍스트
+        max_chars: 조각 최대 글자 수
+
+    Returns:
+        조각 목록 (원문 순서)
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    # 줄 시작 위치별 경계 우선순위
+    boundaries: List[Tuple[int, int]] = []
+    offset = 0
+    previous_blank = False
+    for line in text.splitlines(keepends=True):
+        if offset > 0:
+            boundaries.append((offset, _line_boundary(line, previous_blank)))
+        previous_blank = not line.strip()
+        offset += len(line)
+
+    chunks = []
+    start = 0
+    min_chars = max_chars // 2
+    index = 0
+    while len(text) - start > max_chars:
+        limit = start + max_chars
+        best = None
+        while index < len(boundaries) and boundaries[index][0] <= start:
+            index += 1
+        i = index
+        while i < len(boundaries) and boundaries[i][0] <= limit:
+            position, rank = boundaries[i]
+            # 너무 작은 조각은 피하고, 같은 우선순위면 뒤쪽 경계 선택
+            if position - start >= min_chars and (best is None or rank >= best[1]):
+                best = (position, rank)
+            i += 1
+        cut = best[0] if best else limit
+        chunks.append(text[start:cut])
+        start = cut
+    chunks.append(text[start:])
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def _preamble(text: str, max_chars: int = 800) -> str:
+    """첫 화자/섹션 전까지의 머리말 (날짜, 참석자 등 조각 공통 문맥)"""
+    offset = 0
+    previous_blank = False
+    for line in text.splitlines(keepends=True):
+        if offset > 0 and _line_boundary(line, previous_blank) >= BOUNDARY_SPEAKER:
+            break
+        previous_blank = not line.strip()
+        offset += len(line)
+        if offset >= max_chars:
+            break
+    return text[:min(offset, max_chars)].strip()
+
+
+def _normalize(value: Any) -> str:
+    """중복 비교용 정규화 (대소문자, 공백, 문장부호 무시)"""
+    return re.sub(r'[\W_]+', '', str(value or '')).lower()
+
+
+def _participant_key(name: str) -> str:
+    """참석자 비교 키 ('김철수 (AI팀)' → '김철수')"""
+    return _normalize(re.sub(r'\s*[(\[].*?[)\]]', '', str(name)))
+
+
+def _merge_item(target: Dict[str, Any], item: Dict[str, Any]):
+    """같은 항목으로 판단된 두 결과 합치기 (빈 값 채우기, 우선순위는 높은 쪽)"""
+    for key, value in item.items():
+        if key == 'priority':
+            if PRIORITY_RANK.get(value, 0) > PRIORITY_RANK.get(target.get('priority'), 0):
+                target['priority'] = value
+        elif key == 'description':
+            current = target.get('description') or ''
+            if value and len(value) > len(current):
+                target['description'] = value
+        elif value and not target.get(key):
+            target[key] = value
+
+
+def _dedupe(items: List[Any], key_fn: Callable[[Any], Any]) -> List[Any]:
+    """key_fn 기준 중복 제거 (딕셔너리는 빈 필드를 서로 보완)"""
+    merged: Dict[Any, Any] = {}
+    for item in items:
+        key = key_fn(item)
+        if not key:
+            continue
+        if key not in merged:
+            merged[key] = dict(item) if isinstance(item, dict) else item
+        elif isinstance(item, dict):
+            _merge_item(merged[key], item)
+    return list(merged.values())
+
+
+def merge_results(results: List[Dict[str, Any]], summaries_combined: Optional[str] = None) -> Dict[str, Any]:
+    """
+    조각별 분석 결과 합치기 (reduce)
+
+    Args:
+        results: 조각 순서대로 정렬된 analyze_meeting_notes() 결과 목록
+        summaries_combined: 조각 요약을 합친 요약 (없으면 조각 요약을 이어 붙임)
+
+    Returns:
+        analyze_meeting_notes()와 같은 형식의 결과
+    """
+    valid = [r for r in results if isinstance(r, dict) and not r.get('error')]
+
+    def first(key):
+        for result in valid:
+            if result.get(key):
+                return result[key]
+        return None
+
+    collected: Dict[str, List[Any]] = {field: [] for field in LIST_FIELDS}
+    for result in valid:
+        for field in LIST_FIELDS:
+            collected[field].extend(result.get(field) or [])
+
+    # 회의 날짜는 조각들이 가장 많이 답한 날짜
+    dates = Counter(r['meeting_date'] for r in valid if r.get('meeting_date'))
+
+    if summaries_combined is None:
+        summaries = [r.get('summary') for r in valid if r.get('summary')]
+        if len(summaries) == 1:
+            summaries_combined = summaries[0]
+        else:
+            summaries_combined = "\n\n".join(
+                f"### Part {i}/{len(summaries)}\n\n{summary}" for i, summary in enumerate(summaries, 1)
+            )
+
+    merged = {
+        'meeting_title': first('meeting_title'),
+        'meeting_date': dates.most_common(1)[0][0] if dates else None,
+        'department_name': first('department_name'),
+        'summary': summaries_combined,
+        'completed_tasks': _dedupe(collected['completed_tasks'], lambda t: _normalize(t.get('title'))),
+        'todo_tasks': _dedupe(collected['todo_tasks'], lambda t: _normalize(t.get('title'))),
+        'schedule_items': _dedupe(
+            collected['schedule_items'],
+            # 반복 일정은 조각마다 첫 발생 날짜가 다를 수 있어 규칙으로 비교
+            lambda s: (s.get('recurrence') or s.get('date'), s.get('time'), _normalize(s.get('title')))
+        ),
+        'important_dates': _dedupe(
+            collected['important_dates'],
+            lambda d: (d.get('date'), _normalize(d.get('description')))
+        ),
+        'participants': _dedupe(collected['participants'], _participant_key),
+        'key_decisions': _dedupe(collected['key_decisions'], _normalize),
+    }
+
+    # 조각 중 하나라도 끝내 받지 못한 필드가 있으면 함께 표시
+    incomplete = [key for key in ('meeting_title', 'meeting_date', 'department_name', 'summary') + LIST_FIELDS
+                  if any(key in (r.get('incomplete_fields') or []) for r in valid)]
+    if incomplete:
+        merged['incomplete_fields'] = incomplete
+
+    # 조각별 토큰 사용량 합계
+    usages = [r['usage'] for r in results if isinstance(r, dict) and isinstance(r.get('usage'), dict)]
+    if usages:
+        merged['usage'] = merge_usage(usages)
+
+    errors = [r.get('error') for r in results if isinstance(r, dict) and r.get('error')]
+    if errors:
+        merged['chunk_errors'] = errors
+    if not valid:
+        merged['error'] = errors[0] if errors else '분석 결과 없음'
+        merged['summary'] = f"분석 실패: {merged['error']}"
+    return merged
+
+
+class ChunkedAnalyzer:
+    """긴 회의록 분할 → 동시 분석(map) → 병합/중복 제거(reduce)"""
+
+    def __init__(
+        self,
+        analyze_chunk: Callable[[str], Dict[str, Any]],
+        combine_summaries: Optional[Callable[[List[str]], Optional[str]]] = None,
+        max_workers: int = 4,
+        chunk_chars: int = DEFAULT_CHUNK_CHARS,
+        threshold_chars: int = DEFAULT_THRESHOLD_CHARS
+    ):
+        """
+        ChunkedAnalyzer 초기화
+
+        Args:
+            analyze_chunk: 조각 하나를 분석하는 함수 (예: AnalyzerPool.analyze_meeting_notes, 테스트용 스텁)
+            combine_summaries: 조각 요약 목록을 하나의 요약으로 합치는 함수 (선택, 실패 시 None 반환)
+            max_workers: 동시에 분석할 조각 수
+            chunk_chars: 조각 최대 글자 수
+            threshold_chars: 이 글자 수를 넘는 회의록만 분할
+        """
+        self.analyze_chunk = analyze_chunk
+        self.combine_summaries = combine_summaries
+        self.max_workers = max_workers
+        self.chunk_chars = chunk_chars
+        self.threshold_chars = threshold_chars
+
+    def is_long(self, text: str) -> bool:
+        """분할 분석 대상 여부 (타임스탬프/맞장구 등을 걷어낸 길이 기준)"""
+        return len(text) > self.threshold_chars and len(compact_notes(text)[0]) > self.threshold_chars
+
+    def _chunk_texts(self, text: str) -> List[str]:
+        """조각 목록 (두 번째 조각부터는 머리말을 붙여 날짜/참석자 문맥 유지)"""
+        # 압축한 뒤에 나눠야 조각 수가 줄어듦 (조각 분석에서 다시 압축해도 결과는 같음)
+        text = compact_notes(text)[0]
+        chunks = split_transcript(text, self.chunk_chars)
+        preamble = _preamble(text)
+        total = len(chunks)
+        texts = []
+        for i, chunk in enumerate(chunks, 1):
+            header = f"[긴 회의록의 {i}/{total} 부분]\n"
+            if i > 1 and preamble:
+                header += f"{preamble}\n...\n"
+            texts.append(header + chunk)
+        return texts
+
+    def analyze_stream(self, text: str) -> Iterator[Dict[str, Any]]:
+        """
+        분할 분석 (진행 상황 스트리밍)
+
+        Args:
+            text: 회의록 전체 텍스트
+
+        Yields:
+            {'type': 'progress', 'completed', 'total'} (조각이 끝날 때마다)
+            마지막으로 {'type': 'done', 'analysis': 병합 결과}
+        """
+        texts = self._chunk_texts(text)
+        total = len(texts)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        yield {'type': 'progress', 'completed': 0, 'total': total}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as executor:
+            futures = {executor.submit(self.analyze_chunk, chunk): i for i, chunk in enumerate(texts)}
+            completed = 0
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    # 한 조각이 실패해도 나머지 결과는 사용
+                    print(f"조각 {i + 1}/{total} 분석 실패: {e}")
+                    results[i] = {'error': str(e)}
+                completed += 1
+                yield {'type': 'progress', 'completed': completed, 'total': total}
+
+        combined = None
+        summaries = [r.get('summary') for r in results if r and not r.get('error') and r.get('summary')]
+        if self.combine_summaries is not None and len(summaries) > 1:
+            try:
+                combined = self.combine_summaries(summaries)
+            except Exception as e:
+                print(f"요약 병합 실패: {e}")
+
+        analysis = merge_results(results, combined)
+        analysis['chunks'] = total
+        yield {'type': 'done', 'analysis': analysis}
+
+    def analyze(self, text: str, report_progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        분할 분석
+
+        Args:
+            text: 회의록 전체 텍스트
+            report_progress: 진행 메시지를 받을 함수 (선택)
+
+        Returns:
+            analyze_meeting_notes()와 같은 형식의 병합 결과
+        """
+        for event in self.analyze_stream(text):
+            if event['type'] == 'progress' and report_progress is not None:
+                report_progress(f"긴 회의록 분석 중 ({event['completed']}/{event['total']})")
+            elif event['type'] == 'done':
+                return event['analysis']
+
+
+def main():
+    """분할 미리보기: python src/chunked_analyzer.py <회의록 파일> [조각 글자 수]"""
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        return
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        text = f.read()
+    chunk_chars = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNK_CHARS
+
+    chunks = split_transcript(text, chunk_chars)
+    print(f"전체 {len(text)}자 → {len(chunks)}개 조각")
+    for i, chunk in enumerate(chunks, 1):
+        first_line = chunk.strip().splitlines()[0] if chunk.strip() else ''
+        print(f"  {i:3d}. {len(chunk):6d}자 | {json.dumps(first_line[:60], ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+HTTP 응답 압축 모듈
+JSON/HTML 등 텍스트 응답을 클라이언트가 지원하는 방식(brotli, gzip)으로 압축합니다.
+brotli 패키지가 없으면 gzip만 사용합니다.
+압축한 응답의 강한 ETag에는 '-gzip'/'-br'을 붙여 인코딩별로 구분하고, 조건부 요청은 어느 쪽이든 일치로 봅니다.
+"""
+
+import gzip
+from typing import List, Optional
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip만 사용
+    brotli = None
+
+
+# 압축할 응답 형식
+COMPRESSIBLE_TYPES = (
+    'application/json', 'text/html', 'text/plain', 'text/css',
+    'application/javascript', 'text/javascript', 'image/svg+xml',
+)
+
+# 이보다 작은 응답은 압축 이득보다 헤더/CPU 비용이 커서 그대로 보냄
+MIN_SIZE = 1024
+
+# 요청마다 압축하는 응답은 빠른 설정, 한 번 압축해 재사용하는 응답(정적 페이지)은 최대 압축
+FAST_LEVELS = {'br': 5, 'gzip': 6}
+BEST_LEVELS = {'br': 11, 'gzip': 9}
+
+
+def available_encodings() -> List[str]:
+    """서버가 지원하는 압축 방식 (선호 순서)"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """
+    Accept-Encoding에 맞는 압축 방식 고르기
+
+    Args:
+        accept_encodings: werkzeug Accept 객체 (request.accept_encodings)
+
+    Returns:
+        'br' / 'gzip' (압축하지 않으면 None)
+    """
+    return accept_encodings.best_match(available_encodings())
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    데이터 압축
+
+    Args:
+        data: 원본 바이트
+        encoding: 'br' 또는 'gzip'
+        best: 최대 압축 여부 (결과를 캐시해 재사용할 때)
+
+    Returns:
+        압축한 바이트
+    """
+    level = (BEST_LEVELS if best else FAST_LEVELS)[encoding]
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    # mtime=0: 같은 입력이면 항상 같은 결과 (캐시/ETag가 흔들리지 않게)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """인코딩별 ETag ('abc' → 'abc-gzip')"""
+    return f"{etag}-{encoding}" if encoding else etag
+
+
+def base_etag(etag: str) -> str:
+    """인코딩 접미사를 뗀 ETag ('abc-gzip' → 'abc')"""
+    for encoding in ('br', 'gzip'):
+        if etag.endswith(f"-{encoding}"):
+            return etag[:-len(encoding) - 1]
+    return etag
+
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """
+    If-None-Match가 ETag(또는 그 압축 인코딩 변형)와 일치하는지 확인
+
+    Args:
+        if_none_match: werkzeug ETags 객체 (request.if_none_match)
+        etag: 현재 ETag (인코딩 접미사 없는 값)
+
+    Returns:
+        일치 여부
+    """
+    return any(
+        if_none_match.contains(encoded_etag(etag, encoding))
+        for encoding in [None, 'br', 'gzip']
+    )
+
+
+def not_modified_etag(if_none_match, etag: str, encoding: Optional[str]) -> str:
+    """
+    304 응답에 보낼 ETag (200 응답이 보낸 값과 같도록 클라이언트가 가진 인코딩 변형을 그대로 돌려줌)
+
+    Args:
+        if_none_match: werkzeug ETags 객체 (request.if_none_match, etag_matches()로 일치 확인 후)
+        etag: 현재 ETag (인코딩 접미사 없는 값)
+        encoding: choose_encoding() 결과
+
+    Returns:
+        ETag 문자열
+    """
+    preferred = encoded_etag(etag, encoding)
+    for candidate in [preferred, etag, encoded_etag(etag, 'br'), encoded_etag(etag, 'gzip')]:
+        if if_none_match.contains(candidate):
+            return candidate
+    return preferred
+
+
+def is_compressible(response) -> bool:
+    """압축 대상 응답인지 확인 (스트리밍/이미 인코딩됨/작은 응답 제외)"""
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.is_streamed or response.direct_passthrough:
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return False
+    return (response.content_length or 0) >= MIN_SIZE
+
+
+def compress_response(response, encoding: Optional[str]):
+    """
+    응답 본문을 압축하고 Content-Encoding / Vary / ETag 헤더 설정
+
+    Args:
+        response: Flask 응답
+        encoding: choose_encoding() 결과 (None이면 Vary만 추가)
+
+    Returns:
+        (응답, 원본 크기, 압축 크기) - 압축하지 않았으면 크기는 None
+    """
+    if not is_compressible(response):
+        return response, None, None
+
+    # 같은 URL이라도 Accept-Encoding에 따라 본문이 다름을 캐시에 알림
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response, None, None
+
+    data = response.get_data()
+    compressed = compress(data, encoding)
+    if len(compressed) >= len(data):
+        return response, None, None
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(encoded_etag(etag, encoding))
+    return response, len(data), len(compressed)
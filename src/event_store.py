@@ -0,0 +1,1487 @@
+"""
+SQLite 기반 이벤트 저장소 모듈
+캘린더 이벤트와 회의록 메모를 WAL 모드 SQLite에 저장합니다.
+기존 data/db.json 형식은 가져오기/내보내기 용도로만 사용합니다.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, tzinfo
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import pytz
+
+import blob_store
+import history_log
+import metrics
+import recurrence
+from event_wire import DEFAULT_LAZY_BODY_CHARS, attach_body, body_ref, split_body
+from search_index import FTS_SCHEMA, index_row, build_match_query, term_patterns, rank, search_document, snippet
+
+metrics.describe('store_lock_wait_seconds', metrics.HISTOGRAM,
+                 '쓰기 락 대기 시간 (초, lock=process|sqlite)')
+metrics.describe('store_transaction_seconds', metrics.HISTOGRAM, '쓰기 트랜잭션 소요 시간 (초)')
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    id TEXT PRIMARY KEY,
+    start TEXT,
+    "end" TEXT,
+    source_id TEXT,
+    position INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 1,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_events_start ON events (start);
+CREATE INDEX IF NOT EXISTS idx_events_source_id ON events (source_id);
+
+-- 변경 기록 (증분 백업용, 백업에 옮겨진 뒤 삭제됨)
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    rev INTEGER NOT NULL,
+    at REAL NOT NULL,
+    op TEXT NOT NULL,
+    event_id TEXT,
+    data TEXT
+);
+
+-- 삭제된 이벤트 (외부 동기화가 삭제를 증분으로 알 수 있도록 보관)
+-- version: 삭제 직전 버전 (같은 ID로 다시 만들면 이어서 올림)
+CREATE TABLE IF NOT EXISTS tombstones (
+    id TEXT PRIMARY KEY,
+    rev INTEGER NOT NULL,
+    at REAL NOT NULL,
+    version INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_tombstones_rev ON tombstones (rev);
+"""
+
+# 삭제 기록 보관 기간 (초)
+TOMBSTONE_RETENTION = 30 * 86400
+
+# 검색 시 관련도 순위를 매길 최근 일치 항목 수 (나머지 일치 항목은 그 뒤에 최신순으로 이어짐)
+RANK_WINDOW = 200
+
+# 변경 기록 종류
+CHANGE_UPSERT = 'upsert'
+CHANGE_DELETE = 'delete'
+CHANGE_NOTES = 'notes'
+
+
+# 타임존이 없는 시간 값을 해석할 기본 타임존 (앱은 TIMEZONE 설정을 넘김)
+DEFAULT_TIMEZONE = 'Asia/Seoul'
+
+# 종료 시간이 없는 이벤트의 기본 길이 (FullCalendar 기본값과 동일)
+DEFAULT_ALLDAY_DURATION = 86400
+DEFAULT_TIMED_DURATION = 3600
+
+
+class EventStoreError(Exception):
+    """이벤트 저장소 오류 기본 클래스"""
+
+
+class EventNotFound(EventStoreError):
+    """존재하지 않는 이벤트"""
+
+    def __init__(self, event_id: str):
+        super().__init__(f"이벤트를 찾을 수 없습니다: {event_id}")
+        self.event_id = event_id
+
+
+class VersionConflict(EventStoreError):
+    """다른 클라이언트가 먼저 수정해 버전이 맞지 않음"""
+
+    def __init__(self, event_id: str, expected: Optional[int], actual: Optional[int]):
+        super().__init__(f"버전 충돌: {event_id} (요청 {expected}, 현재 {actual})")
+        self.event_id = event_id
+        self.expected = expected
+        self.actual = actual
+
+
+# 이벤트 종류 컬럼 값과 extendedProps 표시 (먼저 나온 표시가 우선)
+EVENT_KINDS = (('summary', 'isSummary'), ('task', 'isTask'), ('meeting', 'isMeeting'))
+
+
+def _event_columns(event: Dict[str, Any]) -> tuple:
+    """이벤트 딕셔너리에서 인덱스 컬럼 값 추출 (start, end, sourceId, status, 종류)"""
+    ext = event.get('extendedProps') or {}
+    kind = next((name for name, flag in EVENT_KINDS if ext.get(flag)), None)
+    status = ext.get('status')
+    return event.get('start'), event.get('end'), ext.get('sourceId'), \
+        status if isinstance(status, str) else None, kind
+
+
+def _epoch(value: datetime, tz: tzinfo) -> float:
+    """datetime → epoch 초 (타임존이 없으면 tz 기준 시각)"""
+    if value.tzinfo is None:
+        value = tz.localize(value) if hasattr(tz, 'localize') else value.replace(tzinfo=tz)
+    return value.timestamp()
+
+
+def parse_timestamp(value: Optional[str], tz: Optional[tzinfo] = None) -> Optional[float]:
+    """
+    ISO 8601 날짜/시간 문자열을 epoch 초로 변환
+    타임존이 없는 값은 서버 로컬 시간이 아니라 tz(기본 DEFAULT_TIMEZONE) 기준으로 해석합니다.
+    (저장된 이벤트와 일괄 가져오기는 타임존 없는 한국 시간을 씀)
+
+    Args:
+        value: 'YYYY-MM-DD' 또는 'YYYY-MM-DDTHH:MM[:SS][+09:00|Z]' 형식 문자열
+        tz: 타임존이 없는 값의 기준 타임존
+
+    Returns:
+        epoch 초 (파싱 실패 시 None)
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return _epoch(parsed, tz or pytz.timezone(DEFAULT_TIMEZONE))
+
+
+def _event_interval(event: Dict[str, Any], tz: tzinfo) -> tuple:
+    """이벤트의 (start_ts, end_ts) 구간 계산 (종료 시간이 없으면 기본 길이 적용)"""
+    start_ts = parse_timestamp(event.get('start'), tz)
+    if start_ts is None:
+        return None, None
+    end_ts = parse_timestamp(event.get('end'), tz)
+    if end_ts is None or end_ts <= start_ts:
+        all_day = event.get('allDay') or 'T' not in str(event.get('start'))
+        end_ts = start_ts + (DEFAULT_ALLDAY_DURATION if all_day else DEFAULT_TIMED_DURATION)
+    return start_ts, end_ts
+
+
+def _overlaps(event: Dict[str, Any], start_ts: float, end_ts: float, tz: tzinfo) -> bool:
+    """이벤트가 [start_ts, end_ts) 구간과 겹치는지 확인"""
+    event_start, event_end = _event_interval(event, tz)
+    return event_start is not None and event_start < end_ts and event_end > start_ts
+
+
+def _dumps(event: Dict[str, Any]) -> str:
+    """이벤트 직렬화 (키 정렬로 변경 여부 비교가 가능하도록)"""
+    return json.dumps(event, ensure_ascii=False, sort_keys=True)
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """
+    JSON Merge Patch (RFC 7386) 적용
+    null 값은 해당 키 삭제, 객체는 재귀적으로 병합합니다.
+
+    Args:
+        target: 원본 값
+        patch: 패치 값
+
+    Returns:
+        패치가 적용된 새 값
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def diff_patch(source: Dict[str, Any], target: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    source를 target으로 바꾸는 JSON Merge Patch (merge_patch의 반대, 바뀐 키만 담음)
+
+    Args:
+        source: 원래 객체
+        target: 바뀐 객체
+
+    Returns:
+        merge_patch(source, 결과) == target 이 되는 패치 (같으면 빈 딕셔너리)
+    """
+    patch = {key: None for key in source if key not in target}
+    for key, value in target.items():
+        old = source.get(key)
+        if key in source and old == value or value is None and key not in source:
+            continue
+        if isinstance(old, dict) and isinstance(value, dict):
+            nested = diff_patch(old, value)
+            if nested:
+                patch[key] = nested
+        else:
+            patch[key] = value
+    return patch
+
+
+# --- 반복 일정 ---
+
+def _valid_occurrence_key(event: Dict[str, Any], key: str) -> bool:
+    """반복 일정의 규칙이 만드는 발생 키인지 확인 (취소 여부는 보지 않음)"""
+    if not isinstance(key, str) or not recurrence.OCCURRENCE_KEY.match(key):
+        return False
+    try:
+        rule = recurrence.parse_rrule(event.get(recurrence.RRULE))
+        dtstart, all_day = recurrence.parse_start(event.get('start'))
+        if ('T' in key) == all_day:
+            return False
+        return recurrence.is_occurrence(rule, dtstart, recurrence.key_to_datetime(key, dtstart))
+    except ValueError:
+        return False
+
+
+def _strip_occurrence(event: Dict[str, Any]) -> Dict[str, Any]:
+    """발생 이벤트에만 붙는 값(ID, seriesId/recurrenceId/rrule 표시) 제거"""
+    event = {key: value for key, value in event.items() if key != 'id' and key not in recurrence.SERIES_FIELDS}
+    ext = event.get('extendedProps')
+    if isinstance(ext, dict) and any(name in ext for name in recurrence.OCCURRENCE_PROPS):
+        event['extendedProps'] = {k: v for k, v in ext.items() if k not in recurrence.OCCURRENCE_PROPS}
+    return event
+
+
+def _normalize_series(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    저장 전 반복 일정 정리 (원본은 바꾸지 않음)
+    규칙을 검사/정규화하고, 규칙이 바뀌어 더는 없는 발생의 취소/수정 기록은 버립니다.
+
+    Raises:
+        EventStoreError: 해석할 수 없는 반복 규칙이나 시작 시간
+    """
+    ext = event.get('extendedProps')
+    if isinstance(ext, dict) and any(name in ext for name in recurrence.OCCURRENCE_PROPS):
+        # 발생 이벤트 표시는 조회할 때 붙는 값이므로 저장하지 않음
+        event = dict(event, extendedProps={k: v for k, v in ext.items() if k not in recurrence.OCCURRENCE_PROPS})
+    if not event.get(recurrence.RRULE):
+        if any(field in event for field in recurrence.SERIES_FIELDS):
+            event = {k: v for k, v in event.items() if k not in recurrence.SERIES_FIELDS}
+        return event
+
+    try:
+        rule = recurrence.parse_rrule(event[recurrence.RRULE])
+        recurrence.parse_start(event.get('start'))
+    except (TypeError, ValueError) as e:
+        raise EventStoreError(f"반복 일정 오류: {e}") from None
+    event = dict(event, rrule=recurrence.format_rrule(rule))
+    exdate = sorted({key for key in event.get(recurrence.EXDATE) or [] if _valid_occurrence_key(event, key)})
+    overrides = {
+        key: changes for key, changes in (event.get(recurrence.OVERRIDES) or {}).items()
+        if isinstance(changes, dict) and changes and key not in exdate and _valid_occurrence_key(event, key)
+    }
+    for field, value in ((recurrence.EXDATE, exdate), (recurrence.OVERRIDES, overrides)):
+        if value:
+            event[field] = value
+        else:
+            event.pop(field, None)
+    return event
+
+
+def _occurrence_event(series: Dict[str, Any], key: str, start: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    반복 일정의 발생 하나를 일반 이벤트 형태로 만들기 (그 발생만 바꾼 내용 반영)
+
+    Args:
+        series: 반복 일정 행의 이벤트
+        key: 발생 키
+        start: 발생 시작 (이미 계산했으면 전달)
+
+    Returns:
+        ID가 '<반복 일정 ID>@<발생 키>'이고 extendedProps에 seriesId/recurrenceId/rrule이 붙은 이벤트
+    """
+    dtstart, all_day = recurrence.parse_start(series['start'])
+    if start is None:
+        start = recurrence.key_to_datetime(key, dtstart)
+    event = {k: v for k, v in series.items() if k not in recurrence.SERIES_FIELDS}
+    event['id'] = recurrence.occurrence_id(series['id'], key)
+    event['start'] = recurrence.format_start(start, all_day)
+    if series.get('end'):
+        try:
+            end, _ = recurrence.parse_start(series['end'])
+            event['end'] = recurrence.format_start(start + (end - dtstart), all_day)
+        except (TypeError, ValueError):
+            event.pop('end')
+    event['extendedProps'] = dict(event.get('extendedProps') or {}, seriesId=series['id'],
+                                  recurrenceId=key, rrule=series[recurrence.RRULE])
+
+    override = (series.get(recurrence.OVERRIDES) or {}).get(key)
+    if override:
+        event = merge_patch(event, override)
+        if 'description' in (override.get('extendedProps') or {}):
+            # 이 발생만 본문을 바꿨으면 반복 일정의 본문 블롭 참조는 쓰지 않음
+            event = attach_body(event, None)
+    return event
+
+
+def _series_interval(event: Dict[str, Any], tz: tzinfo) -> tuple:
+    """
+    반복 일정 전체가 걸친 구간 (start_ts, end_ts) - 끝없이 반복하면 end_ts는 None
+    다른 날로 옮긴 발생도 포함합니다.
+    """
+    start_ts, end_ts = _event_interval(event, tz)
+    if start_ts is None:
+        return None, None
+    dtstart, _ = recurrence.parse_start(event['start'])
+    last = recurrence.series_until(recurrence.parse_rrule(event[recurrence.RRULE]), dtstart)
+    series_end = _epoch(last, tz) + (end_ts - start_ts) if last is not None else None
+    for key in event.get(recurrence.OVERRIDES) or {}:
+        moved_start, moved_end = _event_interval(_occurrence_event(event, key), tz)
+        if moved_start is None:
+            continue
+        start_ts = min(start_ts, moved_start)
+        if series_end is not None:
+            series_end = max(series_end, moved_end)
+    return start_ts, series_end
+
+
+def _expand_series(series: Dict[str, Any], start_ts: float, end_ts: float, tz: tzinfo) -> List[Dict[str, Any]]:
+    """
+    반복 일정에서 [start_ts, end_ts) 구간과 겹치는 발생만 펼치기
+    구간 앞쪽으로 바로 건너뛰므로 계산량은 반복 일정의 길이가 아니라 구간 안의 발생 수에 비례합니다.
+    """
+    first_start, first_end = _event_interval(series, tz)
+    if first_start is None:
+        return []
+    rule = recurrence.parse_rrule(series[recurrence.RRULE])
+    dtstart, all_day = recurrence.parse_start(series['start'])
+    exdate = set(series.get(recurrence.EXDATE) or [])
+    overrides = series.get(recurrence.OVERRIDES) or {}
+
+    # 구간 시작 전에 시작했지만 구간까지 이어지는 발생도 포함
+    after = datetime.fromtimestamp(start_ts - (first_end - first_start), dtstart.tzinfo or tz)
+    if dtstart.tzinfo is None:
+        after = after.replace(tzinfo=None)
+    events, seen = [], set()
+    for start in recurrence.iter_occurrences(rule, dtstart, after):
+        if _epoch(start, tz) >= end_ts:
+            break
+        key = recurrence.occurrence_key(start, all_day)
+        seen.add(key)
+        if key not in exdate:
+            events.append(_occurrence_event(series, key, start))
+    # 구간 밖의 발생을 구간 안으로 옮긴 경우
+    events.extend(_occurrence_event(series, key) for key in overrides if key not in seen and key not in exdate)
+    return [event for event in events if _overlaps(event, start_ts, end_ts, tz)]
+
+
+class EventStore:
+    """캘린더 이벤트 저장소 (SQLite WAL 모드)"""
+
+    def __init__(self, db_path: Path, lazy_body_chars: Optional[int] = None,
+                 history_limit: int = history_log.DEFAULT_HISTORY_LIMIT, timezone: str = DEFAULT_TIMEZONE):
+        """
+        EventStore 초기화
+
+        Args:
+            db_path: SQLite 파일 경로
+            lazy_body_chars: 이보다 긴 본문은 블롭 저장소에 따로 저장하고 이벤트에는 참조와 미리보기만 남김
+                             (0이면 사용 안 함, None이면 DB에 기록된 마지막 설정 또는 기본값)
+            history_limit: 실행 취소 기록 최대 단계 수 (0이면 기록하지 않음)
+            timezone: 타임존이 없는 시작/종료 시간을 해석할 타임존 (예: Asia/Seoul)
+        """
+        self.db_path = Path(db_path)
+        self.history_limit = history_limit
+        self.timezone = pytz.timezone(timezone)
+        self._local = threading.local()
+        # 쓰기는 한 번에 하나씩 (읽기는 WAL 덕분에 쓰기와 서로 막지 않음)
+        self._write_lock = threading.Lock()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        has_search_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'events_fts'"
+        ).fetchone() is not None
+        conn.executescript(FTS_SCHEMA)
+        conn.executescript(blob_store.BLOB_SCHEMA)
+        conn.executescript(history_log.HISTORY_SCHEMA)
+        stored_chars = self._get_meta('lazy_body_chars')
+        if lazy_body_chars is None:
+            lazy_body_chars = int(stored_chars) if stored_chars is not None else DEFAULT_LAZY_BODY_CHARS
+        self.lazy_body_chars = lazy_body_chars
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._migrate_schema(conn)
+            if not has_search_index:
+                # 검색 색인 도입 전에 저장된 이벤트 색인
+                self._rebuild_search_index(conn)
+            if stored_chars != str(lazy_body_chars):
+                # 블롭 저장소 도입 전(또는 기준 길이가 바뀌기 전)에 저장된 긴 본문 옮기기
+                self._split_bodies(conn)
+            if self._get_meta('timezone') != timezone:
+                # 타임존 설정 도입 전(서버 로컬 시간 기준) 또는 설정이 바뀌기 전에 계산한 구간 다시 계산
+                self._compute_intervals(conn)
+                self._set_meta(conn, 'timezone', timezone)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 커넥션 반환 (sqlite3 커넥션은 스레드 간 공유하지 않음)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _migrate_schema(self, conn: sqlite3.Connection):
+        """이전 버전에서 만든 DB에 누락된 컬럼 추가"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+        if 'version' not in columns:
+            conn.execute("ALTER TABLE events ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+        if 'start_ts' not in columns:
+            # 기간 조회용 구간 컬럼 (epoch 초) + 변경 리비전
+            conn.execute("ALTER TABLE events ADD COLUMN start_ts REAL")
+            conn.execute("ALTER TABLE events ADD COLUMN end_ts REAL")
+            conn.execute("ALTER TABLE events ADD COLUMN rev INTEGER NOT NULL DEFAULT 0")
+        if 'version' not in {row[1] for row in conn.execute("PRAGMA table_info(tombstones)")}:
+            conn.execute("ALTER TABLE tombstones ADD COLUMN version INTEGER")
+        if 'rrule' not in columns:
+            # 반복 일정 규칙 (반복 일정 행은 start_ts~end_ts가 반복 전체 구간, 끝없이 반복하면 end_ts는 NULL)
+            conn.execute("ALTER TABLE events ADD COLUMN rrule TEXT")
+        if 'kind' not in columns:
+            # 검색 필터용 상태/종류 컬럼 (JSON을 행마다 풀지 않도록)
+            conn.execute("ALTER TABLE events ADD COLUMN status TEXT")
+            conn.execute("ALTER TABLE events ADD COLUMN kind TEXT")
+            for event_id, data in conn.execute("SELECT id, data FROM events").fetchall():
+                conn.execute("UPDATE events SET status = ?, kind = ? WHERE id = ?",
+                             _event_columns(json.loads(data))[3:] + (event_id,))
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_interval ON events (start_ts, end_ts)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_rev ON events (rev)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_series ON events (start_ts) WHERE rrule IS NOT NULL")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_kind_status ON events (kind, status)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_events_status ON events (status)")
+
+    def _compute_intervals(self, conn: sqlite3.Connection):
+        """저장된 이벤트의 기간 조회용 구간(start_ts, end_ts)과 최대 이벤트 길이 다시 계산 (트랜잭션 안에서 호출)"""
+        max_span = 0.0
+        for event_id, data, rule in conn.execute("SELECT id, data, rrule FROM events").fetchall():
+            event = json.loads(data)
+            start_ts, end_ts = _series_interval(event, self.timezone) if rule else _event_interval(event, self.timezone)
+            if start_ts is not None and not rule:
+                max_span = max(max_span, end_ts - start_ts)
+            conn.execute("UPDATE events SET start_ts = ?, end_ts = ? WHERE id = ?", (start_ts, end_ts, event_id))
+        self._set_meta(conn, 'max_span', str(max_span))
+
+    def _split_bodies(self, conn: sqlite3.Connection):
+        """
+        저장된 이벤트의 긴 본문을 블롭으로 옮기기 (트랜잭션 안에서 호출)
+        내용은 그대로이므로 버전/변경 기록은 바꾸지 않습니다.
+        """
+        moved = 0
+        for event_id, data in conn.execute("SELECT id, data FROM events").fetchall():
+            event = json.loads(data)
+            if body_ref(event) is not None:
+                continue
+            stored, body = split_body(event, self.lazy_body_chars)
+            if stored is event:
+                continue
+            if body is not None:
+                blob_store.put(conn, body)
+                moved += 1
+            conn.execute("UPDATE events SET data = ? WHERE id = ?", (_dumps(stored), event_id))
+        self._set_meta(conn, 'lazy_body_chars', str(self.lazy_body_chars))
+        if moved:
+            print(f"긴 본문 {moved}개를 블롭 저장소로 옮김")
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 트랜잭션 (프로세스 내 쓰기 직렬화 + BEGIN IMMEDIATE)"""
+        with metrics.timer('store_lock_wait_seconds', span='lock_wait', lock='process'):
+            self._write_lock.acquire()
+        try:
+            conn = self._conn()
+            with metrics.timer('store_lock_wait_seconds', span='lock_wait', lock='sqlite'):
+                conn.execute("BEGIN IMMEDIATE")
+            start = time.perf_counter()
+            try:
+                # 트랜잭션마다 리비전 증가 (기간 조회 ETag 계산용)
+                row = conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+                self._local.rev = int(row[0]) + 1 if row else 1
+                self._set_meta(conn, 'revision', str(self._local.rev))
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                metrics.observe('store_transaction_seconds', time.perf_counter() - start)
+        finally:
+            self._write_lock.release()
+
+    # --- 메타 정보 ---
+
+    def _get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _log_change(self, conn: sqlite3.Connection, op: str, event_id: Optional[str], data: Optional[str],
+                    version: Optional[int] = None):
+        """변경 기록 추가 (쓰기 트랜잭션 안에서 호출, 삭제면 version은 삭제 직전 버전)"""
+        now = time.time()
+        conn.execute(
+            "INSERT INTO changes (rev, at, op, event_id, data) VALUES (?, ?, ?, ?, ?)",
+            (self._local.rev, now, op, event_id, data)
+        )
+        if op == CHANGE_DELETE:
+            conn.execute("INSERT OR REPLACE INTO tombstones (id, rev, at, version) VALUES (?, ?, ?, ?)",
+                         (event_id, self._local.rev, now, version))
+        elif op == CHANGE_UPSERT:
+            conn.execute("DELETE FROM tombstones WHERE id = ?", (event_id,))
+
+    @staticmethod
+    def _next_version(conn: sqlite3.Connection, event_id: str) -> int:
+        """
+        새로 만드는 행의 버전 (트랜잭션 안에서 행을 쓰기 전에 호출)
+        삭제했던 ID를 다시 만들면(실행 취소 등) 삭제 직전 버전에서 이어서 올려야
+        옛 버전을 가진 탭의 If-Match가 다시 일치하지 않습니다.
+        """
+        row = conn.execute("SELECT version FROM tombstones WHERE id = ?", (event_id,)).fetchone()
+        return (row[0] or 0) + 1 if row else 1
+
+    def get_revision(self) -> int:
+        """저장소 전체 리비전 (쓰기 트랜잭션마다 1씩 증가)"""
+        return int(self._get_meta('revision', '0') or 0)
+
+    def get_meeting_notes(self) -> str:
+        """저장된 회의록 메모 반환"""
+        return self._get_meta('meeting_notes', '') or ''
+
+    def set_meeting_notes(self, text: str):
+        """
+        회의록 메모 저장
+
+        Args:
+            text: 회의록 텍스트
+        """
+        with self._transaction() as conn:
+            self._set_meta(conn, 'meeting_notes', text)
+            self._log_change(conn, CHANGE_NOTES, None, text)
+
+    # --- 이벤트 ---
+
+    def _with_bodies(self, conn: sqlite3.Connection, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """참조 형식 이벤트들에 블롭 본문 채우기 (블롭 조회는 한 번에)"""
+        refs = [body_ref(event) for event in events]
+        if not any(refs):
+            return events
+        bodies = blob_store.get_many(conn, [ref for ref in refs if ref])
+        return [attach_body(event, bodies.get(ref)) if ref else event for event, ref in zip(events, refs)]
+
+    def list_events(self, bodies: bool = True) -> List[Dict[str, Any]]:
+        """
+        전체 이벤트 목록 반환 (저장 순서 유지)
+
+        Args:
+            bodies: 전체 본문 포함 여부 (False면 긴 본문은 참조와 미리보기만)
+        """
+        conn = self._conn()
+        rows = conn.execute("SELECT data FROM events ORDER BY position, rowid").fetchall()
+        events = [json.loads(row[0]) for row in rows]
+        return self._with_bodies(conn, events) if bodies else events
+
+    def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """
+        단일 이벤트 조회
+
+        Args:
+            event_id: 이벤트 ID
+
+        Returns:
+            이벤트 딕셔너리 (없으면 None)
+        """
+        return self.get_event_with_version(event_id)[0]
+
+    def get_body(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """
+        이벤트 전체 본문 조회 (GET /api/events/<id>/body)
+
+        Args:
+            event_id: 이벤트 ID
+
+        Returns:
+            {'body', 'ref', 'version'} (이벤트가 없으면 None, 블롭이 아니면 ref는 None)
+        """
+        conn = self._conn()
+        row = conn.execute("SELECT data, version FROM events WHERE id = ?", (event_id,)).fetchone()
+        if row is None:
+            # 반복 일정의 발생은 반복 일정(또는 그 발생만 바꾼 내용)의 본문
+            event, version = self.get_event_with_version(event_id)
+            if event is None:
+                return None
+            return {'body': (event.get('extendedProps') or {}).get('description') or '', 'ref': None,
+                    'version': version}
+        event = json.loads(row[0])
+        ref = body_ref(event)
+        body = blob_store.get(conn, ref) if ref else None
+        if body is None:
+            body = (event.get('extendedProps') or {}).get('description') or event.get('description') or ''
+        return {'body': body, 'ref': ref, 'version': row[1]}
+
+    def count_events(self) -> int:
+        """저장된 이벤트 수"""
+        return self._conn().execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def replace_events(self, events: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        전체 이벤트 목록으로 교체
+        기존 데이터와 비교해 바뀐 행만 쓰고, 목록에 없는 이벤트는 삭제합니다.
+
+        Args:
+            events: 클라이언트가 보낸 전체 이벤트 목록
+
+        Returns:
+            변경 통계 (written, deleted, unchanged)
+        """
+        stats = {'written': 0, 'deleted': 0, 'unchanged': 0}
+
+        with self._transaction() as conn:
+            existing = {
+                row[0]: (row[1], row[2], row[3])
+                for row in conn.execute("SELECT id, position, version, data FROM events")
+            }
+            seen = set()
+
+            for position, event in enumerate(events):
+                if not event.get('id'):
+                    # ID 없는 레거시 이벤트는 서버에서 ID 부여
+                    event = dict(event, id=uuid.uuid4().hex)
+                event_id = str(event['id'])
+                if event_id not in existing and (event.get('extendedProps') or {}).get('seriesId'):
+                    # 펼친 반복 일정의 발생은 반복 일정 행에서 만들어지므로 따로 저장하지 않음
+                    continue
+                seen.add(event_id)
+                old = existing.get(event_id)
+                current = json.loads(old[2]) if old is not None else None
+                # 저장 형식(긴 본문은 블롭 참조)끼리 비교
+                event, stored = self._prepare_body(conn, event, current)
+
+                if old is not None and (old[0], old[2]) == (position, _dumps(stored)):
+                    stats['unchanged'] += 1
+                    continue
+
+                version = old[1] + 1 if old is not None else self._next_version(conn, event_id)
+                self._write_row(conn, event_id, event, position, version)
+                stats['written'] += 1
+
+            removed = [(event_id,) for event_id in existing if event_id not in seen]
+            if removed:
+                for (event_id,) in removed:
+                    self._unindex(conn, event_id)
+                conn.executemany("DELETE FROM events WHERE id = ?", removed)
+                for (event_id,) in removed:
+                    self._log_change(conn, CHANGE_DELETE, event_id, None, existing[event_id][1])
+                stats['deleted'] = len(removed)
+
+        return stats
+
+    def get_versions(self) -> Dict[str, int]:
+        """이벤트 ID별 현재 버전 (클라이언트 낙관적 동시성 제어용)"""
+        return dict(self._conn().execute("SELECT id, version FROM events").fetchall())
+
+    def get_event_with_version(self, event_id: str) -> tuple:
+        """
+        단일 이벤트와 버전 조회
+
+        Args:
+            event_id: 이벤트 ID
+
+        Returns:
+            (이벤트 딕셔너리, 버전) - 없으면 (None, None)
+            반복 일정의 발생 ID('<반복 일정 ID>@<발생 키>')면 그 발생과 반복 일정의 버전
+        """
+        conn = self._conn()
+        row = conn.execute("SELECT data, version FROM events WHERE id = ?", (event_id,)).fetchone()
+        if row is not None:
+            return self._with_bodies(conn, [json.loads(row[0])])[0], row[1]
+
+        occurrence = recurrence.split_occurrence_id(event_id)
+        if occurrence is None:
+            return None, None
+        series_id, key = occurrence
+        row = conn.execute("SELECT data, version FROM events WHERE id = ?", (series_id,)).fetchone()
+        series = json.loads(row[0]) if row is not None else {}
+        if (not series.get(recurrence.RRULE) or key in (series.get(recurrence.EXDATE) or [])
+                or not _valid_occurrence_key(series, key)):
+            return None, None
+        return _occurrence_event(self._with_bodies(conn, [series])[0], key), row[1]
+
+    # --- 기간 조회 ---
+
+    def _range_clause(self, start_ts: float, end_ts: float) -> tuple:
+        """
+        [start_ts, end_ts) 구간과 겹치는 이벤트 조건
+        (start_ts, end_ts) 인덱스를 타도록 시작 시간 범위를 최대 이벤트 길이로 제한합니다.
+        시작 시간을 해석할 수 없는 이벤트(start_ts가 NULL)는 사라지지 않도록 모든 구간에 포함합니다.
+        """
+        max_span = float(self._get_meta('max_span', '0') or 0)
+        clause = "rrule IS NULL AND (start_ts < ? AND start_ts >= ? AND end_ts > ? OR start_ts IS NULL)"
+        return clause, (end_ts, start_ts - max_span, start_ts)
+
+    @staticmethod
+    def _series_clause(start_ts: float, end_ts: float) -> tuple:
+        """[start_ts, end_ts) 구간에 발생이 있을 수 있는 반복 일정 조건 (반복 전체 구간으로 판단)"""
+        return "rrule IS NOT NULL AND start_ts < ? AND (end_ts IS NULL OR end_ts > ?)", (end_ts, start_ts)
+
+    def list_events_in_range(self, start_ts: float, end_ts: float) -> tuple:
+        """
+        기간과 겹치는 이벤트 조회
+
+        Args:
+            start_ts: 조회 시작 (epoch 초)
+            end_ts: 조회 종료 (epoch 초, 미포함)
+
+        Returns:
+            (이벤트 목록, {이벤트 ID: 버전}) - 긴 본문은 참조와 미리보기만 (캘린더 표시용)
+            반복 일정은 구간 안의 발생만 펼쳐서 담고, 발생과 반복 일정 ID 모두 반복 일정의 버전을 가집니다.
+        """
+        conn = self._conn()
+        clause, params = self._range_clause(start_ts, end_ts)
+        rows = conn.execute(
+            f"SELECT id, version, data FROM events WHERE {clause} ORDER BY start_ts", params
+        ).fetchall()
+        events = [json.loads(row[2]) for row in rows]
+        versions = {row[0]: row[1] for row in rows}
+
+        clause, params = self._series_clause(start_ts, end_ts)
+        for series_id, version, data in conn.execute(
+            f"SELECT id, version, data FROM events WHERE {clause}", params
+        ).fetchall():
+            occurrences = _expand_series(json.loads(data), start_ts, end_ts, self.timezone)
+            events.extend(occurrences)
+            versions[series_id] = version
+            versions.update((event['id'], version) for event in occurrences)
+        return events, versions
+
+    def range_fingerprint(self, start_ts: float, end_ts: float) -> str:
+        """
+        기간 조회 결과의 지문 (조건부 GET의 ETag용)
+        구간 안의 이벤트 수와 최대 리비전만으로 계산하므로 본문을 읽지 않습니다.
+        이벤트가 추가/수정/이동되면 최대 리비전이, 삭제되면 개수가 바뀝니다.
+        반복 일정은 발생을 바꿔도 반복 일정 행의 리비전이 바뀌므로 펼치지 않고 행 단위로 셉니다.
+
+        Args:
+            start_ts: 조회 시작 (epoch 초)
+            end_ts: 조회 종료 (epoch 초)
+
+        Returns:
+            지문 문자열
+        """
+        clause, params = self._range_clause(start_ts, end_ts)
+        series_clause, series_params = self._series_clause(start_ts, end_ts)
+        count, max_rev = self._conn().execute(
+            f"SELECT COUNT(*), MAX(rev) FROM events WHERE ({clause}) OR ({series_clause})", params + series_params
+        ).fetchone()
+        return f"{start_ts:.0f}-{end_ts:.0f}-{count}-{max_rev or 0}"
+
+    # --- 단일 이벤트 변경 (델타 API) ---
+
+    def _prepare_body(self, conn: sqlite3.Connection, event: Dict[str, Any],
+                      current: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        저장할 이벤트를 (전체 본문 형식, 저장 형식)으로 준비
+        클라이언트가 미리보기만 가진 채 보낸 이벤트(bodyRef 있음)는 블롭 본문으로 되돌립니다.
+        (끌어서 옮기기/상태 변경/실행 취소처럼 본문을 받지 않은 채 보낸 변경에서 본문이 잘리지 않게)
+
+        Args:
+            conn: 저장소 커넥션
+            event: 저장 요청 이벤트
+            current: 현재 저장된 이벤트 (블롭이 이미 정리된 경우 대신 사용)
+
+        Returns:
+            (전체 본문 이벤트, 저장 형식 이벤트)
+        """
+        event = self._resolve_body(conn, event, current)
+        stored, body = split_body(event, self.lazy_body_chars)
+        if body is not None:
+            blob_store.put(conn, body)
+        return event, stored
+
+    def _resolve_body(self, conn: sqlite3.Connection, event: Dict[str, Any],
+                      current: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """참조 형식(bodyRef)으로 받은 이벤트의 본문을 블롭(없으면 current의 본문)으로 되돌리기"""
+        ref = body_ref(event)
+        if ref is not None:
+            body = blob_store.get(conn, ref)
+            if body is None and current is not None:
+                body = self._with_bodies(conn, [current])[0].get('extendedProps', {}).get('description')
+            if body is None:
+                print(f"⚠️  본문 블롭을 찾을 수 없어 미리보기로 저장: {event.get('id')}")
+            event = attach_body(event, body)
+        else:
+            # 본문을 받아 온 뒤의 참조 표시 등 남은 값 정리
+            event = attach_body(event, None)
+        return event
+
+    def _write_row(self, conn: sqlite3.Connection, event_id: str, event: Dict[str, Any],
+                   position: int, version: int, current: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        이벤트 행 쓰기 + 검색 색인 + 변경 기록 (긴 본문은 블롭으로 따로 저장)
+
+        Returns:
+            전체 본문을 가진 이벤트
+        """
+        event, stored = self._prepare_body(conn, _normalize_series(event), current)
+        start, end, source_id, status, kind = _event_columns(event)
+        rule = event.get(recurrence.RRULE)
+        start_ts, end_ts = _series_interval(event, self.timezone) if rule else _event_interval(event, self.timezone)
+        data = _dumps(stored)
+        self._journal(conn, event_id)
+        self._unindex(conn, event_id)
+        cursor = conn.execute(
+            'INSERT OR REPLACE INTO events '
+            '(id, start, "end", source_id, position, version, data, start_ts, end_ts, rev, rrule, status, kind) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (event_id, start, end, source_id, position, version, data,
+             start_ts, end_ts, self._local.rev, rule, status, kind)
+        )
+        conn.execute(
+            "INSERT INTO events_fts (rowid, title, body, people, decisions) VALUES (?, ?, ?, ?, ?)",
+            (cursor.lastrowid,) + index_row(event)
+        )
+        # 백업은 블롭 없이 복원할 수 있도록 전체 본문으로 기록
+        self._log_change(conn, CHANGE_UPSERT, event_id, json.dumps(
+            {'position': position, 'version': version, 'event': event}, ensure_ascii=False, sort_keys=True
+        ))
+        if start_ts is not None and not rule:
+            # 가장 긴 이벤트 길이 (기간 조회 시 start_ts 인덱스 범위 하한 계산용, 줄어들지 않음)
+            span = end_ts - start_ts
+            max_span = float(self._get_meta('max_span', '0') or 0)
+            if span > max_span:
+                self._set_meta(conn, 'max_span', str(span))
+        return event
+
+    def _journal(self, conn: sqlite3.Connection, event_id: str):
+        """실행 취소 기록용으로 행을 처음 바꾸기 전의 저장 형식 보관 (기록 중인 트랜잭션에서만)"""
+        journal = getattr(self._local, 'journal', None)
+        if journal is None or event_id in journal:
+            return
+        row = conn.execute("SELECT data FROM events WHERE id = ?", (event_id,)).fetchone()
+        journal[event_id] = json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _unindex(conn: sqlite3.Connection, event_id: str):
+        """검색 색인에서 이벤트 제거 (events 행을 지우기 전에 호출)"""
+        conn.execute(
+            "DELETE FROM events_fts WHERE rowid = (SELECT rowid FROM events WHERE id = ?)", (event_id,)
+        )
+
+    def _current_row(self, conn: sqlite3.Connection, event_id: str,
+                     expected_version: Optional[int]) -> tuple:
+        """변경 대상 행 조회 + 버전 확인 (expected_version이 None이면 확인 생략)"""
+        row = conn.execute(
+            "SELECT data, position, version FROM events WHERE id = ?", (event_id,)
+        ).fetchone()
+        if row is None:
+            raise EventNotFound(event_id)
+        if expected_version is not None and int(expected_version) != row[2]:
+            raise VersionConflict(event_id, expected_version, row[2])
+        return json.loads(row[0]), row[1], row[2]
+
+    def _apply_op(self, conn: sqlite3.Connection, op: Dict[str, Any]) -> Dict[str, Any]:
+        """트랜잭션 안에서 단일 변경 연산 적용"""
+        kind = op.get('op')
+
+        # 반복 일정의 발생('<반복 일정 ID>@<발생 키>')에 대한 연산은 반복 일정 행에 기록
+        target_id = (op.get('event') or {}).get('id') if kind == 'create' else op.get('id')
+        occurrence = recurrence.split_occurrence_id(target_id)
+        if occurrence is not None and not conn.execute(
+            "SELECT 1 FROM events WHERE id = ?", (str(target_id),)
+        ).fetchone() and conn.execute("SELECT 1 FROM events WHERE id = ?", (occurrence[0],)).fetchone():
+            return self._apply_occurrence_op(conn, op, *occurrence)
+
+        if kind == 'create':
+            event = dict(op.get('event') or {})
+            event_id = str(event.get('id') or uuid.uuid4().hex)
+            event['id'] = event_id
+            existing = conn.execute("SELECT version FROM events WHERE id = ?", (event_id,)).fetchone()
+            if existing is not None:
+                raise VersionConflict(event_id, None, existing[0])
+            position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM events").fetchone()[0]
+            version = self._next_version(conn, event_id)
+            event = self._write_row(conn, event_id, event, position, version)
+            return {'op': kind, 'id': event_id, 'version': version, 'event': event,
+                    'seriesId': event_id if event.get(recurrence.RRULE) else None}
+
+        event_id = str(op.get('id') or '')
+        current, position, version = self._current_row(conn, event_id, op.get('version'))
+
+        if kind == 'delete':
+            self._journal(conn, event_id)
+            self._unindex(conn, event_id)
+            conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
+            self._log_change(conn, CHANGE_DELETE, event_id, None, version)
+            return {'op': kind, 'id': event_id, 'version': None,
+                    'seriesId': event_id if current.get(recurrence.RRULE) else None}
+
+        if kind == 'patch':
+            # 본문을 바꾸는 패치도 있으므로 전체 본문 형식에 적용
+            event = merge_patch(self._with_bodies(conn, [current])[0], op.get('changes') or {})
+        elif kind == 'replace':
+            event = dict(op.get('event') or {})
+        else:
+            raise EventStoreError(f"알 수 없는 연산: {kind}")
+
+        event['id'] = event_id
+        event = self._write_row(conn, event_id, event, position, version + 1, current)
+        recurring = event.get(recurrence.RRULE) or current.get(recurrence.RRULE)
+        return {'op': kind, 'id': event_id, 'version': version + 1, 'event': event,
+                'seriesId': event_id if recurring else None}
+
+    def _apply_occurrence_op(self, conn: sqlite3.Connection, op: Dict[str, Any],
+                             series_id: str, key: str) -> Dict[str, Any]:
+        """
+        반복 일정의 발생 하나만 변경 (트랜잭션 안에서 호출)
+        삭제는 취소 목록(exdate)에, 수정은 펼친 발생과의 차이(overrides)로 반복 일정 행에 기록하므로
+        발생을 따로 저장하지 않습니다. 같은 발생 ID로 create하면 취소한 발생을 되살립니다 (실행 취소).
+
+        Returns:
+            연산 결과 (id는 발생 ID, version은 반복 일정의 새 버전)
+        """
+        kind = op.get('op')
+        event_id = recurrence.occurrence_id(series_id, key)
+        current, position, version = self._current_row(conn, series_id, op.get('version'))
+        exdate = [k for k in current.get(recurrence.EXDATE) or [] if k != key]
+        if (not current.get(recurrence.RRULE) or not _valid_occurrence_key(current, key)
+                or kind != 'create' and len(exdate) < len(current.get(recurrence.EXDATE) or [])):
+            raise EventNotFound(event_id)
+
+        series = self._with_bodies(conn, [current])[0]
+        overrides = dict(current.get(recurrence.OVERRIDES) or {})
+        if kind == 'delete':
+            exdate.append(key)
+            overrides.pop(key, None)
+        else:
+            if kind == 'patch':
+                target = merge_patch(_occurrence_event(series, key), op.get('changes') or {})
+            elif kind in ('replace', 'create'):
+                target = dict(op.get('event') or {})
+            else:
+                raise EventStoreError(f"알 수 없는 연산: {kind}")
+            # 펼친 그대로의 발생과 비교해서 바뀐 값만 기록 (미리보기만 가진 본문은 전체 본문으로 되돌려 비교)
+            base = _occurrence_event(dict(series, overrides={}), key)
+            target = self._resolve_body(conn, target, base)
+            changes = diff_patch(_strip_occurrence(base), _strip_occurrence(target))
+            if changes:
+                overrides[key] = changes
+            else:
+                overrides.pop(key, None)
+
+        series = dict(current, exdate=exdate, overrides=overrides)
+        series = self._write_row(conn, series_id, series, position, version + 1, current)
+        return {'op': kind, 'id': event_id, 'version': version + 1,
+                'event': None if kind == 'delete' else _occurrence_event(series, key), 'seriesId': series_id}
+
+    def apply_ops(self, ops: List[Dict[str, Any]], history: bool = True) -> List[Dict[str, Any]]:
+        """
+        여러 변경 연산을 하나의 트랜잭션으로 적용 (하나라도 실패하면 전부 취소)
+        history가 True면 연산 묶음 전체를 실행 취소 한 단계로 기록합니다.
+
+        Args:
+            ops: 연산 목록. 각 항목은 다음 중 하나
+                {"op": "create", "event": {...}}
+                {"op": "patch", "id": ..., "changes": {...}, "version": n}
+                {"op": "replace", "id": ..., "event": {...}, "version": n}
+                {"op": "delete", "id": ..., "version": n}
+                version을 생략하면 버전 확인 없이 적용합니다.
+                id가 반복 일정의 발생 ID('<반복 일정 ID>@<발생 키>')면 그 발생만 바꿉니다.
+            history: 실행 취소 기록 여부 (외부 동기화처럼 사용자가 직접 한 변경이 아니면 False)
+
+        Returns:
+            연산별 결과 목록 (id, version, event, seriesId - 반복 일정을 바꿨으면 그 ID)
+
+        Raises:
+            EventNotFound, VersionConflict, EventStoreError
+        """
+        with self._transaction() as conn:
+            if not history or self.history_limit <= 0:
+                return [self._apply_op(conn, op) for op in ops]
+            self._local.journal = {}
+            try:
+                results = [self._apply_op(conn, op) for op in ops]
+                # 트랜잭션에서 바뀐 행의 변경 전/후 차이를 한 단계로 기록
+                after, versions = self._row_states(conn, self._local.journal)
+                changes = history_log.build_changes(self._local.journal, after, diff_patch, merge_patch)
+                history_log.record(conn, changes, versions, self.history_limit)
+            finally:
+                self._local.journal = None
+            return results
+
+    @staticmethod
+    def _row_states(conn: sqlite3.Connection, event_ids) -> tuple:
+        """
+        행별 현재 저장 형식과 버전
+
+        Returns:
+            ({이벤트 ID: 저장 형식 이벤트 또는 None}, {이벤트 ID: 버전 또는 None})
+        """
+        events, versions = {}, {}
+        for event_id in event_ids:
+            row = conn.execute("SELECT data, version FROM events WHERE id = ?", (event_id,)).fetchone()
+            events[event_id] = json.loads(row[0]) if row else None
+            versions[event_id] = row[1] if row else None
+        return events, versions
+
+    # --- 실행 취소 / 다시 실행 ---
+
+    def undo(self) -> Optional[Dict[str, Any]]:
+        """
+        가장 최근 변경 묶음 되돌리기 (모든 탭이 같은 기록을 공유)
+
+        Returns:
+            {'results': 연산별 결과, 'history': {'undo', 'redo'}} - 되돌릴 변경이 없으면 None
+
+        Raises:
+            EventNotFound, VersionConflict: 기록 뒤에 다른 경로(동기화, 전체 교체 등)로 바뀐 이벤트가 있음
+                                            (이 기록과 그 뒤 기록은 버려짐)
+        """
+        return self._step(history_log.UNDO)
+
+    def redo(self) -> Optional[Dict[str, Any]]:
+        """
+        가장 먼저 되돌린 변경 묶음 다시 적용 (undo 참고)
+
+        Returns:
+            {'results': 연산별 결과, 'history': {'undo', 'redo'}} - 다시 적용할 변경이 없으면 None
+        """
+        return self._step(history_log.REDO)
+
+    def _step(self, direction: str) -> Optional[Dict[str, Any]]:
+        """기록 하나를 direction 방향 연산으로 적용 (기록이 남긴 뒤 다른 경로로 바뀐 행이 있으면 충돌)"""
+        seq = None
+        try:
+            with self._transaction() as conn:
+                entry = history_log.next_entry(conn, direction)
+                if entry is None:
+                    return None
+                seq, changes = entry
+                ids = [change['id'] for change in changes]
+                _, current = self._row_states(conn, ids)
+                for event_id, expected in history_log.tracked_versions(conn, ids).items():
+                    if current[event_id] != expected:
+                        raise VersionConflict(event_id, expected, current[event_id])
+                results = [self._apply_op(conn, dict(change[direction])) for change in changes]
+                history_log.track(conn, self._row_states(conn, ids)[1])
+                history_log.mark(conn, seq, direction)
+                return {'results': results, 'history': history_log.state(conn)}
+        except (EventNotFound, VersionConflict):
+            if seq is not None:
+                with self._transaction() as conn:
+                    history_log.discard_from(conn, seq)
+            raise
+
+    def history_state(self) -> Dict[str, int]:
+        """실행 취소/다시 실행 가능한 단계 수 {'undo', 'redo'}"""
+        return history_log.state(self._conn())
+
+    def insert_events(self, events: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        여러 이벤트를 하나의 트랜잭션으로 추가 (일괄 가져오기용)
+        이미 있는 ID는 건너뛰므로 같은 묶음을 다시 넣어도 중복되지 않습니다.
+
+        Args:
+            events: 추가할 이벤트 목록 (ID 없으면 서버에서 부여)
+
+        Returns:
+            통계 (inserted, skipped)
+        """
+        stats = {'inserted': 0, 'skipped': 0}
+        if not events:
+            return stats
+
+        with self._transaction() as conn:
+            position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM events").fetchone()[0]
+            for event in events:
+                event = dict(event)
+                event_id = str(event.get('id') or uuid.uuid4().hex)
+                event['id'] = event_id
+                if conn.execute("SELECT 1 FROM events WHERE id = ?", (event_id,)).fetchone():
+                    stats['skipped'] += 1
+                    continue
+                self._write_row(conn, event_id, event, position, self._next_version(conn, event_id))
+                position += 1
+                stats['inserted'] += 1
+        return stats
+
+    def create_event(self, event: Dict[str, Any], history: bool = True) -> Dict[str, Any]:
+        """단일 이벤트 생성 (apply_ops 참고)"""
+        return self.apply_ops([{'op': 'create', 'event': event}], history)[0]
+
+    def patch_event(self, event_id: str, changes: Dict[str, Any],
+                    expected_version: Optional[int] = None, history: bool = True) -> Dict[str, Any]:
+        """단일 이벤트 부분 수정 - JSON Merge Patch (apply_ops 참고)"""
+        return self.apply_ops([{'op': 'patch', 'id': event_id, 'changes': changes,
+                                'version': expected_version}], history)[0]
+
+    def replace_event(self, event_id: str, event: Dict[str, Any],
+                      expected_version: Optional[int] = None, history: bool = True) -> Dict[str, Any]:
+        """단일 이벤트 전체 교체 (apply_ops 참고)"""
+        return self.apply_ops([{'op': 'replace', 'id': event_id, 'event': event,
+                                'version': expected_version}], history)[0]
+
+    def delete_event(self, event_id: str, expected_version: Optional[int] = None,
+                     history: bool = True) -> Dict[str, Any]:
+        """단일 이벤트 삭제 (apply_ops 참고)"""
+        return self.apply_ops([{'op': 'delete', 'id': event_id, 'version': expected_version}], history)[0]
+
+    def load(self, bodies: bool = True) -> Dict[str, Any]:
+        """
+        기존 db.json과 같은 형태로 전체 데이터 반환
+
+        Args:
+            bodies: 전체 본문 포함 여부 (False면 긴 본문은 참조와 미리보기만)
+        """
+        return {
+            "meeting_notes": self.get_meeting_notes(),
+            "events": self.list_events(bodies)
+        }
+
+    def changed_since(self, rev: int) -> tuple:
+        """
+        리비전 rev 이후에 바뀐 이벤트와 삭제된 이벤트 ID (외부 동기화용)
+
+        Args:
+            rev: 마지막으로 확인한 저장소 리비전
+
+        Returns:
+            (이벤트 목록, 삭제된 ID 목록)
+        """
+        conn = self._conn()
+        rows = conn.execute("SELECT data FROM events WHERE rev > ? ORDER BY rev", (rev,)).fetchall()
+        deleted = [row[0] for row in conn.execute("SELECT id FROM tombstones WHERE rev > ?", (rev,))]
+        return self._with_bodies(conn, [json.loads(row[0]) for row in rows]), deleted
+
+    def purge_tombstones(self, max_age: float = TOMBSTONE_RETENTION):
+        """보관 기간이 지난 삭제 기록 정리"""
+        with self._write_lock:
+            self._conn().execute("DELETE FROM tombstones WHERE at < ?", (time.time() - max_age,))
+
+    def purge_blobs(self, max_age: float = blob_store.BLOB_RETENTION) -> int:
+        """
+        참조가 끊긴 본문 블롭 정리 (삭제 후 실행 취소로 되살릴 수 있게 max_age 동안은 보관)
+        보관 기간이 지난 실행 취소 기록도 함께 정리합니다 (기록이 참조하는 블롭은 기록할 때 사용 시각을 갱신함).
+
+        Returns:
+            삭제한 블롭 수
+        """
+        with self._transaction() as conn:
+            history_log.purge_expired(conn, max_age)
+            return blob_store.purge_unreferenced(conn, max_age)
+
+    # --- 전문 검색 ---
+
+    def _rebuild_search_index(self, conn: sqlite3.Connection):
+        """검색 색인 전체 재생성 (트랜잭션 안에서 호출)"""
+        conn.execute("DELETE FROM events_fts")
+        for rowid, data in conn.execute("SELECT rowid, data FROM events").fetchall():
+            event = self._with_bodies(conn, [json.loads(data)])[0]
+            conn.execute(
+                "INSERT INTO events_fts (rowid, title, body, people, decisions) VALUES (?, ?, ?, ?, ?)",
+                (rowid,) + index_row(event)
+            )
+        conn.execute("INSERT INTO events_fts (events_fts) VALUES ('optimize')")
+
+    def rebuild_search_index(self):
+        """검색 색인 전체 재생성 (색인 방식이 바뀌었을 때)"""
+        with self._transaction() as conn:
+            self._rebuild_search_index(conn)
+
+    def search(self, query: str, start_ts: Optional[float] = None, end_ts: Optional[float] = None,
+               status: Optional[str] = None, source_id: Optional[str] = None,
+               kind: Optional[str] = None, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """
+        제목/본문/참석자/결정 사항 전문 검색 (최근 일치 항목 RANK_WINDOW개는 관련도 순, 그 뒤는 최신순)
+
+        Args:
+            query: 검색어 (공백으로 나뉜 단어를 모두 포함)
+            start_ts, end_ts: 이 구간과 겹치는 이벤트만 (epoch 초, 선택)
+            status: extendedProps.status 값 (선택)
+            source_id: 회의록 묶음 ID (선택)
+            kind: 'summary', 'task', 'meeting' 중 하나 (선택)
+            limit: 최대 결과 수
+            offset: 건너뛸 결과 수
+
+        Returns:
+            {'results': [{'id', 'version', 'score', 'snippet', 'event'}], 'has_more'}
+        """
+        match = build_match_query(query)
+        if match is None:
+            return {'results': [], 'has_more': False}
+
+        if kind and kind not in dict(EVENT_KINDS):
+            raise EventStoreError(f"알 수 없는 종류: {kind}")
+        # 회의록 묶음/기간은 인덱스로 후보 rowid 집합을 만들고, 상태/종류는 일치 행의 컬럼으로 확인
+        narrow, narrow_params = [], []
+        if start_ts is not None and end_ts is not None:
+            clause, clause_params = self._range_clause(start_ts, end_ts)
+            series_clause, series_params = self._series_clause(start_ts, end_ts)
+            narrow.append(f"(({clause}) OR ({series_clause}))")
+            narrow_params.extend(clause_params + series_params)
+        if source_id:
+            narrow.append("source_id = ?")
+            narrow_params.append(source_id)
+        checks, check_params = [], []
+        if status:
+            checks.append("events.status = ?")
+            check_params.append(status)
+        if kind:
+            checks.append("events.kind = ?")
+            check_params.append(kind)
+
+        conn = self._conn()
+        clauses = ["events_fts MATCH ?"]
+        params: List[Any] = [match]
+        if narrow:
+            # 후보 rowid 범위로 일치 목록을 훑는 구간 제한 (FTS5가 rowid 범위는 직접 처리)
+            where = ' AND '.join(narrow)
+            lowest, highest = conn.execute(
+                f"SELECT MIN(rowid), MAX(rowid) FROM events WHERE {where}", narrow_params
+            ).fetchone()
+            if lowest is None:
+                return {'results': [], 'has_more': False}
+            # rowid IN 앞의 +: 후보마다 색인을 찾으면 후보 하나마다 일치 검사를 다시 하므로 일치 목록을 훑으며 거름
+            clauses.append("events_fts.rowid BETWEEN ? AND ?")
+            clauses.append(f"+events_fts.rowid IN (SELECT rowid FROM events WHERE {where})")
+            params.extend([lowest, highest] + narrow_params)
+        if checks:
+            # 맞는 이벤트가 하나도 없으면 일치 목록을 끝까지 훑지 않도록 인덱스로 먼저 확인
+            exists = conn.execute(f"SELECT 1 FROM events WHERE {' AND '.join(checks)} LIMIT 1", check_params).fetchone()
+            if exists is None:
+                return {'results': [], 'has_more': False}
+            clauses.extend(checks)
+            params.extend(check_params)
+
+        # 일치 항목을 최신순(rowid 역순)으로 훑는 쿼리 - LIMIT만큼 찾으면 멈추므로 일치 항목 수와 관계없음
+        newest = (
+            "SELECT events_fts.rowid, events_fts.title, events_fts.body, events_fts.people, events_fts.decisions "
+            "FROM events_fts CROSS JOIN events ON events.rowid = events_fts.rowid "
+            f"WHERE {' AND '.join(clauses)} ORDER BY events_fts.rowid DESC LIMIT ? OFFSET ?"
+        )
+        patterns = term_patterns(query)
+        # 페이지 순서: 최근 일치 항목 RANK_WINDOW개를 관련도 순으로, 그 뒤는 최신순
+        # 어느 페이지를 요청해도 같은 순서 위에서 자르므로 페이지 간 중복/누락이 없음
+        ranked: List[tuple] = []
+        tail_offset = offset
+        if offset < RANK_WINDOW:
+            window = conn.execute(newest, params + [RANK_WINDOW, 0]).fetchall()
+            ranked = rank(window, patterns)[offset:offset + limit + 1]
+            tail_offset = RANK_WINDOW if len(window) == RANK_WINDOW else None
+        if tail_offset is not None and len(ranked) <= limit:
+            tail = conn.execute(newest, params + [limit + 1 - len(ranked), tail_offset]).fetchall()
+            ranked += sorted(rank(tail, patterns), key=lambda item: -item[0])
+
+        page = ranked[:limit]
+        rows = {}
+        if page:
+            rowids = [rowid for rowid, _ in page]
+            rows = {
+                row[0]: row[1:] for row in conn.execute(
+                    f"SELECT rowid, id, version, data FROM events WHERE rowid IN ({','.join('?' * len(rowids))})",
+                    rowids
+                )
+            }
+
+        stored = {rowid: json.loads(row[2]) for rowid, row in rows.items()}
+        full = dict(zip(stored, self._with_bodies(conn, list(stored.values()))))
+
+        results = []
+        for rowid, score in page:
+            if rowid not in rows:
+                continue
+            event_id, version, _ = rows[rowid]
+            # 스니펫은 전체 본문에서, 결과 이벤트는 참조 형식 그대로
+            event = stored[rowid]
+            title, body, people, decisions = search_document(full[rowid])
+            results.append({
+                'id': event_id,
+                'version': version,
+                'score': round(score, 4),
+                'snippet': snippet('\n'.join(t for t in (body, decisions, people) if t) or title, query),
+                'event': event,
+            })
+        return {'results': results, 'has_more': len(ranked) > limit}
+
+    # --- 증분 백업 지원 ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        일관된 시점의 전체 상태 (한 읽기 트랜잭션 안에서 조회)
+
+        Returns:
+            {'seq': 포함된 마지막 변경 번호, 'revision', 'meeting_notes', 'events': [{'position', 'version', 'event'}]}
+        """
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+            floor = conn.execute("SELECT value FROM meta WHERE key = 'changes_floor'").fetchone()
+            revision = conn.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+            notes = conn.execute("SELECT value FROM meta WHERE key = 'meeting_notes'").fetchone()
+            rows = conn.execute(
+                "SELECT position, version, data FROM events ORDER BY position, rowid"
+            ).fetchall()
+            # 스냅샷은 블롭 없이 복원할 수 있도록 전체 본문 포함
+            events = self._with_bodies(conn, [json.loads(row[2]) for row in rows])
+        finally:
+            conn.execute("COMMIT")
+        return {
+            'seq': max(seq, int(floor[0]) if floor else 0),
+            'revision': int(revision[0]) if revision else 0,
+            'meeting_notes': notes[0] if notes else '',
+            'events': [
+                {'position': row[0], 'version': row[1], 'event': event} for row, event in zip(rows, events)
+            ],
+        }
+
+    def changes_since(self, seq: int, limit: int = 10000) -> List[Dict[str, Any]]:
+        """
+        seq 이후의 변경 기록 (오래된 순)
+
+        Args:
+            seq: 이미 백업한 마지막 변경 번호
+            limit: 최대 개수
+
+        Returns:
+            [{'seq', 'rev', 'at', 'op', 'id', 'data'}]
+        """
+        rows = self._conn().execute(
+            "SELECT seq, rev, at, op, event_id, data FROM changes WHERE seq > ? ORDER BY seq LIMIT ?",
+            (seq, limit)
+        ).fetchall()
+        return [
+            {'seq': row[0], 'rev': row[1], 'at': row[2], 'op': row[3], 'id': row[4],
+             'data': json.loads(row[5]) if row[3] == CHANGE_UPSERT else row[5]}
+            for row in rows
+        ]
+
+    def truncate_changes(self, upto_seq: int):
+        """
+        백업에 옮겨진 변경 기록 삭제
+
+        Args:
+            upto_seq: 이 번호까지 삭제
+        """
+        with self._write_lock:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM changes WHERE seq <= ?", (upto_seq,))
+                # AUTOINCREMENT라 번호는 재사용되지 않지만, 전부 지워져도 기준점을 남겨 둠
+                self._set_meta(conn, 'changes_floor', str(upto_seq))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def restore_snapshot(self, state: Dict[str, Any]):
+        """
+        snapshot() 형식의 상태로 저장소 전체 교체 (복원용)
+
+        Args:
+            state: {'meeting_notes', 'events': [{'position', 'version', 'event'}]}
+        """
+        with self._transaction() as conn:
+            existing = dict(conn.execute("SELECT id, version FROM events").fetchall())
+            conn.execute("DELETE FROM events")
+            conn.execute("DELETE FROM events_fts")
+            restored = set()
+            for entry in state.get('events', []):
+                event = entry['event']
+                self._write_row(conn, str(event['id']), event, entry['position'], entry['version'])
+                restored.add(str(event['id']))
+            for event_id in existing.keys() - restored:
+                self._log_change(conn, CHANGE_DELETE, event_id, None, existing[event_id])
+            self._set_meta(conn, 'meeting_notes', state.get('meeting_notes') or '')
+            self._log_change(conn, CHANGE_NOTES, None, state.get('meeting_notes') or '')
+            # 복원한 상태와 맞지 않는 실행 취소 기록은 버림
+            history_log.clear(conn)
+
+    # --- 가져오기 / 내보내기 ---
+
+    def import_json(self, json_path: Path):
+        """
+        db.json 형식 파일을 저장소로 가져오기 (기존 이벤트는 교체됨)
+
+        Args:
+            json_path: 가져올 JSON 파일 경로
+        """
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.replace_events(data.get('events', []))
+        if 'meeting_notes' in data:
+            self.set_meeting_notes(data.get('meeting_notes') or '')
+
+    def export_json(self, json_path: Path):
+        """
+        저장소 내용을 db.json 형식 파일로 내보내기
+
+        Args:
+            json_path: 저장할 JSON 파일 경로
+        """
+        data = self.load()
+        tmp_path = Path(str(json_path) + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(json_path)
+
+    def migrate_from_json(self, json_path: Path) -> bool:
+        """
+        기존 db.json을 한 번만 가져오기 (이미 가져왔거나 파일이 없으면 무시)
+
+        Args:
+            json_path: 기존 db.json 경로
+
+        Returns:
+            마이그레이션 수행 여부
+        """
+        json_path = Path(json_path)
+        if self._get_meta('migrated_from_json') or not json_path.exists():
+            return False
+
+        try:
+            self.import_json(json_path)
+        except (OSError, ValueError) as e:
+            print(f"db.json 마이그레이션 실패: {e}")
+            return False
+
+        with self._transaction() as conn:
+            self._set_meta(conn, 'migrated_from_json', str(json_path))
+        print(f"db.json 마이그레이션 완료: {self.count_events()}개 이벤트")
+        return True
+
+
+def main():
+    """가져오기/내보내기 CLI (python src/event_store.py export|import <db.sqlite3> <db.json>)"""
+    if len(sys.argv) != 4 or sys.argv[1] not in ('import', 'export'):
+        print("사용법: python src/event_store.py export|import <db.sqlite3> <db.json>")
+        sys.exit(1)
+
+    command, db_path, json_path = sys.argv[1:]
+    store = EventStore(Path(db_path), timezone=os.getenv('TIMEZONE', DEFAULT_TIMEZONE))
+    if command == 'export':
+        store.export_json(Path(json_path))
+        print(f"내보내기 완료: {json_path} ({store.count_events()}개 이벤트)")
+    else:
+        store.import_json(Path(json_path))
+        print(f"가져오기 완료: {json_path} ({store.count_events()}개 이벤트)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+이벤트 본문 형식 모듈
+긴 본문(extendedProps.description)은 블롭 저장소로 옮기고 이벤트에는 해시(bodyRef), 길이(bodyLength), 미리보기만 남깁니다.
+저장소 행과 캘린더로 보내는 이벤트는 이 참조 형식이고, 전체 본문은 GET /api/events/<id>/body로 받아옵니다.
+최상위 description은 extendedProps.description과 중복이므로 저장하지 않습니다 (FullCalendar도 extendedProps로 옮김).
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from blob_store import content_hash
+
+
+# 참조 형식 표시 (extendedProps에 추가)
+BODY_REF = 'bodyRef'
+BODY_LENGTH = 'bodyLength'
+
+# 이 길이(글자)를 넘는 본문은 블롭으로 저장하고 미리보기만 보냄 (0이면 항상 이벤트에 그대로 저장)
+DEFAULT_LAZY_BODY_CHARS = 2000
+PREVIEW_CHARS = 280
+
+
+def preview(text: str, chars: int = PREVIEW_CHARS) -> str:
+    """
+    본문 미리보기 (줄/단어 경계에서 자르고 '…' 추가)
+
+    Args:
+        text: 전체 본문
+        chars: 최대 글자 수
+
+    Returns:
+        미리보기 문자열
+    """
+    if len(text) <= chars:
+        return text
+    cut = text[:chars]
+    boundary = max(cut.rfind('\n'), cut.rfind(' '))
+    if boundary >= chars // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + '…'
+
+
+def body_ref(event: Dict[str, Any]) -> Optional[str]:
+    """참조 형식 이벤트의 블롭 해시 (전체 본문을 가진 이벤트면 None)"""
+    ext = event.get('extendedProps')
+    if isinstance(ext, dict):
+        return ext.get(BODY_REF) or None
+    return None
+
+
+def attach_body(event: Dict[str, Any], body: Optional[str]) -> Dict[str, Any]:
+    """
+    참조 형식 이벤트에 전체 본문을 채워 넣기 (원본은 바꾸지 않음)
+
+    Args:
+        event: 이벤트
+        body: 전체 본문 (None이면 미리보기를 본문으로 두고 참조 표시만 제거)
+
+    Returns:
+        전체 본문을 가진 이벤트
+    """
+    ext = event.get('extendedProps')
+    if not isinstance(ext, dict) or (BODY_REF not in ext and BODY_LENGTH not in ext):
+        return event
+    ext = dict(ext)
+    ext.pop(BODY_REF, None)
+    ext.pop(BODY_LENGTH, None)
+    if body is not None:
+        ext['description'] = body
+    return dict(event, extendedProps=ext)
+
+
+def split_body(event: Dict[str, Any], lazy_body_chars: int = DEFAULT_LAZY_BODY_CHARS) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    전체 본문을 가진 이벤트를 저장 형식으로 나누기 (원본은 바꾸지 않음)
+
+    Args:
+        event: 전체 본문을 가진 이벤트
+        lazy_body_chars: 블롭으로 옮길 본문 길이 기준 (0이면 옮기지 않음)
+
+    Returns:
+        (저장할 이벤트, 블롭으로 저장할 본문 또는 None)
+    """
+    ext = event.get('extendedProps')
+    top = event.get('description')
+    if top is not None and (ext is None or isinstance(ext, dict) and ext.get('description') in (None, '', top)):
+        # 중복된 최상위 description은 extendedProps로 합침
+        event = dict(event)
+        ext = dict(ext or {}, description=event.pop('description'))
+        event['extendedProps'] = ext
+
+    description = ext.get('description') if isinstance(ext, dict) else None
+    if not lazy_body_chars or not isinstance(description, str) or len(description) <= lazy_body_chars:
+        return event, None
+
+    ext = dict(ext)
+    ext['description'] = preview(description)
+    ext[BODY_REF] = content_hash(description)
+    ext[BODY_LENGTH] = len(description)
+    return dict(event, extendedProps=ext), description
@@ -5,46 +5,41 @@ Google Gemini API를 사용한 회의록 분석 모듈
 
 import os
 import json
-from typing import Dict, List, Any
-from datetime import datetime
+import hashlib
+import threading
+from typing import Dict, List, Any, Optional, Iterator
+from datetime import datetime, timedelta
 import google.generativeai as genai
+from google.ai import generativelanguage as glm
+from google.api_core import exceptions as google_exceptions
+from google.api_core.client_options import ClientOptions
 import time
 
+import metrics
+from rate_limiter import estimate_tokens, backoff_delay
+from stream_parser import IncrementalJSONParser
+from analysis_schema import ANALYSIS_KEYS, ANALYSIS_SCHEMA, empty_value, salvage, sub_schema, validate
+from prompt_budget import compact_notes, new_usage, parse_model_tiers, pick_model, trim_to_budget
+from recurrence import normalize_rrule
 
-class GeminiAnalyzer:
-    """Gemini API를 사용해 회의록을 분석하는 클래스"""
-
-    def __init__(self, api_key: str):
-        """
-        Gemini Analyzer 초기화
 
-        Args:
-            api_key: Google Gemini API 키
-        """
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(
-            'gemini-2.5-flash',
-            generation_config={"temperature": 0.2}
-        )
-
-    def analyze_meeting_notes(self, text: str) -> Dict[str, Any]:
-        """
-        회의록 텍스트를 분석하여 구조화된 데이터를 반환
+# 모델 설정 (분석 캐시 키에도 사용됨)
+MODEL_NAME = 'gemini-2.5-flash'
+GENERATION_CONFIG = {"temperature": 0.2}
 
-        Args:
-            text: 분석할 회의록 텍스트
+# 프롬프트 템플릿 버전 - 프롬프트 내용을 바꾸면 올려서 기존 캐시를 무효화하세요
+PROMPT_VERSION = "4"
 
-        Returns:
-            분석 결과를 담은 딕셔너리
-        """
+# 회의록 입력 토큰 예산 기본값 (압축 후에도 넘으면 가운데를 잘라냄, 0이면 제한 없음)
+DEFAULT_TOKEN_BUDGET = 32000
 
-        prompt = f"""
-다음은 회의록 텍스트입니다. 이 텍스트를 분석하여 JSON 형식으로 정보를 추출해주세요.
+# 명시적 컨텍스트 캐시는 만료 이 시간(초) 전에 새로 만듦
+CONTEXT_CACHE_REFRESH_MARGIN = 60
 
-회의록:
-\"\"\"
-{text}
-\"\"\"
+# 분석 지시문 - 요청마다 같으므로 시스템 지시(system_instruction)로 보내서
+# 모델 쪽 프롬프트 캐시(암묵적/명시적 컨텍스트 캐시)를 탈 수 있게 회의록과 분리
+ANALYSIS_INSTRUCTIONS = """
+사용자 메시지로 회의록 텍스트와 오늘 날짜가 주어집니다. 이 텍스트를 분석하여 JSON 형식으로 정보를 추출해주세요.
 
 **중요한 요구사항 (Language Requirement)**:
 - **반드시 회의록 원본과 '동일한 언어'로 결과를 생성하세요.**
@@ -74,49 +69,55 @@ class GeminiAnalyzer:
     -   **정의**: "특정 시간에 사람들이 모이는 **이벤트(Event/Meeting)**"입니다.
     -   **절대 태스크를 여기에 넣지 마세요**: "보고서 제출 마감"은 태스크의 마감일이지, 일정(미팅)이 아닙니다.
     -   **포함 대상**: 주간 회의, 킥오프 미팅, 시연회, 워크샵, 점심 약속 등 **'장소'와 '시간'이 동반되는 약속**만 추출하세요.
+    -   **반복 일정(recurrence)**: "매주 월요일 오후 2시 주간 회의"처럼 되풀이되는 일정은 날짜별로 나열하지 말고 **항목 하나**로 추출하세요.
+        -   `date`에는 첫 발생 날짜, `recurrence`에는 RFC 5545 RRULE을 넣으세요.
+            (예: 매주 월요일 'FREQ=WEEKLY;BYDAY=MO', 격주 화/목 'FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH',
+            매월 마지막 금요일 'FREQ=MONTHLY;BYDAY=-1FR', 3월까지 'UNTIL=20260331', 4회만 'COUNT=4')
+        -   한 번뿐인 일정은 `recurrence`를 null로 두세요.
 
 다음 형식의 JSON으로 응답해주세요:
-{{
+{
     "meeting_title": "회의 제목을 다음 형식으로 생성: '회의주제/부서명/YY-MM-DD'. 원본 언어에 맞게 생성하세요.",
     "meeting_date": "회의록에서 추출한 실제 회의 날짜 (YYYY-MM-DD 형식). 회의록에 명시된 날짜를 사용하고, 없으면 오늘 날짜를 사용하세요.",
     "department_name": "회의에 참석한 주요 부서명. 회의록에서 추출하세요.",
     "summary": "위 요구사항에 맞춘 마크다운 형식의 상세 요약 텍스트 (원본 언어와 동일하게)",
     "completed_tasks": [
-        {{
+        {
             "title": "완료된 작업 제목",
             "description": "작업 상세 설명",
             "who": "담당자 (있으면)"
-        }}
+        }
     ],
     "todo_tasks": [
-        {{
+        {
             "title": "작업 제목 (예: '법규 검토 보고서 작성')",
             "description": "작업 상세 설명",
             "priority": "high/medium/low",
             "who": "담당자 (있으면)",
             "deadline": "마감일 (YYYY-MM-DD). 없으면 null",
             "context": "원문 문장"
-        }}
+        }
     ],
     "schedule_items": [
-        {{
+        {
             "title": "미팅 제목 (예: '2차 주간 회의', '디자인 시연회')",
             "description": "미팅 목적",
             "date": "YYYY-MM-DD",
             "time": "HH:MM",
             "duration_minutes": 60,
+            "recurrence": "반복 규칙 RRULE (예: 'FREQ=WEEKLY;BYDAY=MO'). 반복하지 않으면 null",
             "context": "원문 문장"
-        }}
+        }
     ],
     "important_dates": [
-        {{
+        {
             "date": "YYYY-MM-DD",
             "description": "날짜의 중요성"
-        }}
+        }
     ],
     "participants": ["참석자1", "참석자2"],
     "key_decisions": ["결정사항1", "결정사항2"]
-}}
+}
 
 주의사항:
 1. 정확한 JSON 형식으로만 응답해주세요 (다른 텍스트 없이)
@@ -128,35 +129,371 @@ class GeminiAnalyzer:
    - "다음주 중반" → 다음주 수요일 날짜
    - "금요일까지" → 다음 금요일 날짜
    - "~일 후" → 회의 날짜 기준 계산
-   - 오늘 날짜는 {datetime.now().strftime('%Y-%m-%d')}입니다. 이를 기준으로 계산하세요.
+   - 사용자 메시지의 '오늘 날짜'를 기준으로 계산하세요.
 """
 
-        max_retries = 3
-        retry_delay = 2
+# 속도 제한 토큰 추정 시 더할 응답 토큰 수
+OUTPUT_TOKEN_ESTIMATE = 2048
+
+metrics.describe('gemini_request_seconds', metrics.HISTOGRAM, 'Gemini 호출 소요 시간 (초, 스트리밍은 응답 끝까지)')
+metrics.describe('gemini_first_chunk_seconds', metrics.HISTOGRAM, 'Gemini 스트리밍 첫 응답 조각까지 걸린 시간 (초)')
+metrics.describe('gemini_rate_limit_wait_seconds', metrics.HISTOGRAM, '속도 제한 대기 시간 (초)')
+metrics.describe('gemini_retries_total', metrics.COUNTER, 'Gemini 호출 재시도 수')
+metrics.describe('gemini_errors_total', metrics.COUNTER, 'Gemini 호출 실패 수 (reason=rate_limit|json|api)')
+metrics.describe('gemini_prompt_bytes', metrics.HISTOGRAM, 'Gemini 프롬프트 크기 (바이트)', metrics.SIZE_BUCKETS)
+metrics.describe('gemini_response_bytes', metrics.HISTOGRAM, 'Gemini 응답 크기 (바이트)', metrics.SIZE_BUCKETS)
+metrics.describe('gemini_salvaged_total', metrics.COUNTER, '잘렸거나 깨진 응답에서 온전한 필드만 살린 횟수')
+metrics.describe('gemini_repairs_total', metrics.COUNTER, '빠진 필드만 다시 요청한 횟수 (outcome=ok|partial|failed)')
+metrics.describe('gemini_tokens_total', metrics.COUNTER, 'Gemini 토큰 사용량 (kind=prompt|cached|output)')
+metrics.describe('gemini_count_tokens_seconds', metrics.HISTOGRAM, 'count_tokens 호출 소요 시간 (초)')
+metrics.describe('prompt_compacted_chars_total', metrics.COUNTER, '회의록 압축으로 줄인 글자 수')
+metrics.describe('prompt_trimmed_total', metrics.COUNTER, '토큰 예산을 넘어 회의록 가운데를 잘라낸 횟수')
+
+
+def is_rate_limit_error(e: Exception) -> bool:
+    """429 / 할당량 초과 에러 여부"""
+    if isinstance(e, (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)):
+        return True
+    error_str = str(e)
+    return "429" in error_str or "Quota exceeded" in error_str or "ResourceExhausted" in error_str
+
+
+class GeminiAnalyzer:
+    """Gemini API를 사용해 회의록을 분석하는 클래스"""
+
+    def __init__(self, api_key: str, cache=None, rate_limiter=None, coalescer=None, client=None,
+                 structured_output: bool = True, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 model_tiers: Optional[str] = None, context_cache_ttl: int = 0):
+        """
+        Gemini Analyzer 초기화
+
+        Args:
+            api_key: Google Gemini API 키
+            cache: 분석 결과 캐시 (AnalysisCache, 선택)
+            rate_limiter: 전역 호출 속도 제한 (RateLimiter, 선택)
+            coalescer: 동일 프롬프트 동시 요청 합치기 (RequestCoalescer, 선택)
+            client: 이 키 전용 GenerativeServiceClient (선택, 없으면 genai.configure 전역 설정 사용)
+            structured_output: 분석 호출에 JSON 모드와 응답 스키마(ANALYSIS_SCHEMA) 사용 여부
+            token_budget: 회의록 입력 토큰 예산 (0이면 제한 없음)
+            model_tiers: 입력 크기별 모델 ('모델:최대 토큰,...,모델', 없으면 MODEL_NAME만 사용)
+            context_cache_ttl: 분석 지시문을 명시적 컨텍스트 캐시로 올려둘 시간 (초, 0이면 시스템 지시로만 전송)
+
+        Raises:
+            ValueError: model_tiers 형식이 잘못된 경우
+        """
+        if client is None:
+            genai.configure(api_key=api_key)
+        self._api_key = api_key
+        self._client = client
+        self.model_name = MODEL_NAME
+        self.structured_output = structured_output
+        self.token_budget = max(0, int(token_budget or 0))
+        self.model_tiers = parse_model_tiers(model_tiers, MODEL_NAME)
+        self.context_cache_ttl = max(0, int(context_cache_ttl or 0))
+        # 모델 기본값은 일반 텍스트 (요약 병합용), 분석 호출에만 구조화 출력 설정을 덧붙임
+        self.generation_config = dict(GENERATION_CONFIG)
+        self.analysis_config = self._analysis_config()
+        # 분석 결과를 바꾸는 설정은 모두 캐시 키에 포함
+        self.cache_config = dict(
+            self.analysis_config,
+            token_budget=self.token_budget,
+            model_tiers=[list(tier) for tier in self.model_tiers]
+        )
+        # 예산/모델 단계 경계 중 가장 작은 값 - 추정 토큰 수가 이보다 크면 count_tokens로 정확히 셈
+        limits = [limit for _, limit in self.model_tiers if limit is not None]
+        if self.token_budget:
+            limits.append(self.token_budget)
+        self._count_threshold = min(limits) if limits else None
+        self._instruction_tokens = estimate_tokens(ANALYSIS_INSTRUCTIONS)
+
+        # 일반 텍스트 모델 (요약 병합, 토큰 계산)
+        self.model = self._new_model(self.model_name)
+        # 분석용 모델 (모델 단계별, 지시문을 시스템 지시로)
+        self._analysis_models: Dict[str, Any] = {}
+        self._context_caches: Dict[str, Any] = {}
+        self._cache_client = None
+        self._models_lock = threading.Lock()
+
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.coalescer = coalescer
+
+    def _new_model(self, name: str, **kwargs):
+        """GenerativeModel 생성 (이 키 전용 클라이언트 연결)"""
+        model = genai.GenerativeModel(name, generation_config=self.generation_config, **kwargs)
+        if self._client is not None:
+            # GenerativeModel은 첫 호출 때 전역 기본 클라이언트를 잡으므로 미리 지정
+            model._client = self._client
+        return model
+
+    def _analysis_model(self, name: str):
+        """
+        분석용 모델 (명시적 컨텍스트 캐시를 쓸 수 있으면 캐시, 아니면 시스템 지시)
+
+        Args:
+            name: 모델 이름
+
+        Returns:
+            GenerativeModel
+        """
+        if self.context_cache_ttl:
+            model = self._context_cached_model(name)
+            if model is not None:
+                return model
+        with self._models_lock:
+            model = self._analysis_models.get(name)
+            if model is None:
+                model = self._new_model(name, system_instruction=ANALYSIS_INSTRUCTIONS)
+                self._analysis_models[name] = model
+            return model
+
+    def _context_cached_model(self, name: str):
+        """
+        분석 지시문을 명시적 컨텍스트 캐시에 올린 모델 (만료가 가까우면 새로 만듦)
+
+        Args:
+            name: 모델 이름
+
+        Returns:
+            GenerativeModel (캐시를 만들 수 없는 모델이면 None)
+        """
+        with self._models_lock:
+            entry = self._context_caches.get(name)
+            if entry is False:
+                return None
+            now = time.time()
+            if entry is not None and entry['expires_at'] - CONTEXT_CACHE_REFRESH_MARGIN > now:
+                return entry['model']
+            try:
+                if self._cache_client is None:
+                    self._cache_client = glm.CacheServiceClient(client_options=ClientOptions(api_key=self._api_key))
+                cached = self._cache_client.create_cached_content(cached_content=glm.CachedContent(
+                    model=f"models/{name}",
+                    system_instruction=glm.Content(parts=[glm.Part(text=ANALYSIS_INSTRUCTIONS)]),
+                    ttl=timedelta(seconds=self.context_cache_ttl)
+                ))
+            except Exception as e:
+                # 최소 토큰 수 미달, 지원하지 않는 모델 등 - 이 모델은 시스템 지시로만 보냄
+                print(f"컨텍스트 캐시 생성 실패 ({name}), 시스템 지시로 대신합니다: {e}")
+                self._context_caches[name] = False
+                return None
+            model = self._new_model(name)
+            # GenerativeModel.from_cached_content()는 전역 클라이언트로 캐시를 다시 조회하므로 이름만 지정
+            model._cached_content = cached.name
+            self._context_caches[name] = {'model': model, 'expires_at': now + self.context_cache_ttl}
+            return model
+
+    def _analysis_config(self, keys: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        분석 호출용 생성 설정
+
+        Args:
+            keys: 응답 스키마에 넣을 필드 (None이면 전체)
+
+        Returns:
+            generate_content(generation_config=...)에 넘길 설정
+        """
+        if not self.structured_output:
+            return dict(self.generation_config)
+        return dict(
+            self.generation_config,
+            response_mime_type='application/json',
+            response_schema=ANALYSIS_SCHEMA if keys is None else sub_schema(keys)
+        )
 
+    def _count_tokens(self, text: str) -> Optional[int]:
+        """실제 토큰 수 (count_tokens 실패 시 None)"""
         try:
-            for attempt in range(max_retries):
-                try:
-                    response = self.model.generate_content(prompt)
-                    result_text = response.text.strip()
+            with metrics.timer('gemini_count_tokens_seconds', span='count_tokens'):
+                return int(self.model.count_tokens(text).total_tokens)
+        except Exception as e:
+            print(f"토큰 수 계산 실패, 추정값을 사용합니다: {e}")
+            return None
+
+    def _plan(self, text: str, today: str) -> Dict[str, Any]:
+        """
+        요청 준비: 회의록 압축 → 토큰 계산 → 예산 적용 → 모델 단계 선택
+
+        Args:
+            text: 분석할 회의록 텍스트
+            today: 오늘 날짜 (YYYY-MM-DD)
 
-                    # JSON 코드 블록 제거 (```json ... ``` 형태)
-                    if result_text.startswith('```'):
-                        lines = result_text.split('\n')
-                        result_text = '\n'.join(lines[1:-1])
+        Returns:
+            {'prompt': 요청 본문, 'model': 모델 이름, 'usage': 토큰 사용량 (호출할 때마다 누적)}
+        """
+        notes, stats = compact_notes(text)
+        metrics.inc('prompt_compacted_chars_total', stats['original_chars'] - stats['compacted_chars'])
+
+        # 추정값은 넉넉하게 잡으므로 결정 경계를 넘을 때만 실제로 셈
+        tokens = estimate_tokens(notes)
+        counted = False
+        if self._count_threshold is not None and tokens > self._count_threshold:
+            counted_tokens = self._count_tokens(notes)
+            if counted_tokens is not None:
+                tokens, counted = counted_tokens, True
+
+        trimmed = False
+        if self.token_budget and tokens > self.token_budget:
+            print(f"회의록이 토큰 예산을 넘어 가운데를 잘라냅니다: {tokens} > {self.token_budget}")
+            metrics.inc('prompt_trimmed_total')
+            notes = trim_to_budget(notes, tokens, self.token_budget)
+            tokens = self.token_budget
+            trimmed = True
+
+        model_name = pick_model(self.model_tiers, tokens)
+        return {
+            'prompt': self._build_prompt(notes, today),
+            'model': model_name,
+            'usage': new_usage(
+                model_name,
+                notes_tokens=tokens,
+                tokens_counted=counted,
+                original_chars=stats['original_chars'],
+                compacted_chars=len(notes),
+                trimmed=trimmed
+            ),
+        }
+
+    def _build_prompt(self, text: str, today: str) -> str:
+        """
+        분석 요청 본문 생성 (지시문은 ANALYSIS_INSTRUCTIONS로 시스템 지시에 따로 보냄)
+
+        Args:
+            text: 분석할 회의록 텍스트
+            today: 상대 날짜 계산 기준이 되는 오늘 날짜 (YYYY-MM-DD)
+
+        Returns:
+            프롬프트 문자열
+        """
+        return f"""오늘 날짜: {today}
+
+회의록:
+\"\"\"
+{text}
+\"\"\"
+"""
 
-                    # JSON 파싱
-                    result = json.loads(result_text)
+    def analyze_meeting_notes(self, text: str) -> Dict[str, Any]:
+        """
+        회의록 텍스트를 분석하여 구조화된 데이터를 반환
 
-                    return result
+        Args:
+            text: 분석할 회의록 텍스트
+
+        Returns:
+            분석 결과를 담은 딕셔너리
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+
+        # 캐시 조회 (같은 회의록 재분석 방지)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(text, self.model_name, self.cache_config, PROMPT_VERSION)
+            cached = self.cache.get(cache_key, today)
+            if cached is not None:
+                return dict(cached, usage=new_usage(None, cache_hit=True))
+
+        plan = self._plan(text, today)
+
+        if self.coalescer is None:
+            return self._generate(plan, cache_key, today)
+
+        # 같은 프롬프트가 이미 처리 중이면 새로 호출하지 않고 그 결과를 함께 사용
+        # (다른 워커 프로세스가 처리 중이었으면 끝난 뒤 캐시에 저장된 결과 사용)
+        request_key = hashlib.sha256(
+            f"{plan['model']}\n{json.dumps(self.analysis_config, sort_keys=True)}\n{plan['prompt']}".encode('utf-8')
+        ).hexdigest()
+
+        def lookup():
+            cached = self.cache.get(cache_key, today)
+            return dict(cached, usage=new_usage(None, cache_hit=True)) if cached is not None else None
+
+        return self.coalescer.run(request_key, lambda: self._generate(plan, cache_key, today),
+                                  lookup if cache_key is not None else None)
+
+    def _record_usage(self, response, estimated_tokens: int, usage: Optional[Dict[str, Any]] = None):
+        """
+        응답의 실제 토큰 사용량 기록 (속도 제한 버킷 보정, 지표, 요청별 사용량)
+
+        Args:
+            response: generate_content() 응답
+            estimated_tokens: 호출 전에 속도 제한에서 차감한 추정 토큰 수
+            usage: 누적할 요청별 사용량 (new_usage() 형식, 선택)
+        """
+        metadata = getattr(response, 'usage_metadata', None)
+
+        def count(field):
+            return int(getattr(metadata, field, 0) or 0) if metadata is not None else 0
+
+        total = count('total_token_count')
+        if self.rate_limiter is not None and total:
+            self.rate_limiter.record_usage(estimated_tokens, total)
+
+        model = usage['model'] if usage is not None else self.model_name
+        counts = {
+            'prompt_tokens': count('prompt_token_count'),
+            'cached_tokens': count('cached_content_token_count'),
+            'output_tokens': count('candidates_token_count'),
+            'total_tokens': total,
+        }
+        for key in ('prompt', 'cached', 'output'):
+            if counts[f'{key}_tokens']:
+                metrics.inc('gemini_tokens_total', counts[f'{key}_tokens'], model=model, kind=key)
+        if usage is not None:
+            usage['calls'] += 1
+            for key, value in counts.items():
+                usage[key] += value
+
+    def _estimate_request_tokens(self, prompt: str, output_tokens: int = OUTPUT_TOKEN_ESTIMATE) -> int:
+        """속도 제한에 쓸 호출 토큰 추정치 (시스템 지시 포함, 캐시된 토큰도 TPM에는 들어감)"""
+        return self._instruction_tokens + estimate_tokens(prompt) + output_tokens
+
+    def _generate(self, plan: Dict[str, Any], cache_key: Optional[str], today: str) -> Dict[str, Any]:
+        """
+        Gemini 호출 + 재시도 + JSON 파싱 (빠진 필드는 한 번 더 요청)
+
+        Args:
+            plan: _plan() 결과 (요청 본문, 모델, 사용량)
+            cache_key: 결과를 저장할 캐시 키 (캐시 미사용 시 None)
+            today: 프롬프트에 사용한 오늘 날짜
+
+        Returns:
+            분석 결과를 담은 딕셔너리 (요청별 토큰 사용량 'usage' 포함)
+        """
+        max_retries = 3
+        prompt = plan['prompt']
+        estimated_tokens = self._estimate_request_tokens(prompt)
+
+        metrics.observe('gemini_prompt_bytes', len(prompt.encode('utf-8')), call='analyze')
+
+        try:
+            for attempt in range(max_retries):
+                try:
+                    # 전역 RPM/TPM 한도 안에서만 호출 (다른 워커와 공유)
+                    if self.rate_limiter is not None:
+                        with metrics.timer('gemini_rate_limit_wait_seconds', span='rate_limit'):
+                            self.rate_limiter.acquire(estimated_tokens)
+
+                    model = self._analysis_model(plan['model'])
+                    with metrics.timer('gemini_request_seconds', span='gemini', call='analyze'):
+                        response = model.generate_content(prompt, generation_config=self.analysis_config)
+                    self._record_usage(response, estimated_tokens, plan['usage'])
+                    result_text = self._response_text(response)
+                    metrics.observe('gemini_response_bytes', len(result_text.encode('utf-8')), call='analyze')
+                    return self._complete(plan, result_text, cache_key, today, call='analyze')
 
                 except Exception as e:
-                    error_str = str(e)
-                    if "429" in error_str or "Quota exceeded" in error_str or "ResourceExhausted" in error_str:
-                        print(f"Rate limit hit (Attempt {attempt + 1}/{max_retries}). Retrying in {retry_delay}s...")
+                    if is_rate_limit_error(e):
+                        retry_delay = backoff_delay(attempt)
+                        print(f"Rate limit hit (Attempt {attempt + 1}/{max_retries}). Retrying in {retry_delay:.1f}s...")
+                        metrics.inc('gemini_errors_total', call='analyze', reason='rate_limit')
+                        if self.rate_limiter is not None:
+                            # 모든 워커가 함께 물러나도록 공유 상태에 기록 (다음 acquire()에서 대기)
+                            self.rate_limiter.penalize(retry_delay)
                         if attempt < max_retries - 1:
-                            time.sleep(retry_delay)
-                            retry_delay *= 2  # Exponential backoff
+                            metrics.inc('gemini_retries_total', call='analyze')
+                            if self.rate_limiter is None:
+                                time.sleep(retry_delay)
                             continue
                         else:
                              return {
@@ -167,26 +504,15 @@ class GeminiAnalyzer:
                                 "important_dates": [],
                                 "participants": [],
                                 "key_decisions": [],
-                                "error": "Rate Limit Exceeded"
+                                "error": "Rate Limit Exceeded",
+                                "usage": plan['usage']
                             }
-                    elif isinstance(e, json.JSONDecodeError):
-                         print(f"JSON 파싱 에러: {e}")
-                         # ... (fall through to normal error handling or return here)
-                         return {
-                            "summary": "분석 실패: JSON 파싱 오류",
-                            "completed_tasks": [],
-                            "todo_tasks": [],
-                            "schedule_items": [],
-                            "important_dates": [],
-                            "participants": [],
-                            "key_decisions": [],
-                            "raw_response": response.text if 'response' in locals() else ""
-                        }
                     else:
                         raise e
         
         except Exception as e:
             print(f"분석 중 에러 발생: {e}")
+            metrics.inc('gemini_errors_total', call='analyze', reason='api')
             return {
                 "summary": f"분석 실패: {str(e)}",
                 "completed_tasks": [],
@@ -195,9 +521,313 @@ class GeminiAnalyzer:
                 "important_dates": [],
                 "participants": [],
                 "key_decisions": [],
-                "error": str(e)
+                "error": str(e),
+                "usage": plan['usage']
             }
 
+    @staticmethod
+    def _response_text(response) -> str:
+        """응답 텍스트 (차단/빈 응답이면 빈 문자열)"""
+        try:
+            return (response.text or '').strip()
+        except ValueError:
+            return ''
+
+    def _salvage(self, result_text: str, call: str) -> tuple:
+        """
+        응답 파싱 + 스키마 검사 (잘렸거나 깨진 응답은 온전한 필드만 살림)
+
+        Args:
+            result_text: 모델 응답 원문
+            call: 지표 라벨 ('analyze' 또는 'stream')
+
+        Returns:
+            (스키마에 맞는 필드, 다시 요청할 필드 목록)
+        """
+        fields, truncated = salvage(result_text)
+        result, missing = validate(fields)
+        missing += [key for key in truncated if key not in missing]
+        if missing:
+            metrics.inc('gemini_errors_total', call=call, reason='json')
+            if result:
+                metrics.inc('gemini_salvaged_total', call=call)
+            print(f"JSON 응답 불완전: {len(result)}개 필드 사용, 다시 요청할 필드 {missing}")
+        return result, missing
+
+    def _build_repair_prompt(self, prompt: str, keys: List[str]) -> str:
+        """빠진 필드만 다시 요청하는 프롬프트 (원래 프롬프트 + 필드 목록)"""
+        return prompt + f"""
+이전 응답이 중간에 끊겨 다음 항목을 받지 못했습니다: {', '.join(keys)}
+위 요구사항을 그대로 따르되, **이 항목들만** 담은 JSON 객체로 응답해주세요 (다른 항목은 다시 보내지 마세요).
+"""
+
+    def _repair(self, plan: Dict[str, Any], result: Dict[str, Any], missing: List[str], call: str) -> List[str]:
+        """
+        빠진 필드만 다시 요청해서 result에 채우기 (전체 프롬프트 재실행 대신 응답 토큰만 절약)
+
+        Args:
+            plan: _plan() 결과 (요청 본문, 모델, 사용량)
+            result: 첫 응답에서 살린 필드 (제자리에서 갱신)
+            missing: 다시 요청할 필드
+            call: 지표 라벨
+
+        Returns:
+            다시 요청한 뒤에도 받지 못한 필드 목록
+        """
+        repair_prompt = self._build_repair_prompt(plan['prompt'], missing)
+        # 응답 크기는 요청한 필드 비율만큼만 예상
+        estimated_tokens = self._estimate_request_tokens(
+            repair_prompt, max(256, OUTPUT_TOKEN_ESTIMATE * len(missing) // len(ANALYSIS_KEYS))
+        )
+        try:
+            if self.rate_limiter is not None:
+                with metrics.timer('gemini_rate_limit_wait_seconds', span='rate_limit'):
+                    self.rate_limiter.acquire(estimated_tokens)
+            model = self._analysis_model(plan['model'])
+            with metrics.timer('gemini_request_seconds', span='gemini', call='repair'):
+                response = model.generate_content(repair_prompt, generation_config=self._analysis_config(missing))
+            self._record_usage(response, estimated_tokens, plan['usage'])
+        except Exception as e:
+            rate_limited = is_rate_limit_error(e)
+            metrics.inc('gemini_errors_total', call='repair', reason='rate_limit' if rate_limited else 'api')
+            metrics.inc('gemini_repairs_total', call=call, outcome='failed')
+            if rate_limited and self.rate_limiter is not None:
+                self.rate_limiter.penalize(backoff_delay(0))
+            print(f"빠진 필드 재요청 실패: {e}")
+            return missing
+
+        result_text = self._response_text(response)
+        metrics.observe('gemini_response_bytes', len(result_text.encode('utf-8')), call='repair')
+        fields, truncated = salvage(result_text)
+        repaired, _ = validate(fields)
+
+        still_missing = []
+        for key in missing:
+            if key not in repaired:
+                still_missing.append(key)
+                continue
+            if key in truncated:
+                # 다시 받은 배열도 잘렸으면 항목이 더 많은 쪽을 남김
+                still_missing.append(key)
+                if len(repaired[key]) <= len(result.get(key) or []):
+                    continue
+            result[key] = repaired[key]
+
+        outcome = 'ok' if not still_missing else ('partial' if len(still_missing) < len(missing) else 'failed')
+        metrics.inc('gemini_repairs_total', call=call, outcome=outcome)
+        return still_missing
+
+    def _finish(self, result: Dict[str, Any], missing: List[str], raw_response: str) -> Dict[str, Any]:
+        """
+        끝내 받지 못한 필드를 기본값으로 채우기
+
+        Args:
+            result: 스키마에 맞는 필드
+            missing: 받지 못한 필드
+            raw_response: 첫 응답 원문 (아무 필드도 살리지 못했을 때 결과에 포함)
+
+        Returns:
+            분석 결과 (일부가 빠졌으면 'incomplete_fields' 포함)
+        """
+        if len(missing) == len(ANALYSIS_KEYS):
+            return {
+                "summary": "분석 실패: JSON 파싱 오류",
+                "completed_tasks": [],
+                "todo_tasks": [],
+                "schedule_items": [],
+                "important_dates": [],
+                "participants": [],
+                "key_decisions": [],
+                "raw_response": raw_response
+            }
+        for key in missing:
+            result.setdefault(key, empty_value(key))
+        if missing:
+            result['incomplete_fields'] = missing
+        self._normalize_recurrence(result.get('schedule_items') or [])
+        return result
+
+    @staticmethod
+    def _normalize_recurrence(items: List[Dict[str, Any]]):
+        """일정의 반복 규칙 정규화 (해석할 수 없는 규칙은 버리고 한 번뿐인 일정으로)"""
+        for item in items:
+            if not item.get('recurrence'):
+                continue
+            try:
+                item['recurrence'] = normalize_rrule(item['recurrence'])
+            except ValueError as e:
+                print(f"⚠️  반복 규칙을 해석할 수 없어 버림: {item.get('title')} ({e})")
+                item['recurrence'] = None
+
+    def _complete(self, plan: Dict[str, Any], result_text: str, cache_key: Optional[str], today: str,
+                  call: str) -> Dict[str, Any]:
+        """
+        응답 원문 → 최종 분석 결과 (살리기 + 빠진 필드 재요청 + 캐시 저장)
+
+        Args:
+            plan: _plan() 결과 (요청 본문, 모델, 사용량)
+            result_text: 모델 응답 원문
+            cache_key: 결과를 저장할 캐시 키 (캐시 미사용 시 None)
+            today: 프롬프트에 사용한 오늘 날짜
+            call: 지표 라벨
+
+        Returns:
+            분석 결과를 담은 딕셔너리
+        """
+        result, missing = self._salvage(result_text, call)
+        if missing:
+            missing = self._repair(plan, result, missing, call)
+        result = self._finish(result, missing, result_text)
+        # 빠진 필드가 있는 결과는 캐시하지 않음 (다음 요청에서 다시 분석)
+        if cache_key is not None and not missing:
+            self.cache.put(cache_key, today, result)
+        self._report_usage(plan['usage'])
+        return dict(result, usage=plan['usage'])
+
+    @staticmethod
+    def _report_usage(usage: Dict[str, Any]):
+        """요청별 토큰 사용량 로그"""
+        print(
+            f"토큰 사용량 [{usage['model']}]: 입력 {usage['prompt_tokens']} (캐시 {usage['cached_tokens']}), "
+            f"출력 {usage['output_tokens']}, 호출 {usage['calls']}회"
+            + (" - 토큰 예산 초과로 회의록 일부 생략" if usage.get('trimmed') else '')
+        )
+
+    def combine_summaries(self, summaries: List[str]) -> Optional[str]:
+        """
+        긴 회의록 조각별 요약을 하나의 요약으로 합치기 (분할 분석의 reduce 단계)
+
+        Args:
+            summaries: 원문 순서대로 정렬된 조각 요약 목록
+
+        Returns:
+            합친 마크다운 요약 (실패 시 None)
+        """
+        parts = "\n\n".join(f"--- 부분 {i}/{len(summaries)} ---\n{s}" for i, s in enumerate(summaries, 1))
+        prompt = f"""
+다음은 하나의 긴 회의록을 여러 부분으로 나눠 각각 요약한 결과입니다.
+중복되는 내용(회의록 개요, 참석자, 같은 안건)은 한 번만 남기고, 안건은 원문 순서를 유지해서
+하나의 요약으로 합쳐주세요. 각 부분 요약과 같은 'Notion 스타일' 마크다운 구조와 같은 언어를 사용하세요.
+마크다운 요약 본문만 응답해주세요 (다른 텍스트 없이).
+
+{parts}
+"""
+        estimated_tokens = estimate_tokens(prompt) + OUTPUT_TOKEN_ESTIMATE
+        metrics.observe('gemini_prompt_bytes', len(prompt.encode('utf-8')), call='combine')
+        try:
+            if self.rate_limiter is not None:
+                with metrics.timer('gemini_rate_limit_wait_seconds', span='rate_limit'):
+                    self.rate_limiter.acquire(estimated_tokens)
+            with metrics.timer('gemini_request_seconds', span='gemini', call='combine'):
+                response = self.model.generate_content(prompt)
+            self._record_usage(response, estimated_tokens)
+            return response.text.strip() or None
+        except Exception as e:
+            rate_limited = is_rate_limit_error(e)
+            metrics.inc('gemini_errors_total', call='combine', reason='rate_limit' if rate_limited else 'api')
+            if rate_limited and self.rate_limiter is not None:
+                self.rate_limiter.penalize(backoff_delay(0))
+            print(f"요약 병합 중 에러 발생: {e}")
+            return None
+
+    def analyze_meeting_notes_stream(self, text: str) -> Iterator[Dict[str, Any]]:
+        """
+        회의록 분석 (스트리밍)
+        응답을 받는 대로 파싱해서 완성된 필드와 배열 항목을 바로 넘겨줍니다.
+
+        Args:
+            text: 분석할 회의록 텍스트
+
+        Yields:
+            {'type': 'field', 'key', 'value'} / {'type': 'item', 'key', 'index', 'value'}
+            마지막으로 {'type': 'done', 'analysis': 전체 결과} 또는 {'type': 'error', 'error', 'partial'}
+            응답이 끊기거나 일부가 깨지면 빠진 필드만 다시 요청해서 'field' 이벤트로 보낸 뒤 'done'을 보냅니다.
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(text, self.model_name, self.cache_config, PROMPT_VERSION)
+            cached = self.cache.get(cache_key, today)
+            if cached is not None:
+                for key, value in cached.items():
+                    yield {'type': 'field', 'key': key, 'value': value}
+                yield {'type': 'done', 'analysis': dict(cached, usage=new_usage(None, cache_hit=True))}
+                return
+
+        plan = self._plan(text, today)
+        prompt = plan['prompt']
+        estimated_tokens = self._estimate_request_tokens(prompt)
+        max_retries = 3
+        metrics.observe('gemini_prompt_bytes', len(prompt.encode('utf-8')), call='stream')
+
+        for attempt in range(max_retries):
+            parser = IncrementalJSONParser()
+            started = False
+            try:
+                if self.rate_limiter is not None:
+                    with metrics.timer('gemini_rate_limit_wait_seconds', span='rate_limit'):
+                        self.rate_limiter.acquire(estimated_tokens)
+
+                model = self._analysis_model(plan['model'])
+                request_start = time.perf_counter()
+                response = model.generate_content(prompt, generation_config=self.analysis_config, stream=True)
+                for chunk in response:
+                    try:
+                        chunk_text = chunk.text
+                    except ValueError:
+                        # 텍스트 없는 조각 (종료 신호 등)
+                        continue
+                    if not started:
+                        metrics.observe('gemini_first_chunk_seconds', time.perf_counter() - request_start)
+                    started = True
+                    for event in parser.feed(chunk_text):
+                        yield event
+                metrics.observe('gemini_request_seconds', time.perf_counter() - request_start, call='stream')
+                self._record_usage(response, estimated_tokens, plan['usage'])
+                break
+
+            except Exception as e:
+                # 아직 아무것도 보내지 않았을 때만 재시도
+                rate_limited = is_rate_limit_error(e)
+                metrics.inc('gemini_errors_total', call='stream', reason='rate_limit' if rate_limited else 'api')
+                if rate_limited and not started and attempt < max_retries - 1:
+                    metrics.inc('gemini_retries_total', call='stream')
+                    retry_delay = backoff_delay(attempt)
+                    print(f"Rate limit hit (Attempt {attempt + 1}/{max_retries}). Retrying in {retry_delay:.1f}s...")
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.penalize(retry_delay)
+                    else:
+                        time.sleep(retry_delay)
+                    continue
+                print(f"스트리밍 분석 중 에러 발생: {e}")
+                if not started:
+                    yield {'type': 'error', 'error': str(e), 'partial': parser.fields}
+                    return
+                # 이미 받은 부분은 살리고 나머지만 다시 요청
+                break
+
+        result_text = parser.buffer.strip()
+        metrics.observe('gemini_response_bytes', len(result_text.encode('utf-8')), call='stream')
+
+        result, missing = self._salvage(result_text, 'stream')
+        if missing:
+            requested = list(missing)
+            missing = self._repair(plan, result, missing, 'stream')
+            for key in requested:
+                if key in result and key not in missing:
+                    yield {'type': 'field', 'key': key, 'value': result[key]}
+
+        result = self._finish(result, missing, result_text)
+        if 'raw_response' in result:
+            yield {'type': 'error', 'error': "JSON 파싱 오류", 'partial': parser.fields}
+            return
+
+        if cache_key is not None and not missing:
+            self.cache.put(cache_key, today, result)
+        self._report_usage(plan['usage'])
+        yield {'type': 'done', 'analysis': dict(result, usage=plan['usage'])}
+
     def create_smart_summary(self, analysis_result: Dict[str, Any]) -> str:
         """
         분석 결과를 사람이 읽기 쉬운 형식으로 정리
@@ -271,7 +901,8 @@ class GeminiAnalyzer:
                         date_time += f" {item['time']}"
                     date_time += "]"
                 duration = f" ({item['duration_minutes']}분)" if item.get('duration_minutes') else ""
-                summary_parts.append(f"  - {item['title']}{date_time}{duration}")
+                repeat = f" 🔁 {item['recurrence']}" if item.get('recurrence') else ""
+                summary_parts.append(f"  - {item['title']}{date_time}{duration}{repeat}")
                 if item.get('description'):
                     summary_parts.append(f"    → {item['description']}")
             summary_parts.append("")
@@ -0,0 +1,181 @@
+"""
+실행 취소/다시 실행 기록 모듈
+변경 연산 묶음(apply_ops 한 번)마다 바뀐 이벤트 행의 차이만 이벤트 저장소 DB의 history 테이블에 기록합니다.
+수정은 양방향 JSON Merge Patch, 생성/삭제는 저장 형식(긴 본문은 블롭 참조) 이벤트 하나만 담으므로
+캘린더 크기와 관계없이 바뀐 만큼만 저장됩니다.
+기록은 DB에 있으므로 탭/새로 고침/워커 프로세스와 관계없이 공유되고, 개수와 기간으로 보관량을 제한합니다.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import blob_store
+from event_wire import body_ref
+
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    at REAL NOT NULL,
+    changes TEXT NOT NULL,
+    undone INTEGER NOT NULL DEFAULT 0
+);
+
+-- 기록이 마지막으로 남긴 행 버전 (실행 취소 전에 다른 경로로 바뀐 행인지 확인, 행이 없으면 NULL)
+CREATE TABLE IF NOT EXISTS history_rows (
+    id TEXT PRIMARY KEY,
+    version INTEGER
+);
+"""
+
+# 보관할 최대 기록 수 (실행 취소 가능한 단계)
+DEFAULT_HISTORY_LIMIT = 100
+
+# 기록 보관 기간 (초) - 삭제한 이벤트의 본문 블롭 보관 기간과 같음
+HISTORY_RETENTION = blob_store.BLOB_RETENTION
+
+UNDO = 'undo'
+REDO = 'redo'
+
+
+def build_changes(before: Dict[str, Optional[Dict[str, Any]]], after: Dict[str, Optional[Dict[str, Any]]],
+                  diff: Callable, merge: Callable) -> List[Dict[str, Any]]:
+    """
+    행별 변경 전/후 상태로 기록 항목 만들기
+
+    Args:
+        before: {이벤트 ID: 변경 전 저장 형식 이벤트 (없던 행이면 None)}
+        after: {이벤트 ID: 변경 후 저장 형식 이벤트 (삭제됐으면 None)}
+        diff: 패치 계산 함수 (event_store.diff_patch)
+        merge: 패치 적용 함수 (event_store.merge_patch)
+
+    Returns:
+        [{'id', 'undo': 연산, 'redo': 연산}] - 바뀌지 않은 행은 빠짐
+    """
+    changes = []
+    for event_id, old in before.items():
+        new = after[event_id]
+        if old == new:
+            continue
+        if old is None:
+            undo = {'op': 'delete', 'id': event_id}
+            redo = {'op': 'create', 'event': new}
+        elif new is None:
+            undo = {'op': 'create', 'event': old}
+            redo = {'op': 'delete', 'id': event_id}
+        else:
+            undo = {'op': 'patch', 'id': event_id, 'changes': diff(new, old)}
+            redo = {'op': 'patch', 'id': event_id, 'changes': diff(old, new)}
+            # 값이 null인 키처럼 Merge Patch로 표현할 수 없는 차이는 전체 교체로 기록
+            if merge(new, undo['changes']) != old or merge(old, redo['changes']) != new:
+                undo = {'op': 'replace', 'id': event_id, 'event': old}
+                redo = {'op': 'replace', 'id': event_id, 'event': new}
+        changes.append({'id': event_id, 'undo': undo, 'redo': redo})
+    return changes
+
+
+def record(conn: sqlite3.Connection, changes: List[Dict[str, Any]], versions: Dict[str, Optional[int]],
+           limit: int = DEFAULT_HISTORY_LIMIT):
+    """
+    기록 추가 (쓰기 트랜잭션 안에서 호출)
+    새 변경이 생기면 다시 실행할 기록은 버리고, limit을 넘는 오래된 기록은 삭제합니다.
+
+    Args:
+        conn: 저장소 커넥션
+        changes: build_changes() 결과 (비어 있으면 기록하지 않음)
+        versions: {이벤트 ID: 변경 후 버전 (삭제됐으면 None)}
+        limit: 보관할 최대 기록 수 (0이면 기록하지 않음)
+    """
+    if not changes or limit <= 0:
+        return
+    track(conn, versions)
+    conn.execute("DELETE FROM history WHERE undone = 1")
+    conn.execute(
+        "INSERT INTO history (at, changes) VALUES (?, ?)",
+        (time.time(), json.dumps(changes, ensure_ascii=False, sort_keys=True))
+    )
+    conn.execute(
+        "DELETE FROM history WHERE seq <= (SELECT MAX(seq) FROM history) - ?", (limit,)
+    )
+    # 되살릴 수 있는 동안 참조한 본문 블롭이 정리되지 않도록 사용 시각 갱신
+    refs = {
+        body_ref(change[side]['event']) for change in changes for side in (UNDO, REDO)
+        if change[side].get('event') is not None
+    }
+    refs.discard(None)
+    if refs:
+        blob_store.touch(conn, refs)
+
+
+def track(conn: sqlite3.Connection, versions: Dict[str, Optional[int]]):
+    """기록이 남긴 행 버전 갱신 (기록 추가/실행 취소/다시 실행 뒤에 호출)"""
+    conn.executemany(
+        "INSERT OR REPLACE INTO history_rows (id, version) VALUES (?, ?)", list(versions.items())
+    )
+
+
+def tracked_versions(conn: sqlite3.Connection, ids: Iterable[str]) -> Dict[str, Optional[int]]:
+    """
+    기록이 마지막으로 남긴 행 버전
+
+    Returns:
+        {이벤트 ID: 버전 (행이 없던 상태면 None)} - 기록한 적 없는 ID는 빠짐
+    """
+    return {
+        event_id: row[0]
+        for event_id in set(ids)
+        for row in conn.execute("SELECT version FROM history_rows WHERE id = ?", (event_id,))
+    }
+
+
+def next_entry(conn: sqlite3.Connection, direction: str) -> Optional[tuple]:
+    """
+    다음에 실행 취소(가장 최근 기록) 또는 다시 실행(가장 먼저 취소한 기록)할 기록
+
+    Returns:
+        (seq, changes) - 없으면 None
+    """
+    if direction == UNDO:
+        row = conn.execute("SELECT seq, changes FROM history WHERE undone = 0 ORDER BY seq DESC LIMIT 1").fetchone()
+    else:
+        row = conn.execute("SELECT seq, changes FROM history WHERE undone = 1 ORDER BY seq LIMIT 1").fetchone()
+    return (row[0], json.loads(row[1])) if row else None
+
+
+def mark(conn: sqlite3.Connection, seq: int, direction: str):
+    """실행 취소/다시 실행한 기록 표시"""
+    conn.execute("UPDATE history SET undone = ? WHERE seq = ?", (1 if direction == UNDO else 0, seq))
+
+
+def discard_from(conn: sqlite3.Connection, seq: int):
+    """seq 이후 기록 삭제 (다른 변경과 충돌해 더 이상 적용할 수 없는 기록과 그 뒤 기록)"""
+    conn.execute("DELETE FROM history WHERE seq >= ?", (seq,))
+
+
+def state(conn: sqlite3.Connection) -> Dict[str, int]:
+    """실행 취소/다시 실행 가능한 단계 수 {'undo', 'redo'}"""
+    undo, redo = conn.execute(
+        "SELECT COALESCE(SUM(undone = 0), 0), COALESCE(SUM(undone = 1), 0) FROM history"
+    ).fetchone()
+    return {'undo': undo, 'redo': redo}
+
+
+def purge_expired(conn: sqlite3.Connection, max_age: float = HISTORY_RETENTION) -> int:
+    """
+    보관 기간이 지난 기록 삭제 (쓰기 트랜잭션 안에서 호출)
+
+    Returns:
+        삭제한 기록 수
+    """
+    removed = conn.execute("DELETE FROM history WHERE at < ?", (time.time() - max_age,)).rowcount
+    if not conn.execute("SELECT 1 FROM history LIMIT 1").fetchone():
+        conn.execute("DELETE FROM history_rows")
+    return removed
+
+
+def clear(conn: sqlite3.Connection):
+    """전체 기록 삭제 (저장소 전체를 교체한 뒤처럼 기록과 현재 상태가 맞지 않을 때)"""
+    conn.execute("DELETE FROM history")
+    conn.execute("DELETE FROM history_rows")
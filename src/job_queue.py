@@ -0,0 +1,404 @@
+"""
+비동기 분석 작업 큐 모듈
+분석 요청을 SQLite에 저장하고 제한된 수의 워커 스레드가 처리합니다.
+서버가 재시작되어도 대기/실행 중이던 작업은 다시 처리됩니다.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    user TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    progress TEXT,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_user_status ON jobs (user, status);
+"""
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED_STATUSES = (DONE, FAILED)
+
+
+class JobLimitExceeded(Exception):
+    """사용자별 대기 작업 수 초과"""
+
+
+def _pid_alive(pid: int) -> bool:
+    """프로세스 생존 여부 확인"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _process_start(pid: int) -> str:
+    """
+    프로세스 시작 식별값 (부팅 ID + 부팅 후 시작 시각, /proc이 없으면 빈 문자열)
+    컨테이너 재시작 등으로 PID가 재사용되어도 다른 프로세스면 값이 달라집니다.
+    """
+    try:
+        boot_id = Path('/proc/sys/kernel/random/boot_id').read_text().strip()
+        stat = Path(f'/proc/{pid}/stat').read_text()
+    except OSError:
+        return ''
+    # 두 번째 필드(실행 파일 이름)에 공백/괄호가 있을 수 있으므로 마지막 ')' 뒤에서 센다 (22번째 필드: starttime)
+    return f"{boot_id}-{stat.rsplit(')', 1)[1].split()[19]}"
+
+
+def _new_worker_id() -> str:
+    """이 프로세스의 워커 ID ('PID:시작 식별값:임의값')"""
+    pid = os.getpid()
+    return f"{pid}:{_process_start(pid)}:{uuid.uuid4().hex[:8]}"
+
+
+def _worker_alive(worker: Optional[str]) -> bool:
+    """
+    워커 ID의 프로세스가 아직 살아 있는지 확인 (PID + 시작 식별값 비교)
+    시작 식별값이 없는 ID는 /proc이 없는 환경에서 만든 것이므로 PID 생존만 확인하고,
+    PID만 있는 이전 형식 ID는 재사용된 PID와 구분할 수 없어 종료된 것으로 봅니다.
+    """
+    parts = (worker or '').split(':')
+    if len(parts) != 3 or not parts[0].isdigit():
+        return False
+    pid, start = int(parts[0]), parts[1]
+    if not _pid_alive(pid):
+        return False
+    return not start or _process_start(pid) == start
+
+
+class JobQueue:
+    """SQLite 영속 작업 큐 + 워커 스레드 풀"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_workers: int = 2,
+        per_user_limit: int = 1,
+        max_pending_per_user: int = 20,
+        poll_interval: float = 1.0,
+        retention_seconds: int = 7 * 86400
+    ):
+        """
+        JobQueue 초기화
+
+        Args:
+            db_path: 작업 SQLite 파일 경로
+            max_workers: 동시에 실행할 최대 작업 수 (워커 스레드 수)
+            per_user_limit: 사용자별 동시 실행 작업 수 제한
+            max_pending_per_user: 사용자별 대기+실행 작업 수 제한 (초과 시 제출 거부)
+            poll_interval: 다른 프로세스가 넣은 작업 확인 주기 (초)
+            retention_seconds: 완료된 작업 보관 기간 (초)
+        """
+        self.db_path = Path(db_path)
+        self.max_workers = max_workers
+        self.per_user_limit = per_user_limit
+        self.max_pending_per_user = max_pending_per_user
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.worker_id = _new_worker_id()
+
+        self._handlers: Dict[str, Callable] = {}
+        self._local = threading.local()
+        self._claim_lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._stopping = False
+        self._threads = []
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 커넥션 반환"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any], Callable[[str], None]], Dict[str, Any]]):
+        """
+        작업 종류별 처리 함수 등록
+
+        Args:
+            kind: 작업 종류 (예: 'analyze')
+            handler: handler(payload, report_progress) -> 결과 딕셔너리
+        """
+        self._handlers[kind] = handler
+
+    # --- 제출 / 조회 ---
+
+    def submit(self, kind: str, payload: Dict[str, Any], user: str = 'anonymous') -> Dict[str, Any]:
+        """
+        작업 제출 (즉시 반환)
+
+        Args:
+            kind: 작업 종류
+            payload: 처리 함수에 전달할 입력
+            user: 요청 사용자 식별자 (동시 실행 제한 단위)
+
+        Returns:
+            생성된 작업 정보
+
+        Raises:
+            JobLimitExceeded: 사용자별 대기 작업 수 초과
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 작업 종류: {kind}")
+
+        conn = self._conn()
+        job_id = uuid.uuid4().hex
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE user = ? AND status IN (?, ?)",
+                (user, QUEUED, RUNNING)
+            ).fetchone()[0]
+            if pending >= self.max_pending_per_user:
+                raise JobLimitExceeded(
+                    f"대기 중인 작업이 너무 많습니다 ({pending}/{self.max_pending_per_user}). 잠시 후 다시 시도해주세요."
+                )
+            conn.execute(
+                "INSERT INTO jobs (id, kind, user, status, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, user, QUEUED, json.dumps(payload, ensure_ascii=False), time.time())
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._notify()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업 상태 조회
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            작업 정보 (없으면 None)
+        """
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = {
+            'id': row['id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'progress': row['progress'],
+            'error': row['error'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+            'result': json.loads(row['result']) if row['result'] else None,
+        }
+        if row['status'] == QUEUED:
+            job['queue_position'] = self._conn().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at <= ?",
+                (QUEUED, row['created_at'])
+            ).fetchone()[0]
+        return job
+
+    def wait(self, job_id: str, timeout: float, last_state: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        """
+        작업 상태가 바뀌거나 끝날 때까지 대기 (롱 폴링)
+
+        Args:
+            job_id: 작업 ID
+            timeout: 최대 대기 시간 (초)
+            last_state: 클라이언트가 마지막으로 본 (status, progress). None이면 완료까지 대기
+
+        Returns:
+            작업 정보 (없으면 None)
+        """
+        deadline = time.time() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job['status'] in FINISHED_STATUSES:
+                return job
+            if last_state is not None and (job['status'], job['progress']) != tuple(last_state):
+                return job
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return job
+            with self._changed:
+                self._changed.wait(min(remaining, self.poll_interval))
+
+    def stats(self) -> Dict[str, Any]:
+        """상태별 작업 수"""
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        counts.update({row[0]: row[1] for row in rows})
+        counts['workers'] = self.max_workers
+        return counts
+
+    # --- 워커 ---
+
+    def start(self):
+        """중단된 작업 복구 후 워커 스레드 시작"""
+        # 앱을 import한 뒤 fork하는 서버(gunicorn preload 등)에서도 실제로 작업을 돌리는 프로세스 기준
+        self.worker_id = _new_worker_id()
+        self._recover_interrupted()
+        self._purge_finished()
+        self._stopping = False
+        for i in range(self.max_workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None):
+        """
+        워커 종료 (실행 중인 작업은 끝까지 처리, 대기 작업은 DB에 남아 다음 시작 시 처리)
+
+        Args:
+            wait: 실행 중인 작업 완료까지 대기 여부
+            timeout: 최대 대기 시간 (초)
+        """
+        self._stopping = True
+        self._notify()
+        if wait:
+            deadline = None if timeout is None else time.time() + timeout
+            for thread in self._threads:
+                remaining = None if deadline is None else max(0, deadline - time.time())
+                thread.join(remaining)
+        self._threads = [t for t in self._threads if t.is_alive()]
+
+    def requeue_running(self) -> int:
+        """
+        이 프로세스가 실행 중인 작업을 다시 대기 상태로 되돌림
+        종료 대기 시간 안에 끝나지 않은 작업을 다른 워커 프로세스가 이어받게 할 때 사용합니다.
+        (늦게 끝난 원래 실행의 결과는 _run에서 버려짐)
+
+        Returns:
+            되돌린 작업 수
+        """
+        cursor = self._conn().execute(
+            "UPDATE jobs SET status = ?, worker = NULL, started_at = NULL, progress = ? WHERE status = ? AND worker = ?",
+            (QUEUED, '서버 종료로 다시 대기 중', RUNNING, self.worker_id)
+        )
+        if cursor.rowcount:
+            print(f"종료 전 끝나지 않은 작업 {cursor.rowcount}건을 다시 대기 상태로 되돌림")
+        return cursor.rowcount
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def _recover_interrupted(self):
+        """종료된 프로세스(또는 시작 전의 이 프로세스)가 실행하던 작업을 다시 대기 상태로 되돌림"""
+        conn = self._conn()
+        own_process = self.worker_id.rsplit(':', 1)[0] + ':'
+        rows = conn.execute("SELECT id, worker FROM jobs WHERE status = ?", (RUNNING,)).fetchall()
+        for row in rows:
+            worker = row['worker']
+            if (worker or '').startswith(own_process) or not _worker_alive(worker):
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, started_at = NULL, progress = ? WHERE id = ?",
+                    (QUEUED, '서버 재시작으로 다시 대기 중', row['id'])
+                )
+                print(f"작업 복구: {row['id']}")
+
+    def _purge_finished(self):
+        """보관 기간이 지난 완료 작업 삭제"""
+        self._conn().execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+            (DONE, FAILED, time.time() - self.retention_seconds)
+        )
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """
+        실행할 작업 하나를 원자적으로 가져오기
+        사용자별 동시 실행 제한을 넘지 않는 가장 오래된 대기 작업을 고릅니다.
+        """
+        with self._claim_lock:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    """
+                    SELECT * FROM jobs AS j
+                    WHERE j.status = ?
+                      AND (SELECT COUNT(*) FROM jobs AS r WHERE r.user = j.user AND r.status = ?) < ?
+                    ORDER BY j.created_at
+                    LIMIT 1
+                    """,
+                    (QUEUED, RUNNING, self.per_user_limit)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, worker = ?, started_at = ?, progress = ? WHERE id = ?",
+                        (RUNNING, self.worker_id, time.time(), '분석 중', row['id'])
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return row
+
+    def _worker_loop(self):
+        while not self._stopping:
+            row = self._claim()
+            if row is None:
+                with self._changed:
+                    self._changed.wait(self.poll_interval)
+                continue
+            self._run(row)
+
+    def _run(self, row: sqlite3.Row):
+        """작업 실행 후 결과 저장"""
+        conn = self._conn()
+        job_id = row['id']
+
+        # 종료 중 다시 대기 상태로 돌려서 다른 워커가 가져간 작업은 건드리지 않음
+        owned = "id = ? AND status = ? AND worker = ?"
+        owner = (job_id, RUNNING, self.worker_id)
+
+        def report_progress(message: str):
+            conn.execute(f"UPDATE jobs SET progress = ? WHERE {owned}", (message,) + owner)
+            self._notify()
+
+        try:
+            handler = self._handlers[row['kind']]
+            result = handler(json.loads(row['payload']), report_progress)
+            conn.execute(
+                f"UPDATE jobs SET status = ?, result = ?, progress = NULL, finished_at = ? WHERE {owned}",
+                (DONE, json.dumps(result, ensure_ascii=False), time.time()) + owner
+            )
+        except Exception as e:
+            print(f"작업 실패 ({job_id}): {e}")
+            conn.execute(
+                f"UPDATE jobs SET status = ?, error = ?, progress = NULL, finished_at = ? WHERE {owned}",
+                (FAILED, str(e), time.time()) + owner
+            )
+        self._notify()
@@ -0,0 +1,464 @@
+"""
+성능 지표 모듈
+핫패스(Gemini 호출, 저장소 읽기/쓰기, 락 대기, 백업 등)의 소요 시간과 횟수를 모아
+Prometheus 텍스트 형식(/metrics)으로 내보냅니다.
+요청 처리 중에 측정한 구간은 요청별로도 모아서 Server-Timing 헤더와 느린 요청 로그에 사용합니다.
+워커 프로세스가 여러 개면 SharedMetrics로 워커별 값을 파일로 공유해 합친 값을 내보냅니다.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 락 없이 사용
+    fcntl = None
+
+
+PREFIX = 'smart_scheduler_'
+
+# 기본 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# 크기 히스토그램 구간 (바이트)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+
+def _escape(value: str) -> str:
+    """라벨 값 이스케이프 (Prometheus 텍스트 형식)"""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """프로세스 내 지표 저장소 (스레드 안전)"""
+
+    def __init__(self, prefix: str = PREFIX):
+        """
+        MetricsRegistry 초기화
+
+        Args:
+            prefix: 모든 지표 이름 앞에 붙일 접두사
+        """
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {}
+        self._per_process = set()
+        self._values: Dict[str, Dict[tuple, object]] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]] = []
+
+    def describe(self, name: str, kind: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+                 per_process: bool = False):
+        """
+        지표 등록 (이름/종류/설명). 같은 이름을 다시 등록하면 무시합니다.
+
+        Args:
+            name: 접두사를 뺀 지표 이름
+            kind: COUNTER, GAUGE, HISTOGRAM
+            help_text: 설명
+            buckets: 히스토그램 구간 상한 목록
+            per_process: 프로세스마다 다른 게이지 (워커 지표를 합칠 때 살아 있는 워커 값의 합,
+                         False면 작업 큐처럼 모든 워커가 공유하는 상태라 요청받은 워커 값만 사용)
+        """
+        with self._lock:
+            if name not in self._meta:
+                self._meta[name] = (kind, help_text, tuple(sorted(buckets)))
+                self._values[name] = {}
+                if per_process:
+                    self._per_process.add(name)
+
+    def _series(self, name: str, kind: str, labels: Dict[str, str]) -> tuple:
+        if name not in self._meta:
+            # 등록하지 않은 지표도 기록은 되게 (설명 없이)
+            self._meta[name] = (kind, '', DEFAULT_BUCKETS)
+            self._values[name] = {}
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """카운터 증가"""
+        with self._lock:
+            key = self._series(name, COUNTER, labels)
+            series = self._values[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        """게이지 값 설정"""
+        with self._lock:
+            key = self._series(name, GAUGE, labels)
+            self._values[name][key] = float(value)
+
+    def observe(self, name: str, value: float, **labels):
+        """히스토그램에 관측값 추가"""
+        with self._lock:
+            key = self._series(name, HISTOGRAM, labels)
+            buckets = self._meta[name][2]
+            hist = self._values[name].get(key)
+            if hist is None:
+                hist = {'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+                self._values[name][key] = hist
+            for i, upper in enumerate(buckets):
+                if value <= upper:
+                    hist['counts'][i] += 1
+            hist['sum'] += value
+            hist['count'] += 1
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, Dict[str, str], float]]]):
+        """
+        내보낼 때마다 호출할 게이지 수집 함수 등록 (작업 큐 길이처럼 다른 곳에 이미 있는 값)
+
+        Args:
+            collector: (지표 이름, 라벨, 값) 목록을 반환하는 함수. 지표는 GAUGE로 describe()해 두세요.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def _collect(self):
+        """등록한 수집 함수의 게이지 값 반영"""
+        with self._lock:
+            collectors = list(self._collectors)
+        for collector in collectors:
+            try:
+                for name, labels, value in collector():
+                    self.set(name, value, **labels)
+            except Exception as e:
+                print(f"지표 수집 실패: {e}")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        현재 지표 값 (JSON으로 저장해 다른 워커 프로세스 값과 합칠 수 있는 형식)
+
+        Returns:
+            {지표 이름: {'kind', 'help', 'buckets', 'per_process', 'series': [[라벨 쌍 목록, 값]]}}
+        """
+        self._collect()
+        with self._lock:
+            return {
+                name: {
+                    'kind': kind,
+                    'help': help_text,
+                    'buckets': list(buckets),
+                    'per_process': name in self._per_process,
+                    'series': [
+                        [[list(pair) for pair in labels], _copy_value(value)]
+                        for labels, value in self._values[name].items()
+                    ],
+                }
+                for name, (kind, help_text, buckets) in self._meta.items()
+            }
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (version 0.0.4)"""
+        return render_snapshot(self.snapshot(), self.prefix)
+
+
+def _copy_value(value):
+    if isinstance(value, dict):
+        return {'counts': list(value['counts']), 'sum': value['sum'], 'count': value['count']}
+    return value
+
+
+def merge_snapshots(local: Dict[str, Dict[str, Any]], live: Iterable[Dict[str, Dict[str, Any]]] = (),
+                    retired: Iterable[Dict[str, Dict[str, Any]]] = ()) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 프로세스의 snapshot() 합치기
+    카운터/히스토그램은 모두 더하고, 게이지는 local 값에 per_process 게이지만 살아 있는 워커 값을 더합니다.
+
+    Args:
+        local: 요청받은 프로세스의 스냅숏 (게이지 모두 사용)
+        live: 다른 살아 있는 워커의 스냅숏 (per_process 게이지만 사용)
+        retired: 종료했거나 응답이 없는 워커의 스냅숏 (게이지는 버림)
+
+    Returns:
+        snapshot()과 같은 형식
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    sources = [(local, 'all')] + [(snap, 'per_process') for snap in live] + [(snap, None) for snap in retired]
+    for snapshot, gauges in sources:
+        for name, entry in snapshot.items():
+            if entry['kind'] == GAUGE and not (gauges == 'all' or (gauges and entry['per_process'])):
+                continue
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = dict(entry, series={})
+            series = target['series']
+            for labels, value in entry['series']:
+                key = tuple(tuple(pair) for pair in labels)
+                current = series.get(key)
+                if current is None:
+                    series[key] = _copy_value(value)
+                elif entry['kind'] == HISTOGRAM:
+                    if len(current['counts']) == len(value['counts']):
+                        current['counts'] = [a + b for a, b in zip(current['counts'], value['counts'])]
+                        current['sum'] += value['sum']
+                        current['count'] += value['count']
+                else:
+                    series[key] = current + value
+    for entry in merged.values():
+        entry['series'] = [[[list(pair) for pair in key], value] for key, value in entry['series'].items()]
+    return merged
+
+
+def render_snapshot(snapshot: Dict[str, Dict[str, Any]], prefix: str = PREFIX) -> str:
+    """snapshot()/merge_snapshots() 결과를 Prometheus 텍스트 형식 (version 0.0.4)으로"""
+    lines = []
+    for name in sorted(snapshot):
+        entry = snapshot[name]
+        kind, help_text, buckets = entry['kind'], entry['help'], entry['buckets']
+        full_name = prefix + name
+        if help_text:
+            lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        series = sorted((tuple(tuple(pair) for pair in labels), value) for labels, value in entry['series'])
+        for labels, value in series:
+            if kind != HISTOGRAM:
+                lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+                continue
+            for upper, count in zip(buckets, value['counts']):
+                lines.append(f"{full_name}_bucket{_format_labels(labels, ('le', _format_value(upper)))} {count}")
+            lines.append(f"{full_name}_bucket{_format_labels(labels, ('le', '+Inf'))} {value['count']}")
+            lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+            lines.append(f"{full_name}_count{_format_labels(labels)} {value['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+class SharedMetrics:
+    """
+    워커 프로세스 간 지표 공유 (gunicorn 워커 여러 개)
+    워커마다 주기적으로 snapshot()을 디렉토리의 워커별 파일에 쓰고, /metrics를 받은 워커가 모든 파일을 합쳐 내보냅니다.
+    종료한 워커의 카운터/히스토그램은 누적 파일로 옮겨 워커가 바뀌어도 값이 줄지 않습니다.
+    """
+
+    RETIRED_FILE = 'retired.json'
+
+    def __init__(self, registry: MetricsRegistry, directory: Path, interval: float = 5.0):
+        """
+        SharedMetrics 초기화
+
+        Args:
+            registry: 이 프로세스의 지표 저장소
+            directory: 워커별 스냅숏 파일 디렉토리 (서버 시작 시 비워야 함, gunicorn.conf.py의 on_starting)
+            interval: 스냅숏 파일 갱신 주기 (초). 다른 워커 값은 최대 이만큼 늦게 보이고,
+                      세 주기 넘게 갱신이 없는 워커는 종료한 것으로 보고 게이지를 버립니다.
+        """
+        self.registry = registry
+        self.directory = Path(directory)
+        self.interval = interval
+        self.path = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @contextmanager
+    def _files_lock(self, exclusive: bool):
+        """누적 파일 갱신(배타)과 합치기(공유)가 겹치지 않게 (두 곳에 같은 값이 있거나 빠진 순간을 읽지 않도록)"""
+        with open(self.directory / '.lock', 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Dict[str, Any]]]:
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(path: Path, snapshot: Dict[str, Dict[str, Any]]):
+        """읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일에 쓰고 교체"""
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text(json.dumps(snapshot, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, path)
+
+    def _retire(self, path: Path):
+        """워커 파일의 카운터/히스토그램을 누적 파일로 옮기고 삭제 (_files_lock(exclusive=True) 안에서 호출)"""
+        snapshot = self._read(path)
+        if snapshot is not None:
+            retired_path = self.directory / self.RETIRED_FILE
+            self._write(retired_path, merge_snapshots({}, retired=[self._read(retired_path) or {}, snapshot]))
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def start(self):
+        """공유 시작 (워커 프로세스에서 fork 이후 호출)"""
+        if self._thread is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"worker-{os.getpid()}.json"
+        # 같은 PID를 쓰던 워커가 비정상 종료하며 남긴 파일은 누적 파일로
+        with self._files_lock(exclusive=True):
+            self._retire(self.path)
+        self.flush()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='metrics-share', daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"지표 공유 파일 쓰기 실패: {e}")
+
+    def flush(self):
+        """이 워커의 현재 값을 파일에 쓰기"""
+        if self.path is not None:
+            self._write(self.path, self.registry.snapshot())
+
+    def render(self) -> str:
+        """모든 워커 값을 합친 Prometheus 텍스트 형식"""
+        local = self.registry.snapshot()
+        if self.path is None:
+            return render_snapshot(local, self.registry.prefix)
+        live, retired = [], []
+        now = time.time()
+        with self._files_lock(exclusive=False):
+            retired_snapshot = self._read(self.directory / self.RETIRED_FILE)
+            if retired_snapshot is not None:
+                retired.append(retired_snapshot)
+            for path in self.directory.glob('worker-*.json'):
+                if path == self.path:
+                    continue
+                try:
+                    updated = path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                snapshot = self._read(path)
+                if snapshot is not None:
+                    (live if now - updated <= self.interval * 3 else retired).append(snapshot)
+        return render_snapshot(merge_snapshots(local, live, retired), self.registry.prefix)
+
+    def shutdown(self):
+        """공유 종료 (워커 종료 시): 마지막 값을 누적 파일로 옮김"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.interval + 1)
+        self._thread = None
+        with self._files_lock(exclusive=True):
+            self.flush()
+            self._retire(self.path)
+        self.path = None
+
+
+# 프로세스 전역 저장소
+REGISTRY = MetricsRegistry()
+
+_spans = threading.local()
+
+
+def describe(name: str, kind: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+             per_process: bool = False):
+    """REGISTRY.describe() 바로가기"""
+    REGISTRY.describe(name, kind, help_text, buckets, per_process)
+
+
+def inc(name: str, value: float = 1.0, **labels):
+    """REGISTRY.inc() 바로가기"""
+    REGISTRY.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    """REGISTRY.observe() 바로가기"""
+    REGISTRY.observe(name, value, **labels)
+
+
+# --- 요청별 구간 기록 ---
+
+def start_spans():
+    """현재 스레드에서 요청별 구간 기록 시작"""
+    _spans.items = []
+
+
+def record_span(name: str, seconds: float):
+    """구간 기록 (start_spans() 이후 같은 스레드에서만 모임)"""
+    items = getattr(_spans, 'items', None)
+    if items is not None:
+        items.append((name, seconds))
+
+
+def finish_spans() -> List[Tuple[str, float]]:
+    """
+    요청별 구간 기록 종료
+
+    Returns:
+        [(구간 이름, 합계 초)] - 같은 이름은 합산, 처음 나온 순서 유지
+    """
+    items = getattr(_spans, 'items', None) or []
+    _spans.items = None
+    totals: Dict[str, float] = {}
+    for name, seconds in items:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return list(totals.items())
+
+
+@contextmanager
+def timer(name: str, span: Optional[str] = None, **labels):
+    """
+    with 블록 소요 시간을 히스토그램에 기록 (요청 처리 중이면 구간으로도 기록)
+
+    Args:
+        name: 히스토그램 지표 이름
+        span: 요청별 구간 이름 (기본값은 지표 이름)
+        labels: 지표 라벨
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        REGISTRY.observe(name, elapsed, **labels)
+        record_span(span or name, elapsed)
+
+
+def server_timing(spans: List[Tuple[str, float]], total: float) -> str:
+    """Server-Timing 헤더 값 (밀리초)"""
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in spans]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(parts)
+
+
+def main():
+    """지표 출력 형식 확인"""
+    describe('demo_seconds', HISTOGRAM, '데모 구간 소요 시간 (초)')
+    describe('demo_total', COUNTER, '데모 호출 수')
+    start_spans()
+    for _ in range(3):
+        with timer('demo_seconds', span='demo', step='sleep'):
+            time.sleep(0.01)
+        inc('demo_total', outcome='ok')
+    spans = finish_spans()
+    print(REGISTRY.render())
+    print(f"Server-Timing: {server_timing(spans, sum(s for _, s in spans))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+프롬프트 압축 / 토큰 예산 모듈
+회의록에서 분석에 쓸모없는 부분(타임스탬프, 인사/맞장구만 있는 줄, 반복되는 머리글, 구분선, 빈 줄)을 걷어내고,
+그래도 토큰 예산을 넘으면 앞뒤만 남기고 가운데를 잘라냅니다.
+입력 크기에 따라 사용할 모델 단계(예: 짧은 회의록은 flash-lite)를 고르는 함수와 요청별 토큰 사용량 집계도 제공합니다.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# 녹취록 형식
+VTT_HEADER = re.compile(r'^\s*WEBVTT\b.*$')
+CUE_TIMING = re.compile(r'^\s*\d{1,2}:\d{2}(?::\d{2})?[.,]\d{3}\s*-->\s*\d{1,2}:\d{2}(?::\d{2})?[.,]\d{3}.*$')
+CUE_INDEX = re.compile(r'^\s*\d+\s*$')
+# [00:12:34] / (00:12) / 00:12:34 처럼 줄 앞에 붙은 녹취 타임스탬프 (초가 없는 '10:00 킥오프'는 일정일 수 있어 남김)
+LEADING_TIMESTAMP = re.compile(r'^\s*(?:[\[(]\d{1,2}:\d{2}(?::\d{2})?[\])]|\d{1,2}:\d{2}:\d{2})\s*')
+# 클로바노트 등: '참석자 1 00:03' 처럼 화자 이름 뒤에 시간만 있는 줄
+SPEAKER_LINE = re.compile(r'^\s*(\S.{0,30}?)\s+\d{1,2}:\d{2}(?::\d{2})?\s*$')
+# '김철수: 네' 처럼 화자 이름이 앞에 붙은 발화
+SPEAKER_PREFIX = re.compile(r'^\s*[^:：\s][^:：]{0,20}[:：]\s*')
+SEPARATOR = re.compile(r'^\s*([-=*_~#·.])\1{3,}\s*$')
+PUNCTUATION = re.compile(r'[\s.,!?~…·\-ㅎㅋ^]+')
+
+# 인사/맞장구만 있는 발화 (구두점/공백을 뺀 소문자 기준)
+FILLERS = {
+    '네', '네네', '네네네', '예', '예예', '음', '어', '아', '응', '으음', '흠',
+    '그렇죠', '그렇습니다', '맞아요', '맞습니다', '좋습니다', '좋아요', '알겠습니다', '넵', '넹',
+    '안녕하세요', '감사합니다', '고맙습니다', '수고하셨습니다', '수고하세요', '수고많으셨습니다',
+    '들리시나요', '잘들리시나요', '잘들립니다', '들립니다',
+    'ok', 'okay', 'yes', 'yeah', 'yep', 'right', 'sure', 'um', 'uh', 'hmm', 'hi', 'hello', 'bye',
+    'thanks', 'thankyou', 'thanksall', 'goodbye', 'canyouhearme',
+}
+
+# 이 횟수 이상 똑같이 반복되는 줄은 머리글/바닥글로 보고 처음 한 번만 남김
+HEADER_REPEAT = 3
+HEADER_MIN_CHARS = 6
+
+TRIM_MARKER = '\n\n[... 토큰 예산 초과로 중략 ...]\n\n'
+
+# 요청별 사용량에서 합산하는 항목
+USAGE_COUNTERS = ('calls', 'prompt_tokens', 'cached_tokens', 'output_tokens', 'total_tokens')
+
+
+def _is_filler(line: str) -> bool:
+    utterance = SPEAKER_PREFIX.sub('', line, count=1)
+    return PUNCTUATION.sub('', utterance).lower() in FILLERS
+
+
+def _is_transcript(lines: List[str]) -> bool:
+    """'화자 시간' 줄이 여러 번 나오고 같은 화자가 반복되면 녹취록 (시간이 적힌 안건 목록과 구분)"""
+    speakers = [match.group(1) for match in map(SPEAKER_LINE.match, lines) if match]
+    return len(speakers) >= HEADER_REPEAT and len(set(speakers)) < len(speakers)
+
+
+def _merge_speaker_lines(lines: List[str]) -> List[str]:
+    """'화자 00:03' 줄과 이어지는 발화를 '화자: 발화' 한 줄로 합치기"""
+    merged, speaker = [], None
+    for line in lines:
+        match = SPEAKER_LINE.match(line)
+        if match:
+            speaker = match.group(1)
+            continue
+        if speaker is not None and line.strip():
+            merged.append(f"{speaker}: {line.strip()}")
+        else:
+            merged.append(line)
+            if not line.strip():
+                speaker = None
+    return merged
+
+
+def compact_notes(text: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    회의록에서 분석에 필요 없는 부분 제거 (내용이 있는 문장은 건드리지 않음)
+
+    Args:
+        text: 회의록 원문
+
+    Returns:
+        (압축한 회의록, {'original_chars', 'compacted_chars', 'removed_lines'})
+    """
+    lines = (text or '').replace('\r\n', '\n').replace('\r', '\n').split('\n')
+
+    # 자막(WebVTT) 머리글, 큐 번호, 큐 시간, 구분선
+    kept = []
+    for i, line in enumerate(lines):
+        if VTT_HEADER.match(line) or CUE_TIMING.match(line) or SEPARATOR.match(line):
+            continue
+        if CUE_INDEX.match(line) and i + 1 < len(lines) and CUE_TIMING.match(lines[i + 1]):
+            continue
+        kept.append(LEADING_TIMESTAMP.sub('', line).rstrip())
+    lines = kept
+
+    # 녹취록 형식이면 '화자 시간' 줄을 발화와 합침
+    if _is_transcript(lines):
+        lines = _merge_speaker_lines(lines)
+
+    counts = Counter(line.strip() for line in lines if len(line.strip()) >= HEADER_MIN_CHARS)
+    seen = set()
+    kept = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped and _is_filler(stripped):
+            continue
+        if counts.get(stripped, 0) >= HEADER_REPEAT:
+            if stripped in seen:
+                continue
+            seen.add(stripped)
+        # 들여쓰기는 남기고 줄 안의 연속 공백만 하나로
+        indent = line[:len(line) - len(line.lstrip())]
+        kept.append(indent + re.sub(r'[ \t]{2,}', ' ', stripped) if stripped else '')
+
+    compacted = re.sub(r'\n{3,}', '\n\n', '\n'.join(kept)).strip()
+    return compacted, {
+        'original_chars': len(text or ''),
+        'compacted_chars': len(compacted),
+        'removed_lines': (text or '').count('\n') - compacted.count('\n'),
+    }
+
+
+def trim_to_budget(text: str, tokens: int, budget: int) -> str:
+    """
+    토큰 예산에 맞게 가운데를 잘라내기 (회의 개요가 있는 앞부분과 결론/액션 아이템이 있는 뒷부분을 남김)
+
+    Args:
+        text: 회의록
+        tokens: text의 토큰 수
+        budget: 최대 토큰 수
+
+    Returns:
+        예산 안으로 줄인 회의록 (이미 예산 안이면 그대로)
+    """
+    if budget <= 0 or tokens <= budget:
+        return text
+    # 토큰 수는 글자 수에 비례한다고 보고 약간 여유를 둠
+    keep = max(0, int(len(text) * budget / tokens * 0.95) - len(TRIM_MARKER))
+    head_end = keep * 2 // 5
+    tail_start = len(text) - (keep - head_end)
+    # 줄 중간에서 자르지 않게 줄 경계로 맞춤
+    newline = text.rfind('\n', 0, head_end)
+    head_end = newline if newline > 0 else head_end
+    newline = text.find('\n', tail_start)
+    tail_start = newline + 1 if 0 <= newline < len(text) - 1 else tail_start
+    return text[:head_end].rstrip() + TRIM_MARKER + text[tail_start:].lstrip()
+
+
+def parse_model_tiers(spec: Optional[str], default_model: str) -> List[Tuple[str, Optional[int]]]:
+    """
+    모델 단계 설정 파싱
+
+    Args:
+        spec: '모델:최대 입력 토큰,모델:최대 입력 토큰,모델' (마지막은 상한 없음)
+              예: 'gemini-2.5-flash-lite:4000,gemini-2.5-flash'
+        default_model: spec이 비었을 때 쓸 모델
+
+    Returns:
+        [(모델 이름, 최대 입력 토큰 또는 None)] (상한 오름차순, 마지막은 None)
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    tiers = []
+    for part in (spec or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, limit = part.partition(':')
+        if not name.strip():
+            raise ValueError(f"모델 단계 설정 형식 오류: {part}")
+        tiers.append((name.strip(), int(limit) if limit.strip() else None))
+    if not tiers:
+        return [(default_model, None)]
+
+    bounded = sorted((t for t in tiers if t[1] is not None), key=lambda t: t[1])
+    unbounded = [t for t in tiers if t[1] is None]
+    if len(unbounded) > 1:
+        raise ValueError("상한 없는 모델은 하나만 지정할 수 있습니다.")
+    return bounded + (unbounded or [(default_model, None)])
+
+
+def pick_model(tiers: List[Tuple[str, Optional[int]]], tokens: int) -> str:
+    """입력 토큰 수에 맞는 가장 작은 모델 단계"""
+    for name, limit in tiers:
+        if limit is None or tokens <= limit:
+            return name
+    return tiers[-1][0]
+
+
+def new_usage(model: Optional[str], **extra) -> Dict[str, Any]:
+    """
+    요청별 토큰 사용량 (분석 결과의 'usage')
+
+    Args:
+        model: 사용한 모델 (캐시 적중이면 None)
+        extra: 함께 담을 값 (notes_tokens, trimmed 등)
+
+    Returns:
+        {'model', 'calls', 'prompt_tokens', 'cached_tokens', 'output_tokens', 'total_tokens', ...}
+    """
+    usage = {'model': model}
+    usage.update({key: 0 for key in USAGE_COUNTERS})
+    usage.update(extra)
+    return usage
+
+
+def merge_usage(usages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """여러 호출(긴 회의록의 조각 분석 등)의 사용량 합치기"""
+    models = sorted({u['model'] for u in usages if u.get('model')})
+    merged = new_usage(','.join(models) or None)
+    for usage in usages:
+        for key in USAGE_COUNTERS:
+            merged[key] += usage.get(key) or 0
+    merged['trimmed'] = any(u.get('trimmed') for u in usages)
+    return merged
+
+
+def main():
+    """압축 결과 확인"""
+    sample = """WEBVTT
+
+1
+00:00:01.000 --> 00:00:03.000
+안녕하세요.
+
+참석자 1 00:03
+안녕하세요, 다들 잘 들리시나요?
+참석자 2 00:07
+네.
+참석자 1 00:09
+이번 주 배포 일정부터 정리하겠습니다. 금요일까지 QA 끝내야 합니다.
+참석자 2 00:20
+알겠습니다!
+-----------------
+[00:25] 10:00 킥오프 미팅은 다음 주 월요일로 옮기죠.
+"""
+    compacted, stats = compact_notes(sample)
+    print(compacted)
+    print(stats)
+    tiers = parse_model_tiers('gemini-2.5-flash-lite:4000,gemini-2.5-flash', 'gemini-2.5-flash')
+    print(tiers, pick_model(tiers, 1200), pick_model(tiers, 9000))
+    long_text = '\n'.join(f"{i}번째 줄 내용입니다." for i in range(200))
+    print(trim_to_budget(long_text, len(long_text) // 2, 300))
+
+
+if __name__ == "__main__":
+    main()
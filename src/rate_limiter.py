@@ -0,0 +1,303 @@
+"""
+Gemini API 호출 속도 제한 모듈
+여러 워커/프로세스가 로컬 상태 파일을 공유하는 토큰 버킷으로 RPM/TPM 한도 안에서 호출을 배분하고,
+같은 프롬프트의 동시 요청은 (키별 락 파일로 워커 프로세스 간에도) 한 번의 호출로 합칩니다.
+"""
+
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내 락만 사용
+    fcntl = None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    입력 토큰 수 추정 (한국어 기준으로 넉넉하게 2글자당 1토큰)
+
+    Args:
+        text: 프롬프트 텍스트
+
+    Returns:
+        추정 토큰 수
+    """
+    return len(text) // 2 + 1
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """
+    지수 백오프 + 지터 (full jitter)
+    여러 워커가 동시에 429를 받아도 재시도 시점이 흩어지도록 합니다.
+
+    Args:
+        attempt: 0부터 시작하는 재시도 횟수
+        base: 첫 대기 시간 상한 (초)
+        cap: 최대 대기 시간 (초)
+
+    Returns:
+        대기 시간 (초)
+    """
+    return random.uniform(base / 2, min(cap, base * (2 ** attempt)))
+
+
+class RateLimitTimeout(Exception):
+    """대기 시간 안에 호출 슬롯을 얻지 못함"""
+
+
+class RateLimiter:
+    """파일 공유 토큰 버킷 (요청 수 RPM + 토큰 수 TPM)"""
+
+    def __init__(self, state_path: Path, rpm: int = 10, tpm: int = 250000, max_wait: float = 120.0):
+        """
+        RateLimiter 초기화
+
+        Args:
+            state_path: 프로세스 간 공유 상태 파일 경로
+            rpm: 분당 최대 요청 수
+            tpm: 분당 최대 토큰 수
+            max_wait: acquire() 최대 대기 시간 (초)
+        """
+        self.state_path = Path(state_path)
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+
+        # 지표 (프로세스 단위)
+        self.waiting = 0
+        self.acquired = 0
+        self.delayed = 0
+        self.timeouts = 0
+        self.penalties = 0
+        self.total_wait = 0.0
+        self.max_wait_seen = 0.0
+
+        self.state_path.touch(exist_ok=True)
+
+    @contextmanager
+    def _locked_state(self):
+        """상태 파일을 잠그고 읽기/쓰기 (다른 프로세스와 배타적)"""
+        with self._lock:
+            with open(self.state_path, 'r+', encoding='utf-8') as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    raw = f.read()
+                    now = time.time()
+                    try:
+                        state = json.loads(raw) if raw else {}
+                    except ValueError:
+                        state = {}
+                    state.setdefault('requests', float(self.rpm))
+                    state.setdefault('tokens', float(self.tpm))
+                    state.setdefault('updated', now)
+                    state.setdefault('blocked_until', 0.0)
+
+                    # 경과 시간만큼 버킷 채우기
+                    elapsed = max(0.0, now - state['updated'])
+                    state['requests'] = min(float(self.rpm), state['requests'] + elapsed * self.rpm / 60.0)
+                    state['tokens'] = min(float(self.tpm), state['tokens'] + elapsed * self.tpm / 60.0)
+                    state['updated'] = now
+
+                    yield state, now
+
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """슬롯 획득 시도. 성공하면 0, 아니면 다시 시도할 때까지 기다릴 시간(초) 반환"""
+        tokens = min(tokens, self.tpm)
+        with self._locked_state() as (state, now):
+            if state['blocked_until'] > now:
+                return state['blocked_until'] - now
+            if state['requests'] >= 1 and state['tokens'] >= tokens:
+                state['requests'] -= 1
+                state['tokens'] -= tokens
+                return 0.0
+            need_requests = max(0.0, 1 - state['requests']) * 60.0 / self.rpm
+            need_tokens = max(0.0, tokens - state['tokens']) * 60.0 / self.tpm
+            return max(need_requests, need_tokens)
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> float:
+        """
+        호출 슬롯 획득 (한도를 넘으면 대기)
+
+        Args:
+            tokens: 이번 호출에 쓸 추정 토큰 수
+            timeout: 최대 대기 시간 (초, 기본값 max_wait)
+
+        Returns:
+            실제 대기한 시간 (초)
+
+        Raises:
+            RateLimitTimeout: 대기 시간 초과
+        """
+        timeout = self.max_wait if timeout is None else timeout
+        started = time.time()
+        with self._metrics_lock:
+            self.waiting += 1
+        try:
+            while True:
+                delay = self._try_acquire(tokens)
+                waited = time.time() - started
+                if delay <= 0:
+                    break
+                if waited + delay > timeout:
+                    with self._metrics_lock:
+                        self.timeouts += 1
+                    raise RateLimitTimeout(
+                        f"Gemini 호출 한도 대기 시간 초과 ({timeout:.0f}초). 잠시 후 다시 시도해주세요."
+                    )
+                # 여러 워커가 같은 시점에 깨어나지 않도록 지터 추가
+                time.sleep(delay + random.uniform(0, 0.25))
+        finally:
+            with self._metrics_lock:
+                self.waiting -= 1
+
+        with self._metrics_lock:
+            self.acquired += 1
+            if waited > 0.01:
+                self.delayed += 1
+            self.total_wait += waited
+            self.max_wait_seen = max(self.max_wait_seen, waited)
+        return waited
+
+    def record_usage(self, estimated: int, actual: int):
+        """
+        실제 사용 토큰 수로 버킷 보정 (추정보다 많이 쓰면 차감, 적게 쓰면 반환)
+
+        Args:
+            estimated: acquire()에 넘긴 추정 토큰 수
+            actual: 응답의 실제 토큰 수
+        """
+        with self._locked_state() as (state, _):
+            state['tokens'] = min(float(self.tpm), state['tokens'] + estimated - actual)
+
+    def penalize(self, delay: float):
+        """
+        429 응답을 받았을 때 모든 워커의 호출을 delay초 동안 멈춤
+
+        Args:
+            delay: 멈출 시간 (초)
+        """
+        with self._locked_state() as (state, now):
+            state['blocked_until'] = max(state['blocked_until'], now + delay)
+        with self._metrics_lock:
+            self.penalties += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """대기열 깊이 및 대기 시간 지표"""
+        with self._metrics_lock:
+            return {
+                'rpm': self.rpm,
+                'tpm': self.tpm,
+                'queue_depth': self.waiting,
+                'acquired': self.acquired,
+                'delayed': self.delayed,
+                'timeouts': self.timeouts,
+                'penalties': self.penalties,
+                'avg_wait_seconds': round(self.total_wait / self.acquired, 3) if self.acquired else 0.0,
+                'max_wait_seconds': round(self.max_wait_seen, 3),
+            }
+
+
+class RequestCoalescer:
+    """같은 키의 동시 요청을 한 번의 실행으로 합침 (프로세스 내, lock_dir를 주면 워커 프로세스 간에도)"""
+
+    def __init__(self, lock_dir: Optional[Path] = None):
+        """
+        RequestCoalescer 초기화
+
+        Args:
+            lock_dir: 프로세스 간 합치기에 쓸 키별 락 파일 디렉토리 (None이면 프로세스 내에서만 합침)
+        """
+        self.lock_dir = Path(lock_dir) if lock_dir is not None and fcntl is not None else None
+        if self.lock_dir is not None:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self.coalesced = 0
+
+    def run(self, key: str, fn: Callable[[], Any], lookup: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        key가 같은 실행이 진행 중이면 그 결과를 기다려 공유하고, 없으면 fn() 실행
+
+        Args:
+            key: 요청 식별 키 (예: 프롬프트 해시, 파일 이름으로 쓸 수 있는 문자열)
+            fn: 실제 호출 함수
+            lookup: 다른 프로세스의 같은 키 실행이 끝나길 기다린 뒤 그 결과를 찾는 함수
+                    (예: 분석 캐시 조회, 없으면 None 반환). 주지 않으면 프로세스 내에서만 합침
+
+        Returns:
+            fn()의 결과
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._run_shared(key, fn, lookup)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _run_shared(self, key: str, fn: Callable[[], Any], lookup: Optional[Callable[[], Any]]) -> Any:
+        """다른 워커 프로세스가 같은 키를 실행 중이면 끝날 때까지 기다렸다가 lookup() 결과 사용 (없으면 직접 실행)"""
+        if self.lock_dir is None or lookup is None:
+            return fn()
+        path = self.lock_dir / f"{key}.lock"
+        with open(path, 'a') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                waited = False
+            except BlockingIOError:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                waited = True
+            try:
+                if waited:
+                    result = lookup()
+                    if result is not None:
+                        with self._lock:
+                            self.coalesced += 1
+                        return result
+                return fn()
+            finally:
+                # 기다리던 프로세스는 이미 연 파일로 락을 이어받고, 이후 요청은 새 파일을 만듦
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def stats(self) -> Dict[str, Any]:
+        """진행 중인 요청 수와 합쳐진 요청 수"""
+        with self._lock:
+            return {'in_flight': len(self._in_flight), 'coalesced': self.coalesced}
@@ -0,0 +1,1052 @@
+"""
+Reclaim.ai API 클라이언트 모듈
+분석된 회의록 정보를 Reclaim.ai에 태스크와 이벤트로 등록합니다.
+커넥션을 재사용하는 세션으로 제한된 개수만큼 동시에 요청하고,
+로컬 이벤트 ID에서 만든 멱등 키로 다시 동기화해도 중복 생성되지 않습니다.
+"""
+
+import os
+import time
+import hashlib
+import threading
+import requests
+from contextlib import contextmanager
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta
+import pytz
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내 락만 사용
+    fcntl = None
+
+from rate_limiter import backoff_delay
+from sync_state import content_hash, three_way_merge, DELETED, RESOLVE_LOCAL, RESOLVE_REMOTE
+from event_store import EventStoreError
+
+
+DEFAULT_BASE_URL = "https://api.app.reclaim.ai"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+PRIORITY_MAP = {
+    "high": "P1",
+    "medium": "P2",
+    "low": "P3"
+}
+
+
+class ReclaimAPIError(Exception):
+    """재시도 후에도 실패한 Reclaim.ai 요청"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def idempotency_key(local_id: str, kind: str) -> str:
+    """로컬 이벤트 ID로 만든 멱등 키 (같은 이벤트는 항상 같은 키)"""
+    return hashlib.sha256(f"smart-scheduler:{kind}:{local_id}".encode('utf-8')).hexdigest()
+
+
+class ReclaimClient:
+    """Reclaim.ai API를 사용하는 클라이언트 클래스"""
+
+    def __init__(
+        self,
+        api_token: str,
+        timezone: str = "Asia/Seoul",
+        base_url: Optional[str] = None,
+        max_connections: int = 4,
+        max_retries: int = 4,
+        timeout: float = 10
+    ):
+        """
+        Reclaim Client 초기화
+
+        Args:
+            api_token: Reclaim.ai API 토큰
+            timezone: 타임존 (기본값: Asia/Seoul)
+            base_url: API 주소 (기본값: RECLAIM_API_URL 환경 변수 또는 Reclaim.ai, 테스트용 로컬 서버 지정 가능)
+            max_connections: 커넥션 풀 크기 (동시 요청 수)
+            max_retries: 429/5xx/연결 오류 재시도 횟수
+            timeout: 요청 타임아웃 (초)
+        """
+        self.api_token = api_token
+        self.base_url = (base_url or os.getenv('RECLAIM_API_URL') or DEFAULT_BASE_URL).rstrip('/')
+        self.headers = {
+            "Authorization": f"Bearer {api_token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        self.timezone = pytz.timezone(timezone)
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        # 모든 요청이 공유하는 세션 (TCP/TLS 연결 재사용)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _request(self, method: str, path: str, json_body: Any = None,
+                 idempotency_key: Optional[str] = None) -> Any:
+        """
+        API 요청 (429/5xx/연결 오류는 지수 백오프로 재시도)
+        POST도 같은 멱등 키로 재시도하므로 응답을 못 받은 요청이 중복 생성되지 않습니다.
+
+        Args:
+            method: HTTP 메서드
+            path: '/api/...' 경로
+            json_body: 요청 본문
+            idempotency_key: Idempotency-Key 헤더 값 (선택)
+
+        Returns:
+            응답 JSON (본문이 없으면 None)
+
+        Raises:
+            ReclaimAPIError: 재시도 후에도 실패
+        """
+        headers = {'Idempotency-Key': idempotency_key} if idempotency_key else None
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.request(
+                    method, f"{self.base_url}{path}", json=json_body, headers=headers, timeout=self.timeout
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                last_error = ReclaimAPIError(str(e))
+            else:
+                if response.status_code < 400:
+                    return response.json() if response.content else None
+                last_error = ReclaimAPIError(
+                    f"{response.status_code} {response.reason}: {response.text[:200]}", response.status_code
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    raise last_error
+                retry_after = response.headers.get('Retry-After')
+                if retry_after and retry_after.isdigit() and attempt < self.max_retries:
+                    time.sleep(min(float(retry_after), 60))
+                    continue
+
+            if attempt < self.max_retries:
+                time.sleep(backoff_delay(attempt, base=1.0, cap=30.0))
+
+        raise last_error
+
+    def _due_datetime(self, due_date: Optional[str]) -> Optional[str]:
+        """마감일 (YYYY-MM-DD 또는 ISO 8601) → 타임존이 적용된 ISO 8601"""
+        if not due_date:
+            return None
+        try:
+            if 'T' in due_date:
+                due_datetime = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+                if due_datetime.tzinfo is None:
+                    due_datetime = self.timezone.localize(due_datetime)
+            else:
+                # YYYY-MM-DD 형식을 ISO 8601 형식으로 변환
+                due_datetime = datetime.strptime(due_date, "%Y-%m-%d")
+                # 타임존 적용
+                due_datetime = self.timezone.localize(due_datetime.replace(hour=23, minute=59))
+            return due_datetime.isoformat()
+        except ValueError:
+            print(f"잘못된 날짜 형식: {due_date}")
+            return None
+
+    def task_payload(
+        self,
+        title: str,
+        description: str = "",
+        due_date: Optional[str] = None,
+        priority: str = "medium",
+        duration_minutes: int = 60
+    ) -> Dict[str, Any]:
+        """태스크 생성/수정 요청 본문"""
+        # 우선순위 매핑 (Reclaim.ai는 P1-P4 사용)
+        return {
+            "title": title,
+            "notes": description,
+            "eventCategory": "WORK",
+            "timeSchemeId": "default",
+            "snoozeUntil": None,
+            "due": self._due_datetime(due_date),
+            "minChunkSize": min(30, duration_minutes),
+            "maxChunkSize": duration_minutes,
+            "alwaysPrivate": False,
+            "priority": PRIORITY_MAP.get(priority, "P2")
+        }
+
+    def event_payload(
+        self,
+        title: str,
+        description: str = "",
+        start_time: Optional[str] = None,
+        duration_minutes: int = 60,
+        date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        이벤트 생성/수정 요청 본문
+
+        Raises:
+            ValueError: 날짜/시간 형식 오류
+        """
+        if not date:
+            # 날짜가 없으면 다음 주로 설정
+            date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+
+        if not start_time:
+            # 시간이 없으면 오전 10시로 설정
+            start_time = "10:00"
+
+        # 시작 시간 파싱
+        date_time_str = f"{date} {start_time}"
+        start_datetime = datetime.strptime(date_time_str, "%Y-%m-%d %H:%M")
+        start_datetime = self.timezone.localize(start_datetime)
+
+        # 종료 시간 계산
+        end_datetime = start_datetime + timedelta(minutes=duration_minutes)
+
+        return {
+            "title": title,
+            "eventCategory": "WORK",
+            "start": start_datetime.isoformat(),
+            "end": end_datetime.isoformat(),
+            "notes": description,
+            "allDay": False
+        }
+
+    def create_task(
+        self,
+        title: str,
+        description: str = "",
+        due_date: Optional[str] = None,
+        priority: str = "medium",
+        duration_minutes: int = 60,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Reclaim.ai에 태스크 생성
+
+        Args:
+            title: 태스크 제목
+            description: 태스크 설명
+            due_date: 마감일 (YYYY-MM-DD 형식)
+            priority: 우선순위 (high/medium/low)
+            duration_minutes: 예상 소요 시간 (분)
+            idempotency_key: 멱등 키 (재시도/재동기화 시 중복 생성 방지)
+
+        Returns:
+            생성된 태스크 정보
+        """
+        task_data = self.task_payload(title, description, due_date, priority, duration_minutes)
+
+        try:
+            task = self._request("POST", "/api/tasks", task_data, idempotency_key)
+            return {
+                "success": True,
+                "task": task,
+                "message": f"태스크 생성 완료: {title}"
+            }
+        except ReclaimAPIError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"태스크 생성 실패: {title}"
+            }
+
+    def create_event(
+        self,
+        title: str,
+        description: str = "",
+        start_time: Optional[str] = None,
+        duration_minutes: int = 60,
+        date: Optional[str] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Reclaim.ai에 이벤트 생성
+
+        Args:
+            title: 이벤트 제목
+            description: 이벤트 설명
+            start_time: 시작 시간 (HH:MM 형식)
+            duration_minutes: 소요 시간 (분)
+            date: 날짜 (YYYY-MM-DD 형식)
+            idempotency_key: 멱등 키 (재시도/재동기화 시 중복 생성 방지)
+
+        Returns:
+            생성된 이벤트 정보
+        """
+        try:
+            event_data = self.event_payload(title, description, start_time, duration_minutes, date)
+            event = self._request("POST", "/api/events", event_data, idempotency_key)
+            return {
+                "success": True,
+                "event": event,
+                "message": f"이벤트 생성 완료: {title} ({event_data['start'][:16].replace('T', ' ')})"
+            }
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": f"날짜/시간 형식 오류: {str(e)}",
+                "message": f"이벤트 생성 실패: {title}"
+            }
+        except ReclaimAPIError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "message": f"이벤트 생성 실패: {title}"
+            }
+
+    def create_item(self, kind: str, payload: Dict[str, Any], idempotency_key: Optional[str] = None) -> Any:
+        """
+        태스크/이벤트 생성
+
+        Args:
+            kind: 'task' 또는 'event'
+            payload: task_payload()/event_payload() 형식 본문
+            idempotency_key: 멱등 키
+
+        Raises:
+            ReclaimAPIError: 요청 실패
+        """
+        return self._request("POST", f"/api/{kind}s", payload, idempotency_key)
+
+    def update_item(self, kind: str, remote_id: str, payload: Dict[str, Any]) -> Any:
+        """
+        태스크/이벤트 수정
+
+        Args:
+            kind: 'task' 또는 'event'
+            remote_id: 원격 항목 ID
+            payload: task_payload()/event_payload() 형식 본문
+
+        Raises:
+            ReclaimAPIError: 요청 실패
+        """
+        return self._request("PATCH", f"/api/{kind}s/{remote_id}", payload)
+
+    def delete_item(self, kind: str, remote_id: str):
+        """
+        태스크/이벤트 삭제 (이미 없으면 성공으로 간주)
+
+        Raises:
+            ReclaimAPIError: 요청 실패
+        """
+        try:
+            self._request("DELETE", f"/api/{kind}s/{remote_id}")
+        except ReclaimAPIError as e:
+            if e.status != 404:
+                raise
+
+    def get_item(self, kind: str, remote_id: str) -> Optional[Dict[str, Any]]:
+        """
+        태스크/이벤트 하나 조회 (없으면 None)
+
+        Raises:
+            ReclaimAPIError: 요청 실패
+        """
+        try:
+            return self._request("GET", f"/api/{kind}s/{remote_id}")
+        except ReclaimAPIError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def list_changed(self, kind: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        since 이후 바뀐 태스크/이벤트 목록 (since가 없으면 전체)
+        서버가 updatedSince를 지원하지 않아도 'updated' 값으로 한 번 더 거릅니다.
+
+        Args:
+            kind: 'task' 또는 'event'
+            since: 마지막으로 본 'updated' 값 (ISO 8601)
+
+        Raises:
+            ReclaimAPIError: 요청 실패
+        """
+        path = f"/api/{kind}s"
+        if since:
+            path += f"?updatedSince={requests.utils.quote(since)}"
+        items = self._request("GET", path) or []
+        if since:
+            items = [item for item in items if (item.get('updated') or '') > since]
+        return items
+
+    def sync_meeting_analysis(self, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        회의록 분석 결과를 Reclaim.ai에 동기화 (최대 max_connections개씩 동시에 생성)
+
+        Args:
+            analysis_result: GeminiAnalyzer.analyze_meeting_notes()의 결과
+
+        Returns:
+            동기화 결과 요약
+        """
+        results = {
+            "tasks_created": [],
+            "events_created": [],
+            "errors": []
+        }
+
+        # 분석 결과에는 ID가 없으므로 회의 + 항목 내용으로 멱등 키 생성
+        meeting = f"{analysis_result.get('meeting_title')}|{analysis_result.get('meeting_date')}"
+        calls = []
+
+        # TODO 태스크 생성
+        for task in analysis_result.get("todo_tasks", []):
+            key = idempotency_key(f"{meeting}|{task.get('title')}|{task.get('deadline')}", 'task')
+            calls.append(("tasks_created", lambda task=task, key=key: self.create_task(
+                title=task.get("title", "제목 없음"),
+                description=task.get("description", ""),
+                due_date=task.get("deadline"),
+                priority=task.get("priority", "medium"),
+                duration_minutes=60,  # 기본 1시간
+                idempotency_key=key
+            )))
+
+        # 스케줄 아이템을 이벤트로 생성
+        for item in analysis_result.get("schedule_items", []):
+            key = idempotency_key(f"{meeting}|{item.get('title')}|{item.get('date')}|{item.get('time')}", 'event')
+            calls.append(("events_created", lambda item=item, key=key: self.create_event(
+                title=item.get("title", "제목 없음"),
+                description=item.get("description", ""),
+                start_time=item.get("time"),
+                duration_minutes=item.get("duration_minutes", 60),
+                date=item.get("date"),
+                idempotency_key=key
+            )))
+
+        if not calls:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(self.max_connections, len(calls))) as executor:
+            futures = [(bucket, executor.submit(call)) for bucket, call in calls]
+            for bucket, future in futures:
+                result = future.result()
+                if result["success"]:
+                    results[bucket].append(result["message"])
+                else:
+                    results["errors"].append(result["message"])
+
+        return results
+
+    def get_tasks(self) -> List[Dict[str, Any]]:
+        """
+        현재 태스크 목록 조회
+
+        Returns:
+            태스크 목록
+        """
+        try:
+            return self._request("GET", "/api/tasks") or []
+        except ReclaimAPIError as e:
+            print(f"태스크 조회 실패: {e}")
+            return []
+
+    def print_sync_results(self, results: Dict[str, Any]):
+        """
+        동기화 결과를 보기 좋게 출력
+
+        Args:
+            results: sync_meeting_analysis()의 결과
+        """
+        print("\n" + "=" * 60)
+        print("📤 Reclaim.ai 동기화 결과")
+        print("=" * 60)
+
+        if results["tasks_created"]:
+            print(f"\n✅ 생성된 태스크 ({len(results['tasks_created'])}개):")
+            for msg in results["tasks_created"]:
+                print(f"  - {msg}")
+
+        if results["events_created"]:
+            print(f"\n📅 생성된 이벤트 ({len(results['events_created'])}개):")
+            for msg in results["events_created"]:
+                print(f"  - {msg}")
+
+        if results["errors"]:
+            print(f"\n❌ 오류 ({len(results['errors'])}개):")
+            for msg in results["errors"]:
+                print(f"  - {msg}")
+
+        total_created = len(results["tasks_created"]) + len(results["events_created"])
+        print(f"\n총 {total_created}개 항목이 Reclaim.ai에 추가되었습니다.")
+        print("=" * 60 + "\n")
+
+
+def _utc_iso(value: Optional[str]) -> Optional[str]:
+    """비교용 시간 정규화 (형식/타임존이 달라도 같은 시각이면 같은 문자열)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return str(value)
+    if parsed.tzinfo is None:
+        return parsed.isoformat()
+    return parsed.astimezone(pytz.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class ReclaimSync:
+    """
+    로컬 이벤트 ↔ Reclaim.ai 양방향 동기화 엔진
+    태스크(isTask)는 Reclaim 태스크로, 미팅(isMeeting)은 Reclaim 이벤트로 대응시킵니다.
+    양쪽에서 바뀐 항목만 가져와 마지막 동기화 내용을 기준으로 3-way 비교하고,
+    자동으로 합칠 수 없는 변경은 덮어쓰지 않고 충돌로 남깁니다.
+    """
+
+    REMOTE = 'reclaim'
+    KINDS = ('task', 'event')
+    # 3-way 비교 대상 필드 (원격 API 필드 이름)
+    COMPARE_FIELDS = {
+        'task': ('title', 'notes', 'due', 'priority'),
+        'event': ('title', 'notes', 'start', 'end'),
+    }
+    TIME_FIELDS = ('due', 'start', 'end')
+    REMOTE_DELETED_STATUSES = ('ARCHIVED', 'CANCELLED')
+
+    def __init__(self, client: ReclaimClient, state, event_store=None, max_concurrency: int = 4,
+                 interval: float = 300, lock_path: Optional[Path] = None):
+        """
+        ReclaimSync 초기화
+
+        Args:
+            client: ReclaimClient
+            state: 동기화 대응표 (SyncState)
+            event_store: 로컬 이벤트 저장소 (양방향 동기화 시 필요)
+            max_concurrency: 동시 요청 수
+            interval: 백그라운드 동기화 주기 (초)
+            lock_path: 여러 프로세스가 동시에 동기화하지 않도록 잠글 파일 (선택)
+        """
+        self.client = client
+        self.state = state
+        self.event_store = event_store
+        self.max_concurrency = max_concurrency
+        self.interval = interval
+        self.lock_path = Path(lock_path) if lock_path else None
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_result = None
+
+    # --- 필드 변환 ---
+
+    def remote_payload(self, event: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        로컬 이벤트 → (원격 종류, 요청 본문). 동기화 대상이 아니면 None
+
+        Args:
+            event: 이벤트 저장소 형식 이벤트
+        """
+        if event.get('rrule'):
+            # 반복 일정은 Reclaim 이벤트 하나로 대응시킬 수 없어 동기화하지 않음 (첫 발생만 옮기면 원격 변경이 반복 전체를 옮김)
+            return None
+        ext = event.get('extendedProps') or {}
+        start = event.get('start') or ''
+        end = event.get('end') or ''
+
+        duration = 60
+        try:
+            if 'T' in start and 'T' in end:
+                delta = datetime.fromisoformat(end.replace('Z', '+00:00')) - \
+                    datetime.fromisoformat(start.replace('Z', '+00:00'))
+                duration = max(15, int(delta.total_seconds() // 60))
+        except ValueError:
+            pass
+
+        if ext.get('isTask'):
+            return 'task', self.client.task_payload(
+                title=event.get('title') or '제목 없음',
+                description=ext.get('description') or '',
+                due_date=start or None,
+                priority=ext.get('priority') or 'medium',
+                duration_minutes=duration
+            )
+        if ext.get('isMeeting') and 'T' in start:
+            return 'event', self.client.event_payload(
+                title=event.get('title') or '제목 없음',
+                description=ext.get('description') or '',
+                start_time=start[11:16],
+                duration_minutes=duration,
+                date=start[:10]
+            )
+        return None
+
+    def _fields(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """요청 본문/원격 항목 → 3-way 비교용 필드"""
+        fields = {}
+        for field in self.COMPARE_FIELDS[kind]:
+            value = payload.get(field)
+            fields[field] = _utc_iso(value) if field in self.TIME_FIELDS else (value or None)
+        return fields
+
+    def local_fields(self, event: Optional[Dict[str, Any]], kind: str) -> Any:
+        """로컬 이벤트의 비교용 필드 (삭제됐거나 더 이상 대상이 아니면 DELETED)"""
+        remote = self.remote_payload(event) if event else None
+        if remote is None or remote[0] != kind:
+            return DELETED
+        return self._fields(kind, remote[1])
+
+    def remote_fields(self, kind: str, item: Optional[Dict[str, Any]]) -> Any:
+        """원격 항목의 비교용 필드 (삭제/보관됐으면 DELETED)"""
+        if item is None or item.get('deleted') or item.get('status') in self.REMOTE_DELETED_STATUSES:
+            return DELETED
+        return self._fields(kind, item)
+
+    def _to_local_time(self, value: Optional[str]) -> Optional[str]:
+        """UTC ISO → 설정 타임존 ISO (화면에 저장되는 형식과 같게)"""
+        if not value:
+            return None
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = self.client.timezone.localize(parsed)
+        return parsed.astimezone(self.client.timezone).isoformat()
+
+    def _local_patch(self, kind: str, event: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
+        """원격에서 바뀐 필드 → 로컬 이벤트 Merge Patch"""
+        patch: Dict[str, Any] = {}
+        ext: Dict[str, Any] = {}
+        if 'title' in fields:
+            patch['title'] = fields['title'] or ''
+        if 'notes' in fields:
+            ext['description'] = fields['notes'] or ''
+        if 'priority' in fields:
+            ext['priority'] = {v: k for k, v in PRIORITY_MAP.items()}.get(fields['priority'], 'medium')
+        if kind == 'task' and fields.get('due'):
+            start = self._to_local_time(fields['due'])
+            patch['start'] = start
+            try:
+                old_start = datetime.fromisoformat(str(event.get('start')).replace('Z', '+00:00'))
+                old_end = datetime.fromisoformat(str(event.get('end')).replace('Z', '+00:00'))
+                patch['end'] = (datetime.fromisoformat(start) + (old_end - old_start)).isoformat()
+            except (TypeError, ValueError):
+                pass
+        if kind == 'event':
+            for field in ('start', 'end'):
+                if fields.get(field):
+                    patch[field] = self._to_local_time(fields[field])
+        if ext:
+            patch['extendedProps'] = ext
+        return patch
+
+    def _new_local_event(self, kind: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """원격에서 새로 생긴 항목 → 로컬 이벤트"""
+        fields = self.remote_fields(kind, item)
+        event = {
+            'id': f"reclaim-{kind}-{item['id']}",
+            'title': fields.get('title') or '',
+            'allDay': False,
+            'extendedProps': {
+                'description': fields.get('notes') or '',
+                'category': 'ai_req',
+                'sourceTitle': 'Reclaim.ai',
+            },
+        }
+        if kind == 'task':
+            start = self._to_local_time(fields.get('due')) or self._to_local_time(
+                datetime.now(pytz.utc).strftime('%Y-%m-%dT%H:%M:%SZ'))
+            event['start'] = start
+            event['end'] = (datetime.fromisoformat(start) + timedelta(hours=1)).isoformat()
+            event['extendedProps'].update({
+                'isTask': True, 'status': 'todo',
+                'priority': {v: k for k, v in PRIORITY_MAP.items()}.get(fields.get('priority'), 'medium'),
+            })
+        else:
+            event['start'] = self._to_local_time(fields.get('start'))
+            event['end'] = self._to_local_time(fields.get('end'))
+            event['extendedProps']['isMeeting'] = True
+        return event
+
+    # --- 로컬 → 원격 (단방향) ---
+
+    def plan(self, events: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        동기화 계획 (보낼 요청 없이 계산만)
+
+        Returns:
+            {'create': [...], 'update': [...], 'unchanged': [...]} 각 항목은 {'id', 'kind', 'payload', 'hash', 'remote_id'}
+            hash는 대응표와 같은 기준(비교용 필드)으로 계산합니다.
+        """
+        synced = self.state.get_items(self.REMOTE)
+        conflicted = self.state.open_conflict_ids(self.REMOTE)
+        plan = {'create': [], 'update': [], 'unchanged': []}
+        for event in events:
+            if not event.get('id') or str(event['id']) in conflicted:
+                continue
+            remote = self.remote_payload(event)
+            if remote is None:
+                continue
+            kind, payload = remote
+            item = {'id': str(event['id']), 'kind': kind, 'payload': payload,
+                    'hash': content_hash(self._fields(kind, payload))}
+            existing = synced.get(item['id'])
+            if existing is None or existing['kind'] != kind:
+                plan['create'].append(item)
+            elif existing['content_hash'] != item['hash']:
+                item['remote_id'] = existing['remote_id']
+                plan['update'].append(item)
+            else:
+                plan['unchanged'].append(item)
+        return plan
+
+    def _push(self, action: str, item: Dict[str, Any]):
+        """단일 항목 생성/수정 후 대응표 기록"""
+        if action == 'create':
+            created = self.client.create_item(
+                item['kind'], item['payload'], idempotency_key(item['id'], item['kind'])
+            ) or {}
+            remote_id = created.get('id')
+            if remote_id is None:
+                raise ReclaimAPIError("응답에 id가 없습니다.")
+        else:
+            self.client.update_item(item['kind'], item['remote_id'], item['payload'])
+            remote_id = item['remote_id']
+        with self._lock:
+            self.state.record(self.REMOTE, item['id'], item['kind'], remote_id, item['hash'],
+                              self._fields(item['kind'], item['payload']))
+
+    def sync_events(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        로컬 이벤트를 원격으로 보내기 (바뀐 항목만, 최대 max_concurrency개씩 동시에)
+
+        Args:
+            events: 이벤트 저장소 형식 이벤트 목록
+
+        Returns:
+            {'created', 'updated', 'unchanged', 'errors': {로컬 ID: 메시지}}
+        """
+        plan = self.plan(events)
+        stats = {'created': 0, 'updated': 0, 'unchanged': len(plan['unchanged']), 'errors': {}}
+        work = [('create', item) for item in plan['create']] + [('update', item) for item in plan['update']]
+        for (action, item), error in zip(work, self._run_concurrently(
+                [lambda action=action, item=item: self._push(action, item) for action, item in work])):
+            if error is None:
+                stats['created' if action == 'create' else 'updated'] += 1
+            else:
+                print(f"Reclaim 동기화 실패 ({item['id']}): {error}")
+                stats['errors'][item['id']] = error
+        return stats
+
+    def _run_concurrently(self, calls: List) -> List[Optional[str]]:
+        """원격 요청 함수 목록을 동시에 실행 (순서대로 에러 메시지 또는 None 반환)"""
+        if not calls:
+            return []
+
+        def run(call):
+            try:
+                call()
+                return None
+            except ReclaimAPIError as e:
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(calls))) as executor:
+            return list(executor.map(run, calls))
+
+    # --- 양방향 증분 동기화 ---
+
+    @contextmanager
+    def _exclusive(self, wait: bool = False):
+        """프로세스 내/프로세스 간 동시 실행 방지 (이미 실행 중이면 False, wait이면 끝날 때까지 대기)"""
+        if not self._run_lock.acquire(blocking=wait):
+            yield False
+            return
+        try:
+            if self.lock_path is None or fcntl is None:
+                yield True
+                return
+            with open(self.lock_path, 'a') as f:
+                try:
+                    fcntl.flock(f, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        finally:
+            self._run_lock.release()
+
+    def sync_once(self, wait: bool = False) -> Dict[str, Any]:
+        """
+        양방향 증분 동기화 1회
+        로컬은 저장소 리비전, 원격은 'updated' 커서 이후에 바뀐 항목만 비교합니다.
+
+        Args:
+            wait: 다른 동기화가 실행 중이면 끝날 때까지 기다렸다가 실행 (False면 건너뜀)
+
+        Returns:
+            {'pushed', 'pulled', 'deleted_remote', 'deleted_local', 'conflicts', 'errors'}
+            (건너뛰었으면 {'skipped': True})
+        """
+        with self._exclusive(wait) as acquired:
+            if not acquired:
+                return {'skipped': True}
+            result = self._sync_changes()
+        self.last_result = dict(result, at=time.time())
+        return result
+
+    def _sync_changes(self) -> Dict[str, Any]:
+        R = self.REMOTE
+        stats = {'pushed': 0, 'pulled': 0, 'deleted_remote': 0, 'deleted_local': 0,
+                 'conflicts': 0, 'errors': {}}
+
+        # 1. 양쪽에서 바뀐 항목 (커서는 모두 성공했을 때만 전진)
+        local_cursor = int(self.state.get_cursor(R, 'local_rev') or 0)
+        next_local_cursor = self.event_store.get_revision()
+        changed_events, deleted_ids = self.event_store.changed_since(local_cursor)
+
+        remote_changed: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        next_remote_cursors = {}
+        for kind in self.KINDS:
+            since = self.state.get_cursor(R, f'{kind}_updated')
+            items = self.client.list_changed(kind, since)
+            for item in items:
+                remote_changed[(kind, str(item['id']))] = item
+            next_remote_cursors[kind] = max([since or ''] + [item.get('updated') or '' for item in items])
+
+        # 2. 비교 대상 로컬 ID 모으기
+        synced = self.state.get_items(R)
+        by_remote = {(item['kind'], item['remote_id']): local_id for local_id, item in synced.items()}
+        conflicted = self.state.open_conflict_ids(R)
+
+        affected = {}
+        for event in changed_events:
+            affected[str(event['id'])] = None
+        for event_id in deleted_ids:
+            if event_id in synced:
+                affected[event_id] = None
+        new_remote = []
+        for (kind, remote_id), item in remote_changed.items():
+            local_id = by_remote.get((kind, remote_id))
+            if local_id is None:
+                if self.remote_fields(kind, item) is not DELETED:
+                    new_remote.append((kind, item))
+            else:
+                affected[local_id] = item
+
+        remote_calls, local_ops = [], []
+        # 양쪽 반영이 모두 성공한 항목만 기준(base)을 갱신 (하나라도 실패하면 이전 기준으로 다음 회차에 다시 비교)
+        new_bases: Dict[str, Any] = {}
+
+        # 3. 항목별 3-way 비교
+        for local_id, remote_item in affected.items():
+            if local_id in conflicted:
+                continue
+            ledger = synced.get(local_id)
+            event, version = self.event_store.get_event_with_version(local_id)
+
+            if ledger is None:
+                remote = self.remote_payload(event) if event else None
+                if remote is not None:
+                    kind, payload = remote
+                    item = {'id': local_id, 'kind': kind, 'payload': payload,
+                            'hash': content_hash(self._fields(kind, payload))}
+                    remote_calls.append((local_id, 'pushed', lambda item=item: self._push('create', item)))
+                continue
+
+            kind, remote_id, base = ledger['kind'], ledger['remote_id'], ledger['base']
+            local = self.local_fields(event, kind)
+            remote = self.remote_fields(kind, remote_item) if remote_item is not None else base
+            merged, conflicts = three_way_merge(base, local, remote)
+
+            if conflicts:
+                self.state.open_conflict(R, local_id, kind, remote_id, conflicts)
+                stats['conflicts'] += 1
+                continue
+
+            if merged == DELETED:
+                if local != DELETED:
+                    local_ops.append(('delete', local_id, version, None))
+                    stats['deleted_local'] += 1
+                if remote != DELETED:
+                    remote_calls.append((local_id, 'deleted_remote',
+                                         lambda k=kind, r=remote_id: self.client.delete_item(k, r)))
+                new_bases[local_id] = (kind, remote_id, DELETED)
+                continue
+
+            if merged != remote:
+                changes = {f: v for f, v in merged.items() if remote == DELETED or remote.get(f) != v}
+                remote_calls.append((local_id, 'pushed',
+                                     lambda k=kind, r=remote_id, c=changes: self.client.update_item(k, r, c)))
+            if merged != local and event is not None:
+                changed = {f: v for f, v in merged.items() if local.get(f) != v}
+                local_ops.append(('patch', local_id, version, self._local_patch(kind, event, changed)))
+                stats['pulled'] += 1
+            new_bases[local_id] = (kind, remote_id, merged)
+
+        # 4. 원격 반영 (동시 요청)
+        for (local_id, counter, _), error in zip(remote_calls, self._run_concurrently([c for _, _, c in remote_calls])):
+            if error is None:
+                stats[counter] += 1
+            else:
+                stats['errors'][local_id] = error
+
+        # 5. 로컬 반영 (버전이 바뀌었으면 다음 회차에 다시 비교)
+        new_events = [self._new_local_event(kind, item) for kind, item in new_remote]
+        if new_events:
+            self.event_store.insert_events(new_events)
+            for (kind, item), event in zip(new_remote, new_events):
+                fields = self.remote_fields(kind, item)
+                self.state.record(R, event['id'], kind, str(item['id']), content_hash(fields), fields)
+            stats['pulled'] += len(new_events)
+        # 원격에서 가져온 변경은 사용자의 실행 취소 기록에 남기지 않음
+        for op, local_id, version, patch in local_ops:
+            try:
+                if op == 'delete':
+                    self.event_store.delete_event(local_id, version, history=False)
+                else:
+                    self.event_store.patch_event(local_id, patch, version, history=False)
+            except EventStoreError as e:
+                stats['errors'][local_id] = str(e)
+
+        # 6. 기준 갱신 (실패한 항목은 이전 기준 유지)
+        for local_id, (kind, remote_id, merged) in new_bases.items():
+            if local_id in stats['errors']:
+                continue
+            if merged == DELETED:
+                self.state.forget(R, [local_id])
+            else:
+                self.state.record(R, local_id, kind, remote_id, content_hash(merged), merged)
+
+        if not stats['errors']:
+            self.state.set_cursor(R, 'local_rev', next_local_cursor)
+            for kind, cursor in next_remote_cursors.items():
+                if cursor:
+                    self.state.set_cursor(R, f'{kind}_updated', cursor)
+        return stats
+
+    # --- 충돌 해결 ---
+
+    def resolve_conflict(self, conflict_id: int, resolution: str) -> Dict[str, Any]:
+        """
+        충돌 해결 (현재 로컬 또는 원격 내용을 양쪽에 적용)
+
+        Args:
+            conflict_id: 충돌 ID
+            resolution: 'local' (로컬 유지) 또는 'remote' (원격 유지)
+
+        Returns:
+            해결된 충돌 정보
+
+        Raises:
+            ValueError: 충돌이 없거나 이미 해결됨, 잘못된 resolution
+            ReclaimAPIError: 원격 요청 실패
+        """
+        if resolution not in (RESOLVE_LOCAL, RESOLVE_REMOTE):
+            raise ValueError(f"resolution은 '{RESOLVE_LOCAL}' 또는 '{RESOLVE_REMOTE}'이어야 합니다.")
+        conflict = self.state.get_conflict(conflict_id)
+        if conflict is None or conflict['resolved_at'] is not None:
+            raise ValueError("열린 충돌이 아닙니다.")
+
+        R = self.REMOTE
+        kind, local_id, remote_id = conflict['kind'], conflict['local_id'], conflict['remote_id']
+        event, version = self.event_store.get_event_with_version(local_id)
+        remote_item = self.client.get_item(kind, remote_id) if remote_id else None
+        local = self.local_fields(event, kind)
+        remote = self.remote_fields(kind, remote_item)
+        winner = local if resolution == RESOLVE_LOCAL else remote
+
+        if winner == DELETED:
+            if event is not None:
+                self.event_store.delete_event(local_id, version, history=False)
+            if remote_item is not None:
+                self.client.delete_item(kind, remote_id)
+            self.state.forget(R, [local_id])
+        elif resolution == RESOLVE_LOCAL:
+            if remote == DELETED:
+                created = self.client.create_item(kind, self.remote_payload(event)[1]) or {}
+                remote_id = str(created.get('id'))
+            else:
+                self.client.update_item(kind, remote_id, winner)
+            self.state.record(R, local_id, kind, remote_id, content_hash(winner), winner)
+        else:
+            if event is None:
+                event = self._new_local_event(kind, remote_item)
+                event['id'] = local_id
+                self.event_store.insert_events([event])
+            else:
+                self.event_store.patch_event(local_id, self._local_patch(kind, event, winner), version, history=False)
+            self.state.record(R, local_id, kind, remote_id, content_hash(winner), winner)
+
+        self.state.close_conflict(conflict_id, resolution)
+        return self.state.get_conflict(conflict_id)
+
+    # --- 백그라운드 실행 ---
+
+    def start(self):
+        """백그라운드 동기화 스레드 시작"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="reclaim-sync", daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """백그라운드 스레드 종료"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                result = self.sync_once()
+                if self.event_store is not None:
+                    self.event_store.purge_tombstones()
+                if any(result.get(k) for k in ('pushed', 'pulled', 'deleted_remote', 'deleted_local', 'conflicts')):
+                    print(f"Reclaim 동기화: {result}")
+            except Exception as e:
+                self.last_result = {'error': str(e), 'at': time.time()}
+                print(f"Reclaim 동기화 실패: {e}")
+            self._stop.wait(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """동기화 현황"""
+        return {
+            'last_result': self.last_result,
+            'open_conflicts': len(self.state.open_conflict_ids(self.REMOTE)),
+        }
+
+
+def test_client():
+    """테스트 함수"""
+    import os
+
+    api_token = os.getenv('RECLAIM_API_TOKEN')
+    if not api_token:
+        print("RECLAIM_API_TOKEN 환경 변수가 설정되지 않았습니다.")
+        return
+
+    client = ReclaimClient(api_token)
+
+    # 테스트: 태스크 생성
+    print("테스트: 태스크 생성")
+    result = client.create_task(
+        title="테스트 태스크",
+        description="자동화 시스템 테스트용 태스크입니다.",
+        priority="high",
+        duration_minutes=30
+    )
+    print(result)
+
+    # 테스트: 이벤트 생성
+    print("\n테스트: 이벤트 생성")
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    result = client.create_event(
+        title="테스트 미팅",
+        description="자동화 시스템 테스트용 미팅입니다.",
+        start_time="14:00",
+        duration_minutes=60,
+        date=tomorrow
+    )
+    print(result)
+
+
+if __name__ == "__main__":
+    test_client()
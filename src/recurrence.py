@@ -0,0 +1,405 @@
+"""
+반복 일정 모듈
+RFC 5545 RRULE의 일부(FREQ, INTERVAL, COUNT, UNTIL, BYDAY, BYMONTHDAY, BYMONTH / 주 시작은 월요일)를 해석하고,
+조회 구간 안의 발생(occurrence)만 계산합니다.
+반복 일정은 저장소에 행 하나(첫 발생 + 규칙)로 저장되고, 발생은 조회할 때마다 필요한 구간만 펼칩니다.
+각 발생은 원래 시작 시각으로 만든 키(RFC 5545 RECURRENCE-ID와 같은 'YYYYMMDD[THHMMSS]' 형식)로 구분합니다.
+"""
+
+import calendar
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+# 반복 일정 행에만 있는 필드 (발생 이벤트에는 복사하지 않음)
+RRULE = 'rrule'
+EXDATE = 'exdate'          # 취소한 발생 키 목록
+OVERRIDES = 'overrides'    # {발생 키: 그 발생만 바꾼 내용 (JSON Merge Patch)}
+SERIES_FIELDS = (RRULE, EXDATE, OVERRIDES)
+# 펼친 발생 이벤트의 extendedProps에 붙는 표시 (저장하지 않음)
+OCCURRENCE_PROPS = ('seriesId', 'recurrenceId', RRULE)
+
+# 발생 이벤트 ID: '<반복 일정 ID>@<발생 키>'
+OCCURRENCE_SEPARATOR = '@'
+OCCURRENCE_KEY = re.compile(r'^\d{8}(T\d{6})?$')
+
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+SUPPORTED_PARTS = {'FREQ', 'INTERVAL', 'COUNT', 'UNTIL', 'BYDAY', 'BYMONTHDAY', 'BYMONTH', 'WKST'}
+BYDAY_PATTERN = re.compile(r'^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$')
+
+# COUNT 상한 / 발생을 찾는 최대 기간 (발생이 없는 규칙에서 끝없이 돌지 않게)
+MAX_COUNT = 10000
+MAX_YEARS = 200
+
+
+def parse_rrule(text: str) -> Dict[str, Any]:
+    """
+    RRULE 문자열 해석
+
+    Args:
+        text: 'FREQ=WEEKLY;BYDAY=MO' 형식 ('RRULE:' 접두사 허용)
+
+    Returns:
+        {'freq', 'interval', 'count', 'until', 'until_text', 'byday': [(순번 또는 None, 요일 0~6)],
+         'bymonthday': [...], 'bymonth': [...]}
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 지원하지 않는 항목이 있는 경우
+    """
+    text = str(text or '').strip()
+    if text.upper().startswith('RRULE:'):
+        text = text[len('RRULE:'):]
+    parts = {}
+    for part in text.split(';'):
+        if not part.strip():
+            continue
+        name, sep, value = part.partition('=')
+        if not sep or not value.strip():
+            raise ValueError(f"RRULE 형식 오류: {part}")
+        parts[name.strip().upper()] = value.strip().upper()
+
+    unsupported = set(parts) - SUPPORTED_PARTS
+    if unsupported:
+        raise ValueError(f"지원하지 않는 RRULE 항목: {', '.join(sorted(unsupported))}")
+    if parts.get('WKST', 'MO') != 'MO':
+        raise ValueError("WKST는 MO만 지원합니다.")
+    freq = parts.get('FREQ')
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ는 {'/'.join(FREQUENCIES)} 중 하나여야 합니다: {freq}")
+    if 'COUNT' in parts and 'UNTIL' in parts:
+        raise ValueError("COUNT와 UNTIL은 함께 쓸 수 없습니다.")
+
+    rule = {
+        'freq': freq,
+        'interval': _int_part(parts, 'INTERVAL', 1, 1, 1000),
+        'count': _int_part(parts, 'COUNT', None, 1, MAX_COUNT),
+        'until': _parse_until(parts['UNTIL']) if 'UNTIL' in parts else None,
+        'until_text': parts.get('UNTIL'),
+        'byday': [],
+        'bymonthday': [_ranged(value, 'BYMONTHDAY', -31, 31) for value in _list_part(parts, 'BYMONTHDAY')],
+        'bymonth': [_ranged(value, 'BYMONTH', 1, 12) for value in _list_part(parts, 'BYMONTH')],
+    }
+    for value in _list_part(parts, 'BYDAY'):
+        match = BYDAY_PATTERN.match(value)
+        if not match:
+            raise ValueError(f"BYDAY 형식 오류: {value}")
+        nth = int(match.group(1)) if match.group(1) else None
+        if nth is not None:
+            if freq not in ('MONTHLY', 'YEARLY'):
+                raise ValueError(f"순번 있는 BYDAY는 MONTHLY/YEARLY에서만 쓸 수 있습니다: {value}")
+            if nth == 0 or abs(nth) > 53:
+                raise ValueError(f"BYDAY 순번 오류: {value}")
+        rule['byday'].append((nth, WEEKDAYS.index(match.group(2))))
+    if 0 in rule['bymonthday']:
+        raise ValueError("BYMONTHDAY에 0은 쓸 수 없습니다.")
+    return rule
+
+
+def _int_part(parts: Dict[str, str], name: str, default: Optional[int], low: int, high: int) -> Optional[int]:
+    if name not in parts:
+        return default
+    return _ranged(parts[name], name, low, high)
+
+
+def _ranged(value: str, name: str, low: int, high: int) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} 값은 숫자여야 합니다: {value}") from None
+    if not low <= number <= high:
+        raise ValueError(f"{name} 값은 {low}~{high} 범위여야 합니다: {value}")
+    return number
+
+
+def _list_part(parts: Dict[str, str], name: str) -> list:
+    return [value.strip() for value in parts.get(name, '').split(',') if value.strip()]
+
+
+def _parse_until(value: str):
+    """UNTIL 값 → date (날짜만) 또는 datetime ('Z'가 붙으면 UTC)"""
+    try:
+        if 'T' not in value:
+            return datetime.strptime(value, '%Y%m%d').date()
+        if value.endswith('Z'):
+            return datetime.strptime(value[:-1] + '+0000', '%Y%m%dT%H%M%S%z')
+        return datetime.strptime(value, '%Y%m%dT%H%M%S')
+    except ValueError:
+        raise ValueError(f"UNTIL 형식 오류 (YYYYMMDD 또는 YYYYMMDDTHHMMSS[Z]): {value}") from None
+
+
+def format_rrule(rule: Dict[str, Any]) -> str:
+    """해석한 규칙을 정규화된 RRULE 문자열로 (항목 순서 고정, 기본값 생략)"""
+    parts = [f"FREQ={rule['freq']}"]
+    if rule['interval'] != 1:
+        parts.append(f"INTERVAL={rule['interval']}")
+    if rule['count']:
+        parts.append(f"COUNT={rule['count']}")
+    if rule['until_text']:
+        parts.append(f"UNTIL={rule['until_text']}")
+    if rule['bymonth']:
+        parts.append('BYMONTH=' + ','.join(map(str, rule['bymonth'])))
+    if rule['bymonthday']:
+        parts.append('BYMONTHDAY=' + ','.join(map(str, rule['bymonthday'])))
+    if rule['byday']:
+        parts.append('BYDAY=' + ','.join(f"{nth or ''}{WEEKDAYS[weekday]}" for nth, weekday in rule['byday']))
+    return ';'.join(parts)
+
+
+def normalize_rrule(text: str) -> str:
+    """
+    RRULE 문자열 검사 + 정규화 (저장 전에 사용)
+
+    Raises:
+        ValueError: 해석할 수 없는 규칙
+    """
+    return format_rrule(parse_rrule(text))
+
+
+# --- 시작 시각 / 발생 키 ---
+
+def parse_start(value: str) -> Tuple[datetime, bool]:
+    """
+    이벤트 시작 값 해석
+
+    Args:
+        value: 'YYYY-MM-DD' (종일) 또는 'YYYY-MM-DDTHH:MM[:SS][+09:00|Z]'
+
+    Returns:
+        (시작 datetime, 종일 여부) - 타임존이 없으면 naive(서버 로컬), 있으면 그 오프셋을 그대로 유지
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    text = str(value or '').strip()
+    return datetime.fromisoformat(text.replace('Z', '+00:00')), 'T' not in text
+
+
+def format_start(value: datetime, all_day: bool) -> str:
+    """parse_start()의 반대 (종일이면 날짜만)"""
+    return value.date().isoformat() if all_day else value.isoformat(timespec='seconds')
+
+
+def occurrence_key(value: datetime, all_day: bool) -> str:
+    """발생의 원래 시작 시각 → 발생 키 ('20260105' / '20260105T140000', 반복 일정의 타임존 기준)"""
+    return value.strftime('%Y%m%d' if all_day else '%Y%m%dT%H%M%S')
+
+
+def key_to_datetime(key: str, dtstart: datetime) -> datetime:
+    """발생 키 → 발생 시작 datetime (반복 일정 시작과 같은 타임존)"""
+    parsed = datetime.strptime(key, '%Y%m%dT%H%M%S' if 'T' in key else '%Y%m%d')
+    if 'T' not in key:
+        parsed = datetime.combine(parsed.date(), dtstart.time())
+    return parsed.replace(tzinfo=dtstart.tzinfo)
+
+
+def occurrence_id(series_id: str, key: str) -> str:
+    """발생 이벤트 ID"""
+    return f"{series_id}{OCCURRENCE_SEPARATOR}{key}"
+
+
+def split_occurrence_id(event_id: str) -> Optional[Tuple[str, str]]:
+    """
+    발생 이벤트 ID를 (반복 일정 ID, 발생 키)로 나누기
+
+    Returns:
+        발생 ID 형식이 아니면 None
+    """
+    series_id, sep, key = str(event_id or '').rpartition(OCCURRENCE_SEPARATOR)
+    if not sep or not series_id or not OCCURRENCE_KEY.match(key):
+        return None
+    return series_id, key
+
+
+# --- 발생 계산 ---
+
+def _month_dates(rule: Dict[str, Any], dtstart: datetime, year: int, month: int) -> list:
+    """한 달 안의 후보 날짜 (BYMONTHDAY / BYDAY / 기본은 시작일과 같은 날)"""
+    last = calendar.monthrange(year, month)[1]
+    if rule['bymonthday']:
+        days = sorted({day if day > 0 else last + day + 1 for day in rule['bymonthday']})
+        dates = [date(year, month, day) for day in days if 1 <= day <= last]
+        if rule['byday']:
+            weekdays = {weekday for _, weekday in rule['byday']}
+            dates = [d for d in dates if d.weekday() in weekdays]
+        return dates
+    if rule['byday']:
+        return _weekday_dates(rule['byday'], date(year, month, 1), date(year, month, last))
+    return [date(year, month, dtstart.day)] if dtstart.day <= last else []
+
+
+def _weekday_dates(byday: list, first: date, last: date) -> list:
+    """first~last 사이에서 BYDAY에 맞는 날짜 ('2TU' = 두 번째 화요일, '-1FR' = 마지막 금요일)"""
+    selected = set()
+    for nth, weekday in byday:
+        start = first + timedelta(days=(weekday - first.weekday()) % 7)
+        matches = [start + timedelta(weeks=i) for i in range((last - start).days // 7 + 1)] if start <= last else []
+        if nth is None:
+            selected.update(matches)
+        elif nth <= len(matches) and -nth <= len(matches):
+            selected.add(matches[nth - 1] if nth > 0 else matches[nth])
+    return sorted(selected)
+
+
+def _period(rule: Dict[str, Any], dtstart: datetime, k: int) -> Tuple[int, list]:
+    """
+    k번째 반복 주기(INTERVAL 단위)의 (연도, 후보 날짜 목록)
+    FREQ 단위(일/주/월/년)로 날짜를 만들고 BYxxx 조건으로 거릅니다.
+    """
+    freq, n = rule['freq'], k * rule['interval']
+    first = dtstart.date()
+    if freq == 'DAILY':
+        day = first + timedelta(days=n)
+        year, dates = day.year, [day]
+    elif freq == 'WEEKLY':
+        monday = first - timedelta(days=first.weekday()) + timedelta(weeks=n)
+        weekdays = sorted({weekday for _, weekday in rule['byday']} or {first.weekday()})
+        year, dates = monday.year, [monday + timedelta(days=weekday) for weekday in weekdays]
+    elif freq == 'MONTHLY':
+        years, month = divmod(first.month - 1 + n, 12)
+        year = first.year + years
+        dates = _month_dates(rule, dtstart, year, month + 1) if year <= 9998 else []
+    else:
+        year = first.year + n
+        if year > 9998:
+            dates = []
+        elif rule['bymonth'] or rule['bymonthday']:
+            months = rule['bymonth'] or range(1, 13)
+            dates = sorted(d for month in months for d in _month_dates(rule, dtstart, year, month))
+        elif rule['byday']:
+            dates = _weekday_dates(rule['byday'], date(year, 1, 1), date(year, 12, 31))
+        else:
+            dates = _month_dates(rule, dtstart, year, first.month)
+
+    # FREQ보다 넓은 단위의 BYxxx는 걸러내는 조건
+    if rule['bymonth']:
+        dates = [d for d in dates if d.month in rule['bymonth']]
+    if freq == 'DAILY' and rule['byday']:
+        dates = [d for d in dates if d.weekday() in {weekday for _, weekday in rule['byday']}]
+    if freq in ('DAILY', 'WEEKLY') and rule['bymonthday']:
+        dates = [d for d in dates if _matches_monthday(d, rule['bymonthday'])]
+    return year, dates
+
+
+def _matches_monthday(day: date, monthdays: list) -> bool:
+    last = calendar.monthrange(day.year, day.month)[1]
+    return any(day.day == (value if value > 0 else last + value + 1) for value in monthdays)
+
+
+def _first_period(rule: Dict[str, Any], dtstart: datetime, after: datetime) -> int:
+    """after가 들어 있는 반복 주기 번호 (그 앞 주기의 발생은 모두 after 이전)"""
+    first, target = dtstart.date(), after.date()
+    freq = rule['freq']
+    if freq == 'DAILY':
+        units = (target - first).days
+    elif freq == 'WEEKLY':
+        units = ((target - timedelta(days=target.weekday())) - (first - timedelta(days=first.weekday()))).days // 7
+    elif freq == 'MONTHLY':
+        units = (target.year - first.year) * 12 + target.month - first.month
+    else:
+        units = target.year - first.year
+    return max(0, units // rule['interval'])
+
+
+def _past_until(rule: Dict[str, Any], value: datetime) -> bool:
+    until = rule['until']
+    if until is None:
+        return False
+    if isinstance(until, datetime):
+        if until.tzinfo is not None:
+            return value.timestamp() > until.timestamp()
+        return value.replace(tzinfo=None) > until
+    return value.date() > until
+
+
+def iter_occurrences(rule: Dict[str, Any], dtstart: datetime,
+                     after: Optional[datetime] = None) -> Iterator[datetime]:
+    """
+    발생 시작 시각을 시간 순으로 생성 (무한 반복이면 끝없이 생성하므로 호출하는 쪽에서 멈춤)
+    COUNT가 없으면 after가 들어 있는 주기로 바로 건너뛰므로 몇 년째 이어진 반복 일정도 조회 구간만큼만 계산합니다.
+
+    Args:
+        rule: parse_rrule() 결과
+        dtstart: 첫 발생 시작 (parse_start() 결과)
+        after: 이 시각 이후에 시작하는 발생만 (포함)
+
+    Yields:
+        발생 시작 datetime (dtstart와 같은 타임존)
+    """
+    if after is not None and after.tzinfo is None and dtstart.tzinfo is not None:
+        after = after.replace(tzinfo=dtstart.tzinfo)
+    # COUNT는 처음부터 세야 하므로 건너뛰지 않음 (COUNT 상한이 있어 계산량도 제한됨)
+    k = _first_period(rule, dtstart, after) if after is not None and not rule['count'] else 0
+    count = 0
+    while True:
+        year, dates = _period(rule, dtstart, k)
+        if year > dtstart.year + MAX_YEARS:
+            return
+        for day in dates:
+            value = datetime.combine(day, dtstart.time(), tzinfo=dtstart.tzinfo)
+            if value < dtstart:
+                continue
+            if _past_until(rule, value):
+                return
+            count += 1
+            if rule['count'] and count > rule['count']:
+                return
+            if after is None or value >= after:
+                yield value
+        k += 1
+
+
+def is_occurrence(rule: Dict[str, Any], dtstart: datetime, value: datetime) -> bool:
+    """value가 규칙이 만드는 발생 시작 시각인지 확인"""
+    return next(iter_occurrences(rule, dtstart, value), None) == value
+
+
+def series_until(rule: Dict[str, Any], dtstart: datetime) -> Optional[datetime]:
+    """
+    마지막 발생 시작 시각 (UNTIL이면 그 상한, 끝없이 반복하면 None)
+
+    Args:
+        rule: parse_rrule() 결과
+        dtstart: 첫 발생 시작
+
+    Returns:
+        datetime 또는 None
+    """
+    if rule['count']:
+        last = dtstart
+        for last in iter_occurrences(rule, dtstart):
+            pass
+        return last
+    until = rule['until']
+    if until is None:
+        return None
+    if isinstance(until, datetime):
+        return until if until.tzinfo is not None or dtstart.tzinfo is None else until.replace(tzinfo=dtstart.tzinfo)
+    return datetime.combine(until, dtstart.time(), tzinfo=dtstart.tzinfo)
+
+
+def main():
+    """반복 규칙 확인"""
+    samples = [
+        ('FREQ=WEEKLY;BYDAY=MO', '2026-01-05T14:00:00'),
+        ('RRULE:FREQ=MONTHLY;BYDAY=-1FR;COUNT=4', '2026-01-30T10:00:00+09:00'),
+        ('FREQ=MONTHLY;BYMONTHDAY=31', '2026-01-31'),
+        ('FREQ=WEEKLY;INTERVAL=2;BYDAY=TU,TH;UNTIL=20260228', '2026-01-06T09:30:00'),
+    ]
+    for text, start in samples:
+        rule = parse_rrule(text)
+        dtstart, all_day = parse_start(start)
+        occurrences = iter_occurrences(rule, dtstart, datetime(2026, 2, 1, tzinfo=dtstart.tzinfo))
+        first = [format_start(next(occurrences), all_day) for _ in range(3)] if not rule['count'] else \
+            [format_start(value, all_day) for value in iter_occurrences(rule, dtstart)]
+        print(f"{format_rrule(rule):45} {start:26} → {first}")
+
+    # 10년째 이어진 주간 회의도 조회 구간만큼만 계산
+    rule = parse_rrule('FREQ=WEEKLY;BYDAY=MO')
+    dtstart, _ = parse_start('2016-01-04T14:00:00')
+    print(next(iter_occurrences(rule, dtstart, datetime(2026, 3, 1))))
+
+
+if __name__ == "__main__":
+    main()
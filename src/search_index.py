@@ -0,0 +1,194 @@
+"""
+전문 검색 보조 모듈
+SQLite FTS5(unicode61)는 한글 어절을 통째로 한 토큰으로 보기 때문에 '회의록'에서 '회의'를 찾지 못합니다.
+그래서 한중일 문자 구간은 겹치는 2글자(bigram)로 나눠 색인하고, 검색어도 같은 방식으로 나눠 구문 검색합니다.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+
+# 한글 자모/음절, 히라가나/가타카나, 한자
+CJK_RUN = re.compile(
+    '[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+'
+)
+WORD = re.compile(r'\w+')
+
+# FTS5 가상 테이블 (rowid = events.rowid, 색인 전용 텍스트만 저장)
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    title, body, people, decisions,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# bm25 컬럼 가중치 (title, body, people, decisions)
+BM25_WEIGHTS = (10.0, 1.0, 3.0, 5.0)
+
+# bm25 파라미터 (FTS5 bm25()와 같은 값)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def bigram_text(text: str) -> str:
+    """
+    색인/검색용 텍스트 변환 (한중일 문자 구간 → 겹치는 2글자 토큰)
+
+    Args:
+        text: 원문
+
+    Returns:
+        '회의록 작성' → '회의 의록 작성'
+    """
+    def split(match):
+        run = match.group(0)
+        if len(run) < 2:
+            return f" {run} "
+        return ' ' + ' '.join(run[i:i + 2] for i in range(len(run) - 1)) + ' '
+
+    return CJK_RUN.sub(split, text or '')
+
+
+def _join(values: Any) -> str:
+    if not values:
+        return ''
+    if isinstance(values, (list, tuple)):
+        return '\n'.join(str(v) for v in values if v)
+    return str(values)
+
+
+def search_document(event: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """
+    이벤트 → 색인할 (제목, 본문, 사람, 결정 사항) 원문
+
+    Args:
+        event: 이벤트 딕셔너리
+
+    Returns:
+        색인 컬럼 순서의 튜플
+    """
+    ext = event.get('extendedProps') or {}
+    body = [event.get('description'), ext.get('description'), ext.get('context')]
+    # 최상위 description과 extendedProps.description이 같으면 한 번만
+    body = list(dict.fromkeys(b for b in body if b))
+    people = [ext.get('who')] + list(ext.get('participants') or [])
+    return (
+        event.get('title') or '',
+        '\n'.join(body),
+        _join([p for p in people if p]),
+        _join(ext.get('keyDecisions')),
+    )
+
+
+def index_row(event: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """FTS 테이블에 넣을 값 (search_document에 bigram_text 적용)"""
+    return tuple(bigram_text(value) for value in search_document(event))
+
+
+def _phrase(tokens: List[str]) -> str:
+    return '"' + ' '.join(t.replace('"', '""') for t in tokens) + '"'
+
+
+def _query_terms(query: str) -> List[Tuple[List[str], bool]]:
+    """검색어 → [(색인 토큰 목록, 마지막 토큰 접두어 일치 여부)]"""
+    terms = []
+    for term in (query or '').split():
+        tokens = WORD.findall(bigram_text(term))
+        if not tokens:
+            continue
+        last = tokens[-1]
+        # 한 글자 한중일 문자는 그 글자로 시작하는 bigram까지, 영문/숫자는 접두어 검색
+        terms.append((tokens, not CJK_RUN.fullmatch(last) or len(last) == 1))
+    return terms
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    사용자 검색어 → FTS5 MATCH 식
+    공백으로 나뉜 검색어는 모두 포함(AND)해야 하고, 각 검색어는 원문에서 이어진 부분 문자열로 찾습니다.
+    마지막 토큰은 앞부분 일치(접두어)를 허용합니다.
+
+    Args:
+        query: 사용자 입력
+
+    Returns:
+        MATCH 식 (검색할 단어가 없으면 None)
+    """
+    clauses = [_phrase(tokens) + ('*' if prefix else '') for tokens, prefix in _query_terms(query)]
+    return ' AND '.join(clauses) if clauses else None
+
+
+def term_patterns(query: str) -> List[Pattern]:
+    """
+    사용자 검색어 → 색인 텍스트에서 검색어별 구문을 찾는 정규식 (build_match_query와 같은 규칙, 관련도 계산용)
+
+    Args:
+        query: 사용자 입력
+
+    Returns:
+        검색어마다 정규식 하나
+    """
+    patterns = []
+    for tokens, prefix in _query_terms(query):
+        # 앞쪽 단어 경계는 보지 않음: 한중일 bigram은 항상 토큰 경계에서 시작하고,
+        # 정규식이 리터럴로 시작해야 빠르게 찾음 (일치 여부는 FTS가 판단하고 여기서는 횟수만 셈)
+        phrase = r'\W+'.join(re.escape(token) for token in tokens)
+        patterns.append(re.compile(phrase + ('' if prefix else r'(?!\w)'), re.IGNORECASE))
+    return patterns
+
+
+def rank(rows: List[tuple], patterns: List[Pattern]) -> List[Tuple[int, float]]:
+    """
+    색인 행을 관련도 순으로 정렬 (FTS5 bm25()와 같은 식을 후보 행 안에서만 계산)
+    bm25()는 검색어마다 표 전체를 훑어 IDF를 구하지만, 후보는 모두 모든 검색어를 포함하므로
+    IDF는 검색어 간 가중치로만 쓰입니다. 여기서는 이를 같다고 보고 빼고, 문서 길이는 글자 수로 잽니다.
+
+    Args:
+        rows: [(rowid, title, body, people, decisions)] - FTS 테이블의 색인 텍스트
+        patterns: term_patterns() 결과
+
+    Returns:
+        [(rowid, 점수)] - 점수가 클수록 관련도가 높음, 같으면 최근(rowid가 큰) 행 먼저
+    """
+    if not rows:
+        return []
+    rows = [(row[0], [column or '' for column in row[1:]]) for row in rows]
+    lengths = [sum(map(len, columns)) for _, columns in rows]
+    average = sum(lengths) / len(lengths) or 1
+    weighted = list(zip(BM25_WEIGHTS, range(len(BM25_WEIGHTS))))
+    scored = []
+    for (rowid, columns), length in zip(rows, lengths):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+        score = 0.0
+        for pattern in patterns:
+            tf = 0.0
+            for weight, index in weighted:
+                if columns[index]:
+                    tf += weight * len(pattern.findall(columns[index]))
+            score += tf * (BM25_K1 + 1) / (tf + norm)
+        scored.append((rowid, score))
+    scored.sort(key=lambda item: (-item[1], -item[0]))
+    return scored
+
+
+def snippet(text: str, query: str, width: int = 80) -> str:
+    """
+    검색어가 처음 나오는 위치 주변의 원문 일부
+
+    Args:
+        text: 원문
+        query: 사용자 검색어
+        width: 반환할 최대 글자 수
+
+    Returns:
+        앞뒤가 잘렸으면 '…'가 붙은 문자열
+    """
+    text = ' '.join((text or '').split())
+    lowered = text.lower()
+    positions = [lowered.find(term.lower()) for term in (query or '').split()]
+    positions = [p for p in positions if p >= 0]
+    if not positions:
+        return text[:width] + ('…' if len(text) > width else '')
+    start = max(0, min(positions) - width // 4)
+    end = start + width
+    return ('…' if start > 0 else '') + text[start:end] + ('…' if end < len(text) else '')
@@ -0,0 +1,169 @@
+"""
+스트리밍 JSON 파서 모듈
+Gemini가 조각으로 보내는 JSON 응답을 받는 대로 읽어서,
+최상위 필드와 최상위 배열의 각 항목이 완성되는 즉시 알려줍니다.
+"""
+
+import json
+from typing import Dict, List, Any, Optional
+
+
+class IncrementalJSONParser:
+    """
+    최상위 객체 하나를 점진적으로 파싱
+
+    feed()가 반환하는 이벤트:
+        {'type': 'field', 'key': 키, 'value': 값}              최상위 필드 값 완성
+        {'type': 'item', 'key': 키, 'index': n, 'value': 값}   최상위 배열의 n번째 항목 완성
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.fields: Dict[str, Any] = {}
+        # 아직 닫히지 않은 최상위 배열에서 완성된 항목 (응답이 잘렸을 때 살릴 수 있는 부분)
+        self.partial_items: Dict[str, List[Any]] = {}
+        self.complete = False
+
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_role: Optional[str] = None
+        self._string_start = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._in_root_array = False
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+        self._scalar_start: Optional[int] = None
+        self._scalar_depth = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        응답 조각 추가
+
+        Args:
+            chunk: 새로 받은 텍스트
+
+        Returns:
+            이번 조각으로 완성된 이벤트 목록
+        """
+        self.buffer += chunk
+        events = []
+        buf = self.buffer
+
+        while self._pos < len(buf) and not self.complete:
+            i = self._pos
+            c = buf[i]
+            self._pos += 1
+            depth = len(self._stack)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._end_string(i, events)
+                continue
+
+            if depth == 0:
+                # 최상위 객체 시작 전 (```json 같은 접두어는 건너뜀)
+                if c == '{':
+                    self._stack.append(c)
+                    self._expect_key = True
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                if depth == 1 and self._expect_key:
+                    self._string_role = 'key'
+                elif depth == 1:
+                    self._string_role = 'value'
+                    self._value_start = i
+                elif depth == 2 and self._in_root_array:
+                    self._string_role = 'item'
+                    self._item_start = i
+                else:
+                    self._string_role = None
+            elif c in '{[':
+                if depth == 1:
+                    self._value_start = i
+                    if c == '[':
+                        self._in_root_array = True
+                        self._item_index = 0
+                elif depth == 2 and self._in_root_array:
+                    self._item_start = i
+                self._stack.append(c)
+            elif c in '}]':
+                self._end_scalar(i, depth, events)
+                self._stack.pop()
+                new_depth = len(self._stack)
+                if new_depth == 0:
+                    self.complete = True
+                elif new_depth == 1 and self._value_start is not None:
+                    self._emit_field(buf[self._value_start:i + 1], events)
+                    self._in_root_array = False
+                elif new_depth == 2 and self._in_root_array and self._item_start is not None:
+                    self._emit_item(buf[self._item_start:i + 1], events)
+            elif c == ',':
+                self._end_scalar(i, depth, events)
+                if depth == 1:
+                    self._expect_key = True
+            elif c == ':':
+                if depth == 1:
+                    self._expect_key = False
+            elif not c.isspace():
+                # 숫자 / true / false / null
+                if self._scalar_start is None and (
+                    (depth == 1 and self._value_start is None)
+                    or (depth == 2 and self._in_root_array and self._item_start is None)
+                ):
+                    self._scalar_start = i
+                    self._scalar_depth = depth
+
+        return events
+
+    def _end_string(self, i: int, events: List[Dict[str, Any]]):
+        text = self.buffer[self._string_start:i + 1]
+        if self._string_role == 'key':
+            self._key = json.loads(text)
+        elif self._string_role == 'value':
+            self._emit_field(text, events)
+        elif self._string_role == 'item':
+            self._emit_item(text, events)
+        self._string_role = None
+
+    def _end_scalar(self, i: int, depth: int, events: List[Dict[str, Any]]):
+        if self._scalar_start is None or self._scalar_depth != depth:
+            return
+        text = self.buffer[self._scalar_start:i].strip()
+        self._scalar_start = None
+        if depth == 1:
+            self._emit_field(text, events)
+        else:
+            self._emit_item(text, events)
+
+    def _emit_field(self, text: str, events: List[Dict[str, Any]]):
+        self._value_start = None
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return
+        self.fields[self._key] = value
+        self.partial_items.pop(self._key, None)
+        events.append({'type': 'field', 'key': self._key, 'value': value})
+
+    def _emit_item(self, text: str, events: List[Dict[str, Any]]):
+        self._item_start = None
+        index = self._item_index
+        self._item_index += 1
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return
+        self.partial_items.setdefault(self._key, []).append(value)
+        events.append({'type': 'item', 'key': self._key, 'index': index, 'value': value})
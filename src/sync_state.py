@@ -0,0 +1,265 @@
+"""
+외부 캘린더 동기화 상태 모듈
+로컬 이벤트 ID와 원격 항목 ID의 대응, 마지막으로 동기화한 내용(3-way 비교의 기준)을 SQLite에 저장합니다.
+원격별 증분 조회 커서와 자동으로 합칠 수 없는 충돌 목록도 함께 관리합니다.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_items (
+    remote TEXT NOT NULL,
+    local_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    remote_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (remote, local_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_items_remote_id ON sync_items (remote, remote_id);
+
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    remote TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (remote, name)
+);
+
+CREATE TABLE IF NOT EXISTS sync_conflicts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    remote TEXT NOT NULL,
+    local_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    remote_id TEXT,
+    fields TEXT NOT NULL,
+    detected_at REAL NOT NULL,
+    resolved_at REAL,
+    resolution TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_conflicts_open ON sync_conflicts (remote, local_id, resolved_at);
+"""
+
+# 충돌 해결 방식
+RESOLVE_LOCAL = 'local'
+RESOLVE_REMOTE = 'remote'
+DELETED = '__deleted__'  # 3-way 비교에서 삭제된 쪽을 나타내는 값
+
+
+def content_hash(payload: Dict[str, Any]) -> str:
+    """원격으로 보낼 내용의 해시 (키 순서와 무관)"""
+    return hashlib.sha256(
+        json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+def three_way_merge(base: Any, local: Any, remote: Any) -> tuple:
+    """
+    필드 단위 3-way 병합
+
+    Args:
+        base: 마지막으로 동기화한 값 ({필드: 값}, 없으면 None)
+        local: 현재 로컬 값 ({필드: 값} 또는 DELETED)
+        remote: 현재 원격 값 ({필드: 값} 또는 DELETED)
+
+    Returns:
+        (병합 결과, 충돌 필드 {필드: {'base', 'local', 'remote'}})
+        한쪽만 삭제했고 다른 쪽이 그대로면 병합 결과는 DELETED
+    """
+    if local == remote:
+        return local, {}
+    if local == base:
+        return remote, {}
+    if remote == base:
+        return local, {}
+    if DELETED in (local, remote):
+        # 한쪽은 삭제, 다른 쪽은 수정 → 항목 전체 충돌
+        return None, {'*': {'base': base, 'local': local, 'remote': remote}}
+
+    base = base or {}
+    merged, conflicts = {}, {}
+    for field in sorted(set(base) | set(local) | set(remote)):
+        b, l, r = base.get(field), local.get(field), remote.get(field)
+        if l == r or r == b:
+            merged[field] = l
+        elif l == b:
+            merged[field] = r
+        else:
+            conflicts[field] = {'base': b, 'local': l, 'remote': r}
+    return merged, conflicts
+
+
+class SyncState:
+    """원격별 동기화 대응표 (SQLite)"""
+
+    def __init__(self, db_path: Path):
+        """
+        SyncState 초기화
+
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(sync_items)")}
+        if 'base' not in columns:
+            # 3-way 비교 기준 (마지막으로 양쪽이 일치했던 내용)
+            conn.execute("ALTER TABLE sync_items ADD COLUMN base TEXT")
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 커넥션 반환"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def get_items(self, remote: str) -> Dict[str, Dict[str, Any]]:
+        """
+        원격의 전체 대응표
+
+        Args:
+            remote: 원격 이름 (예: 'reclaim')
+
+        Returns:
+            {로컬 ID: {'kind', 'remote_id', 'content_hash', 'synced_at'}}
+        """
+        rows = self._conn().execute(
+            "SELECT local_id, kind, remote_id, content_hash, synced_at, base FROM sync_items WHERE remote = ?",
+            (remote,)
+        ).fetchall()
+        return {row['local_id']: self._item(row) for row in rows}
+
+    def get_item(self, remote: str, local_id: str) -> Optional[Dict[str, Any]]:
+        """로컬 ID 하나의 대응 정보 (없으면 None)"""
+        row = self._conn().execute(
+            "SELECT local_id, kind, remote_id, content_hash, synced_at, base FROM sync_items "
+            "WHERE remote = ? AND local_id = ?",
+            (remote, local_id)
+        ).fetchone()
+        return self._item(row) if row else None
+
+    def get_item_by_remote_id(self, remote: str, remote_id: str) -> Optional[Dict[str, Any]]:
+        """원격 항목 ID로 대응 정보 조회 (없으면 None)"""
+        row = self._conn().execute(
+            "SELECT local_id, kind, remote_id, content_hash, synced_at, base FROM sync_items "
+            "WHERE remote = ? AND remote_id = ?",
+            (remote, str(remote_id))
+        ).fetchone()
+        return self._item(row) if row else None
+
+    @staticmethod
+    def _item(row: sqlite3.Row) -> Dict[str, Any]:
+        item = dict(row)
+        item['base'] = json.loads(item['base']) if item.get('base') else None
+        return item
+
+    def record(self, remote: str, local_id: str, kind: str, remote_id: str, hash_value: str,
+               base: Optional[Dict[str, Any]] = None):
+        """
+        동기화 완료 기록
+
+        Args:
+            remote: 원격 이름
+            local_id: 로컬 이벤트 ID
+            kind: 원격 항목 종류 ('task' 또는 'event')
+            remote_id: 원격 항목 ID
+            hash_value: 동기화한 내용의 해시
+            base: 양쪽이 일치하는 비교용 필드 값 (다음 3-way 비교의 기준)
+        """
+        self._conn().execute(
+            "INSERT OR REPLACE INTO sync_items "
+            "(remote, local_id, kind, remote_id, content_hash, synced_at, base) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (remote, local_id, kind, str(remote_id), hash_value, time.time(),
+             json.dumps(base, ensure_ascii=False, sort_keys=True) if base is not None else None)
+        )
+
+    def forget(self, remote: str, local_ids: List[str]):
+        """대응 정보 삭제 (원격 항목이 삭제된 경우)"""
+        self._conn().executemany(
+            "DELETE FROM sync_items WHERE remote = ? AND local_id = ?",
+            [(remote, local_id) for local_id in local_ids]
+        )
+
+    # --- 증분 조회 커서 ---
+
+    def get_cursor(self, remote: str, name: str) -> Optional[str]:
+        """원격별 커서 값 (없으면 None)"""
+        row = self._conn().execute(
+            "SELECT value FROM sync_cursors WHERE remote = ? AND name = ?", (remote, name)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, remote: str, name: str, value: str):
+        """커서 저장 (이번 동기화가 끝난 뒤에만 호출)"""
+        self._conn().execute(
+            "INSERT OR REPLACE INTO sync_cursors (remote, name, value) VALUES (?, ?, ?)",
+            (remote, name, str(value))
+        )
+
+    # --- 충돌 ---
+
+    def open_conflict(self, remote: str, local_id: str, kind: str, remote_id: Optional[str],
+                      fields: Dict[str, Any]) -> int:
+        """
+        충돌 기록 (같은 항목에 열린 충돌이 있으면 내용만 갱신)
+
+        Returns:
+            충돌 ID
+        """
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT id FROM sync_conflicts WHERE remote = ? AND local_id = ? AND resolved_at IS NULL",
+            (remote, local_id)
+        ).fetchone()
+        data = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+        if row is not None:
+            conn.execute("UPDATE sync_conflicts SET fields = ?, detected_at = ? WHERE id = ?",
+                         (data, time.time(), row[0]))
+            return row[0]
+        cursor = conn.execute(
+            "INSERT INTO sync_conflicts (remote, local_id, kind, remote_id, fields, detected_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (remote, local_id, kind, str(remote_id) if remote_id is not None else None, data, time.time())
+        )
+        return cursor.lastrowid
+
+    def open_conflict_ids(self, remote: str) -> set:
+        """열린 충돌이 있는 로컬 ID 집합 (해결 전까지 자동 동기화에서 제외)"""
+        rows = self._conn().execute(
+            "SELECT local_id FROM sync_conflicts WHERE remote = ? AND resolved_at IS NULL", (remote,)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def list_conflicts(self, remote: str, include_resolved: bool = False) -> List[Dict[str, Any]]:
+        """충돌 목록 (최근 순)"""
+        query = "SELECT * FROM sync_conflicts WHERE remote = ?"
+        if not include_resolved:
+            query += " AND resolved_at IS NULL"
+        rows = self._conn().execute(query + " ORDER BY detected_at DESC", (remote,)).fetchall()
+        return [dict(row, fields=json.loads(row['fields'])) for row in rows]
+
+    def get_conflict(self, conflict_id: int) -> Optional[Dict[str, Any]]:
+        """충돌 하나 조회 (없으면 None)"""
+        row = self._conn().execute("SELECT * FROM sync_conflicts WHERE id = ?", (conflict_id,)).fetchone()
+        return dict(row, fields=json.loads(row['fields'])) if row else None
+
+    def close_conflict(self, conflict_id: int, resolution: str):
+        """충돌 해결 기록"""
+        self._conn().execute(
+            "UPDATE sync_conflicts SET resolved_at = ?, resolution = ? WHERE id = ?",
+            (time.time(), resolution, conflict_id)
+        )
@@ -0,0 +1,6 @@
+"""pytest 공통 설정: src 모듈을 앱과 같은 방식(sys.path)으로 import"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,145 @@
+"""긴 회의록 분할 분석 테스트 (Gemini 대신 로컬 스텁 분석 함수 사용)"""
+
+import threading
+
+from chunked_analyzer import ChunkedAnalyzer, merge_results, split_transcript
+
+
+def _filler(words: int) -> str:
+    return ' '.join(['내용'] * words)
+
+
+# --- split_transcript 경계 ---
+
+def test_short_text_is_single_chunk():
+    assert split_transcript("짧은 회의록", max_chars=100) == ["짧은 회의록"]
+
+
+def test_split_prefers_section_heading():
+    text = (
+        "## 안건 1\n" + _filler(60) + "\n"
+        "김철수: " + _filler(20) + "\n"
+        "## 안건 2\n" + _filler(60) + "\n"
+    )
+    chunks = split_transcript(text, max_chars=len(text) - 10)
+    assert len(chunks) == 2
+    assert chunks[1].startswith("## 안건 2")
+    assert ''.join(chunks) == text
+
+
+def test_split_prefers_speaker_over_paragraph():
+    text = (
+        "김철수: " + _filler(60) + "\n"
+        "\n"
+        + _filler(20) + "\n"
+        "이영희: " + _filler(60) + "\n"
+    )
+    chunks = split_transcript(text, max_chars=len(text) - 10)
+    assert len(chunks) == 2
+    assert chunks[1].startswith("이영희:")
+    assert ''.join(chunks) == text
+
+
+def test_split_falls_back_to_paragraph():
+    line = _filler(20) + "\n"
+    first = line * 3 + "\n"
+    second = line * 3
+    text = first + second
+    # 문단 경계 뒤에도 줄 경계가 있지만 문단 경계에서 잘라야 함
+    chunks = split_transcript(text, max_chars=len(first) + len(line) * 2)
+    assert chunks == [first, second]
+
+
+def test_chunks_respect_max_chars():
+    text = ''.join(f"화자{i % 3}: " + _filler(30) + "\n" for i in range(40))
+    chunks = split_transcript(text, max_chars=500)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 500 for chunk in chunks)
+    assert ''.join(chunks) == text
+
+
+# --- merge_results 중복 제거 ---
+
+def test_merge_dedupes_action_items_and_events():
+    first = {
+        'meeting_title': '주간 회의',
+        'meeting_date': '2026-01-05',
+        'summary': '앞부분',
+        'todo_tasks': [{'title': '보고서 작성', 'priority': 'low'}],
+        'schedule_items': [{'title': '리뷰 미팅', 'date': '2026-01-07', 'time': '14:00'}],
+        'participants': ['김철수 (AI팀)'],
+        'key_decisions': ['예산 승인'],
+    }
+    second = {
+        'meeting_date': '2026-01-05',
+        'summary': '뒷부분',
+        'todo_tasks': [
+            {'title': '보고서 작성!', 'priority': 'high', 'assignee': '김철수'},
+            {'title': '배포 준비'},
+        ],
+        'schedule_items': [
+            {'title': '리뷰  미팅', 'date': '2026-01-07', 'time': '14:00', 'description': '장소: 3층'},
+            {'title': '리뷰 미팅', 'date': '2026-01-08', 'time': '14:00'},
+        ],
+        'participants': ['김철수'],
+        'key_decisions': ['예산 승인.'],
+    }
+
+    merged = merge_results([first, second])
+
+    assert [t['title'] for t in merged['todo_tasks']] == ['보고서 작성', '배포 준비']
+    report = merged['todo_tasks'][0]
+    assert report['priority'] == 'high'
+    assert report['assignee'] == '김철수'
+
+    assert len(merged['schedule_items']) == 2
+    assert merged['schedule_items'][0]['description'] == '장소: 3층'
+    assert merged['participants'] == ['김철수 (AI팀)']
+    assert merged['key_decisions'] == ['예산 승인']
+    assert merged['meeting_title'] == '주간 회의'
+    assert 'Part 1/2' in merged['summary'] and 'Part 2/2' in merged['summary']
+
+
+# --- 조각 일부 실패 ---
+
+def test_partial_chunk_failure_keeps_other_results():
+    calls = []
+    lock = threading.Lock()
+
+    def stub_analyze(chunk: str):
+        with lock:
+            calls.append(chunk)
+        if '[긴 회의록의 2/' in chunk:
+            raise RuntimeError('429 quota exceeded')
+        index = chunk.split('[긴 회의록의 ', 1)[1].split('/', 1)[0]
+        return {
+            'meeting_date': '2026-01-05',
+            'summary': f'요약 {index}',
+            'todo_tasks': [{'title': f'할 일 {index}'}],
+        }
+
+    text = ''.join(f"## 안건 {i}\n" + f"화자{i}: " + _filler(40) + "\n" for i in range(3))
+    analyzer = ChunkedAnalyzer(stub_analyze, max_workers=2, chunk_chars=len(text) // 3 + 20,
+                               threshold_chars=10)
+    events = list(analyzer.analyze_stream(text))
+
+    analysis = events[-1]['analysis']
+    total = analysis['chunks']
+    assert total == 3 and len(calls) == 3
+    assert [e['completed'] for e in events if e['type'] == 'progress'] == list(range(total + 1))
+    assert 'error' not in analysis
+    assert analysis['chunk_errors'] == ['429 quota exceeded']
+    assert sorted(t['title'] for t in analysis['todo_tasks']) == ['할 일 1', '할 일 3']
+    assert analysis['meeting_date'] == '2026-01-05'
+
+
+def test_all_chunks_failing_reports_error():
+    def stub_analyze(chunk: str):
+        raise RuntimeError('timeout')
+
+    text = ''.join(f"## 안건 {i}\n" + _filler(40) + "\n" for i in range(3))
+    analyzer = ChunkedAnalyzer(stub_analyze, max_workers=2, chunk_chars=len(text) // 2, threshold_chars=10)
+    analysis = analyzer.analyze(text)
+
+    assert analysis['error'] == 'timeout'
+    assert analysis['summary'].startswith('분석 실패')
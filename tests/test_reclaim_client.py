@@ -0,0 +1,217 @@
+"""Reclaim.ai 클라이언트/동기화 테스트 (실제 API 대신 http.server로 띄운 로컬 스텁 서버 사용)"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import reclaim_client
+from event_store import EventStore
+from reclaim_client import ReclaimAPIError, ReclaimClient, ReclaimSync, idempotency_key
+from sync_state import SyncState
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        status, headers, payload = self.server.respond(self.command, self.path, self.headers, body)
+        data = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class StubReclaim(ThreadingHTTPServer):
+    """
+    Reclaim.ai API 스텁
+    받은 요청을 모두 기록하고, script에 넣어 둔 (상태 코드, 헤더, 본문) 응답을 먼저 순서대로 돌려준 뒤
+    나머지는 메모리에 태스크/이벤트를 저장하는 간단한 API처럼 응답합니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.script = []
+        self.items = {'task': {}, 'event': {}}
+        self.clock = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def respond(self, method, path, headers, body):
+        with self.lock:
+            self.requests.append({
+                'method': method, 'path': path, 'body': body,
+                'idempotency_key': headers.get('Idempotency-Key'),
+            })
+            if self.script:
+                return self.script.pop(0)
+
+            parts = path.split('?', 1)[0].strip('/').split('/')  # ['api', 'tasks', <id>]
+            kind = parts[1][:-1]
+            items = self.items[kind]
+            self.clock += 1
+            updated = f"2026-01-01T00:00:{self.clock:02d}Z"
+            if method == 'GET' and len(parts) == 2:
+                return 200, {}, list(items.values())
+            if method == 'POST':
+                item = dict(body, id=f"{kind}-{len(items) + 1}", updated=updated)
+                items[item['id']] = item
+                return 200, {}, item
+            if parts[2] not in items:
+                return 404, {}, {'error': 'not found'}
+            if method == 'PATCH':
+                items[parts[2]].update(body, updated=updated)
+                return 200, {}, items[parts[2]]
+            if method == 'DELETE':
+                del items[parts[2]]
+                return 204, {}, None
+            return 200, {}, items[parts[2]]
+
+
+@pytest.fixture
+def reclaim():
+    server = StubReclaim()
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """재시도 대기 시간 기록 (실제로 기다리지 않음)"""
+    recorded = []
+    monkeypatch.setattr(reclaim_client.time, 'sleep', recorded.append)
+    return recorded
+
+
+def make_client(server, **kwargs):
+    return ReclaimClient('test-token', base_url=server.url, **kwargs)
+
+
+def calendar():
+    return [
+        {'id': 'task-1', 'title': '보고서 작성', 'start': '2026-01-05T09:00:00', 'end': '2026-01-05T10:00:00',
+         'extendedProps': {'isTask': True, 'priority': 'high', 'description': '분기 보고서'}},
+        {'id': 'meeting-1', 'title': '주간 회의', 'start': '2026-01-06T14:00:00', 'end': '2026-01-06T15:00:00',
+         'extendedProps': {'isMeeting': True, 'description': '3층 회의실'}},
+        {'id': 'note-1', 'title': '메모', 'start': '2026-01-07', 'extendedProps': {}},
+    ]
+
+
+# --- 재시도 / 멱등 키 ---
+
+def test_idempotency_key_is_stable_across_retries(reclaim, sleeps, tmp_path):
+    reclaim.script = [(503, {'Retry-After': '0'}, None), (502, {}, None)]
+    sync = ReclaimSync(make_client(reclaim), SyncState(tmp_path / 'sync.sqlite3'))
+
+    stats = sync.sync_events(calendar()[:1])
+
+    assert stats['created'] == 1 and not stats['errors']
+    posts = [r for r in reclaim.requests if r['method'] == 'POST']
+    assert len(posts) == 3
+    assert {r['idempotency_key'] for r in posts} == {idempotency_key('task-1', 'task')}
+    assert len(reclaim.items['task']) == 1
+
+
+def test_503_with_retry_after_is_retried_with_backoff(reclaim, sleeps):
+    reclaim.script = [
+        (503, {'Retry-After': '2'}, None),
+        (503, {'Retry-After': '120'}, None),
+        (503, {}, None),
+    ]
+    client = make_client(reclaim)
+
+    created = client.create_item('task', client.task_payload('보고서 작성'), 'key-1')
+
+    assert created['id'] == 'task-1'
+    assert len(reclaim.requests) == 4
+    # Retry-After를 따르되 최대 60초, 없으면 지수 백오프 (세 번째 재시도: 0.5~4초)
+    assert sleeps[:2] == [2, 60]
+    assert len(sleeps) == 3 and 0.5 <= sleeps[2] <= 4.0
+
+
+def test_retries_give_up_after_max_retries(reclaim, sleeps):
+    reclaim.script = [(503, {'Retry-After': '0'}, None)] * 3
+    client = make_client(reclaim, max_retries=2)
+
+    with pytest.raises(ReclaimAPIError) as error:
+        client.create_item('task', client.task_payload('보고서 작성'), 'key-1')
+
+    assert error.value.status == 503
+    assert len(reclaim.requests) == 3
+
+
+def test_client_error_is_not_retried(reclaim, sleeps):
+    reclaim.script = [(400, {}, {'error': 'bad request'})]
+    client = make_client(reclaim)
+
+    with pytest.raises(ReclaimAPIError) as error:
+        client.create_item('task', client.task_payload('보고서 작성'), 'key-1')
+
+    assert error.value.status == 400
+    assert len(reclaim.requests) == 1 and sleeps == []
+
+
+# --- 바뀐 항목만 동기화 ---
+
+def test_second_sync_of_unchanged_events_sends_no_requests(reclaim, tmp_path):
+    sync = ReclaimSync(make_client(reclaim), SyncState(tmp_path / 'sync.sqlite3'))
+
+    first = sync.sync_events(calendar())
+    assert first['created'] == 2 and not first['errors']
+    sent = len(reclaim.requests)
+
+    second = sync.sync_events(calendar())
+    assert second == {'created': 0, 'updated': 0, 'unchanged': 2, 'errors': {}}
+    assert len(reclaim.requests) == sent
+
+
+def test_second_incremental_sync_only_lists_changes(reclaim, tmp_path):
+    store = EventStore(tmp_path / 'db.sqlite3')
+    store.insert_events(calendar())
+    sync = ReclaimSync(make_client(reclaim), SyncState(tmp_path / 'sync.sqlite3'), store)
+
+    first = sync.sync_once()
+    assert first['pushed'] == 2 and not first['errors']
+    sent = len(reclaim.requests)
+
+    # 원격 목록에 방금 만든 항목이 보여도 기준과 같으므로 되돌려 보내거나 가져오지 않음
+    second = sync.sync_once()
+    assert second == {'pushed': 0, 'pulled': 0, 'deleted_remote': 0, 'deleted_local': 0,
+                      'conflicts': 0, 'errors': {}}
+    new_requests = reclaim.requests[sent:]
+    assert [r['method'] for r in new_requests] == ['GET', 'GET']
+    assert store.count_events() == 3
+
+
+def test_local_edit_is_pushed_as_single_update(reclaim, tmp_path):
+    sync = ReclaimSync(make_client(reclaim), SyncState(tmp_path / 'sync.sqlite3'))
+    events = calendar()
+    sync.sync_events(events)
+    sent = len(reclaim.requests)
+
+    events[0] = dict(events[0], title='보고서 작성 (수정)')
+    stats = sync.sync_events(events)
+
+    assert stats['updated'] == 1 and stats['unchanged'] == 1
+    new_requests = reclaim.requests[sent:]
+    assert [(r['method'], r['path']) for r in new_requests] == [('PATCH', '/api/tasks/task-1')]
+    assert reclaim.items['task']['task-1']['title'] == '보고서 작성 (수정)'